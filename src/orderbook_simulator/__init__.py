@@ -4,12 +4,52 @@ from .orderbook import (
     Order,
     Trade,
     BookLevel,
+    IdSequence,
+    LevelUpdate,
+    OrderAction,
+    OrderUpdate,
     Side,
     OrderType,
     OrderStatus,
     OrderValidationError,
     OrderNotFoundError,
+    OrderSpec,
+    RetentionPolicy,
+    TradeView,
 )
+from .concurrency import DepthPublisher, DepthSnapshot
+from .exchange import Exchange, UnknownSymbolError
+from .gateway import GatewayClosedError, OrderGateway
+from .itch import ItchReplayer
+from .journal import JournalError, JournalReader, JournalWriter
+from .market_data import (
+    Bbo,
+    BboPublisher,
+    L2UpdateQueue,
+    L3Book,
+    L3Feed,
+    L3Message,
+    L3Snapshot,
+    SequenceGapError,
+)
+from .lobster import LobsterReplayer, LobsterReport
+from .replay import (
+    AddOrder,
+    BookUpdate,
+    CancelOrder,
+    ExecuteOrder,
+    MarketOrder,
+    ModifyOrder,
+    ReplayEngine,
+)
+from .shared_depth import (
+    SharedDepthError,
+    SharedDepthPublisher,
+    SharedDepthReader,
+)
+from .snapshot import SnapshotError, load_snapshot, save_snapshot
+from .sharding import BatchResult, ShardedExchange
+from .trade_log import TradeLog
 
 __version__ = "1.0.0"
 __all__ = [
@@ -17,9 +57,52 @@ __all__ = [
     "Order",
     "Trade",
     "BookLevel",
+    "IdSequence",
+    "LevelUpdate",
+    "OrderAction",
+    "OrderUpdate",
     "Side",
     "OrderType",
     "OrderStatus",
     "OrderValidationError",
     "OrderNotFoundError",
+    "OrderSpec",
+    "RetentionPolicy",
+    "TradeView",
+    "TradeLog",
+    "Exchange",
+    "UnknownSymbolError",
+    "ShardedExchange",
+    "BatchResult",
+    "ReplayEngine",
+    "AddOrder",
+    "MarketOrder",
+    "CancelOrder",
+    "ModifyOrder",
+    "ExecuteOrder",
+    "BookUpdate",
+    "ItchReplayer",
+    "LobsterReplayer",
+    "LobsterReport",
+    "JournalWriter",
+    "JournalReader",
+    "JournalError",
+    "save_snapshot",
+    "load_snapshot",
+    "SnapshotError",
+    "L2UpdateQueue",
+    "L3Feed",
+    "L3Book",
+    "L3Message",
+    "L3Snapshot",
+    "SequenceGapError",
+    "Bbo",
+    "BboPublisher",
+    "OrderGateway",
+    "GatewayClosedError",
+    "DepthPublisher",
+    "DepthSnapshot",
+    "SharedDepthPublisher",
+    "SharedDepthReader",
+    "SharedDepthError",
 ]
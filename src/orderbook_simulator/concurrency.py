@@ -0,0 +1,204 @@
+"""Lock-free depth reads for multi-threaded use.
+
+``OrderBook`` is single-writer and unsynchronized. A ``DepthPublisher``
+lets other threads read market depth without locking the book: after
+every write that touches its top levels, the writer thread builds an
+immutable ``DepthSnapshot`` and swaps it in with a single reference
+assignment. Readers take ``publisher.snapshot`` and query it as long as
+they like; it never changes underneath them, and taking it never waits
+on the writer.
+
+Snapshots are built only at operation boundaries (via
+``OrderBook.subscribe_commits``), so readers never see a half-matched
+book, and only when a level change reached the published depth, so
+activity deeper in the book costs the writer a single comparison.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .orderbook import BookLevel, LevelUpdate, OrderBook, Side
+
+logger = logging.getLogger(__name__)
+
+# Price levels per side kept in each snapshot by default
+DEFAULT_SNAPSHOT_LEVELS = 10
+
+
+@dataclass(frozen=True)
+class DepthSnapshot:
+    """Immutable top-of-book depth at one point in time.
+
+    Query methods mirror the ``OrderBook`` ones, restricted to the levels
+    the snapshot holds.
+
+    Attributes:
+        version: Publication number, increasing by one per snapshot.
+        timestamp: Book event time when the snapshot was taken.
+        tick_size: Tick size of the book.
+        bids: Top bid levels, best first.
+        asks: Top ask levels, best first.
+        spread: Bid-ask spread, or None if either side is empty.
+        midprice: Mid-price, or None if either side is empty.
+    """
+
+    version: int
+    timestamp: float
+    tick_size: float
+    bids: Tuple[BookLevel, ...]
+    asks: Tuple[BookLevel, ...]
+    spread: Optional[float]
+    midprice: Optional[float]
+
+    def best_bid(self) -> Optional[float]:
+        """Return the best bid price, or None if there are no bids."""
+        return self.bids[0].price if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        """Return the best ask price, or None if there are no asks."""
+        return self.asks[0].price if self.asks else None
+
+    def get_spread(self) -> Optional[float]:
+        """Return the bid-ask spread, or None if either side is empty."""
+        return self.spread
+
+    def get_midprice(self) -> Optional[float]:
+        """Return the mid-price, or None if either side is empty."""
+        return self.midprice
+
+    def get_book_depth(
+        self, levels: int = 5
+    ) -> Tuple[List[BookLevel], List[BookLevel]]:
+        """Get top N price levels for both sides.
+
+        Args:
+            levels: Number of price levels to return per side, up to the
+                snapshot's depth.
+
+        Returns:
+            Tuple of (bid_levels, ask_levels), each sorted by price priority.
+        """
+        return list(self.bids[:levels]), list(self.asks[:levels])
+
+    def get_vwap(self, side: Side, quantity: int) -> Optional[float]:
+        """Calculate volume-weighted average price for sweeping quantity.
+
+        Args:
+            side: Side of the book to sweep (BUY sweeps asks, SELL sweeps bids).
+            quantity: Quantity to sweep.
+
+        Returns:
+            VWAP if the snapshot's levels hold enough liquidity, None
+            otherwise.
+        """
+        levels = self.asks if side == Side.BUY else self.bids
+        tick_size = self.tick_size
+        remaining = quantity
+        total_ticks = 0
+        for level in levels:
+            fill_qty = min(remaining, level.quantity)
+            total_ticks += fill_qty * round(level.price / tick_size)
+            remaining -= fill_qty
+            if remaining <= 0:
+                break
+
+        if remaining > 0:
+            return None
+        return total_ticks * tick_size / quantity
+
+
+class DepthPublisher:
+    """Publishes immutable depth snapshots of a book for reader threads.
+
+    Create the publisher on the writer thread (or before any writes
+    start) and hand it to readers. Readers must only use ``snapshot``;
+    every other method is for the writer.
+
+    Attributes:
+        book: Book being published.
+        levels: Price levels per side in each snapshot.
+    """
+
+    def __init__(
+        self, book: OrderBook, levels: int = DEFAULT_SNAPSHOT_LEVELS
+    ) -> None:
+        """Attach a publisher to a book and publish its current depth.
+
+        Args:
+            book: Book to publish.
+            levels: Price levels per side in each snapshot.
+
+        Raises:
+            ValueError: If levels is not positive.
+        """
+        if levels <= 0:
+            raise ValueError(f"levels must be positive, got {levels}")
+        self.book = book
+        self.levels = levels
+        self._dirty = False
+        self._snapshot = self._build(0)
+        self._subscribed = True
+        book.subscribe_levels(self._on_level)
+        book.subscribe_commits(self._on_commit)
+
+    @property
+    def snapshot(self) -> DepthSnapshot:
+        """Return the latest published snapshot. Safe from any thread."""
+        return self._snapshot
+
+    def publish(self) -> DepthSnapshot:
+        """Publish a fresh snapshot now, whether or not depth changed.
+
+        Returns:
+            The new snapshot.
+        """
+        self._dirty = False
+        self._snapshot = self._build(self._snapshot.version + 1)
+        return self._snapshot
+
+    def close(self) -> None:
+        """Stop publishing. The last snapshot stays readable."""
+        if self._subscribed:
+            self.book.unsubscribe_levels(self._on_level)
+            self.book.unsubscribe_commits(self._on_commit)
+            self._subscribed = False
+
+    def _on_level(self, update: LevelUpdate) -> None:
+        """Mark the snapshot stale if a change reached its levels.
+
+        Args:
+            update: Level update from the book.
+        """
+        if self._dirty:
+            return
+        snapshot = self._snapshot
+        if update.side is Side.BUY:
+            levels = snapshot.bids
+            if len(levels) < self.levels or update.price >= levels[-1].price:
+                self._dirty = True
+        else:
+            levels = snapshot.asks
+            if len(levels) < self.levels or update.price <= levels[-1].price:
+                self._dirty = True
+
+    def _on_commit(self) -> None:
+        """Publish a new snapshot once a write has completed, if needed."""
+        if self._dirty:
+            self.publish()
+
+    def _build(self, version: int) -> DepthSnapshot:
+        """Capture the book's current top levels.
+
+        Args:
+            version: Version number of the snapshot.
+
+        Returns:
+            The new snapshot.
+        """
+        book = self.book
+        bids, asks = book.get_book_depth(self.levels)
+        return DepthSnapshot(
+            version, book._clock, book.tick_size, tuple(bids), tuple(asks),
+            book.get_spread(), book.get_midprice(),
+        )
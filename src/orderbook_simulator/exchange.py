@@ -0,0 +1,370 @@
+"""Multi-symbol matching engine routing orders to per-symbol books.
+
+An ``Exchange`` owns one ``OrderBook`` per symbol, routes submits, amends
+and cancels by symbol, and shares order and trade ID sequences across all
+books so IDs are unique exchange-wide. Top-of-book state for every symbol
+is mirrored into NumPy arrays as events are routed, so a cross-symbol BBO
+query is a handful of vectorized operations.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .orderbook import (
+    DEFAULT_TICK_SIZE,
+    IdSequence,
+    Order,
+    OrderBook,
+    OrderType,
+    Side,
+    Trade,
+)
+
+logger = logging.getLogger(__name__)
+
+# Initial number of symbol rows allocated for top-of-book arrays
+INITIAL_SYMBOL_CAPACITY = 64
+
+# Row layout returned by Exchange.top_of_book
+TOP_OF_BOOK_DTYPE = np.dtype([
+    ("bid", np.float64),
+    ("bid_qty", np.int64),
+    ("ask", np.float64),
+    ("ask_qty", np.int64),
+])
+
+
+class UnknownSymbolError(KeyError):
+    """Raised when a symbol has no book on the exchange."""
+
+
+class Exchange:
+    """Router and owner of many single-instrument order books.
+
+    Books should be driven through the exchange so that its top-of-book
+    arrays stay current; mutating a book obtained from ``book()`` directly
+    leaves that symbol's row stale until the next routed event.
+
+    Attributes:
+        tick_size: Default tick size for new symbols.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        tick_size: float = DEFAULT_TICK_SIZE,
+        order_ids: Optional[IdSequence] = None,
+        trade_ids: Optional[IdSequence] = None,
+        **book_kwargs: Any,
+    ) -> None:
+        """Initialize the exchange.
+
+        Args:
+            symbols: Symbols to list immediately with the default settings.
+            tick_size: Default tick size for listed symbols.
+            order_ids: Order ID sequence shared by all books. A fresh
+                sequence if None.
+            trade_ids: Trade ID sequence shared by all books. A fresh
+                sequence if None.
+            **book_kwargs: Extra ``OrderBook`` arguments applied to every
+                book (e.g. ``backend`` or ``retention``).
+        """
+        self.tick_size = tick_size
+        self._book_kwargs = book_kwargs
+
+        # Shared exchange-wide ID sequences
+        self._order_ids = order_ids or IdSequence()
+        self._trade_ids = trade_ids or IdSequence()
+
+        self._books: Dict[str, OrderBook] = {}
+        self._rows: Dict[str, int] = {}
+
+        # Per-symbol top of book, in ticks (0 quantity means empty side)
+        capacity = INITIAL_SYMBOL_CAPACITY
+        self._bid_ticks = np.zeros(capacity, dtype=np.int64)
+        self._bid_qty = np.zeros(capacity, dtype=np.int64)
+        self._ask_ticks = np.zeros(capacity, dtype=np.int64)
+        self._ask_qty = np.zeros(capacity, dtype=np.int64)
+        self._tick_sizes = np.ones(capacity, dtype=np.float64)
+        self._price_scales = np.ones(capacity, dtype=np.float64)
+
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Return listed symbols in row order."""
+        return list(self._books)
+
+    def add_symbol(
+        self,
+        symbol: str,
+        tick_size: Optional[float] = None,
+        **book_kwargs: Any,
+    ) -> OrderBook:
+        """List a new symbol with its own order book.
+
+        Args:
+            symbol: Instrument identifier.
+            tick_size: Tick size for this symbol, or None for the default.
+            **book_kwargs: ``OrderBook`` arguments overriding the
+                exchange-wide ones.
+
+        Returns:
+            The new order book.
+
+        Raises:
+            ValueError: If the symbol is already listed.
+        """
+        if symbol in self._books:
+            raise ValueError(f"Symbol {symbol!r} is already listed")
+
+        kwargs = {**self._book_kwargs, **book_kwargs}
+        book = OrderBook(
+            symbol=symbol,
+            tick_size=self.tick_size if tick_size is None else tick_size,
+            order_ids=self._order_ids,
+            trade_ids=self._trade_ids,
+            **kwargs,
+        )
+        row = len(self._books)
+        if row == len(self._bid_ticks):
+            self._grow()
+        self._books[symbol] = book
+        self._rows[symbol] = row
+        self._tick_sizes[row] = book.tick_size
+        self._price_scales[row] = 10.0 ** book._price_decimals
+
+        logger.info("Listed symbol %s (row %d)", symbol, row)
+        return book
+
+    def book(self, symbol: str) -> OrderBook:
+        """Return the order book for a symbol.
+
+        Args:
+            symbol: Instrument identifier.
+
+        Returns:
+            The symbol's OrderBook.
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+        """
+        try:
+            return self._books[symbol]
+        except KeyError:
+            raise UnknownSymbolError(f"Symbol {symbol!r} is not listed") from None
+
+    def submit_order(
+        self,
+        symbol: str,
+        side: Side,
+        price: float,
+        quantity: int,
+        order_type: OrderType = OrderType.LIMIT,
+        timestamp: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Tuple[Order, List[Trade]]:
+        """Route a new order to a symbol's book.
+
+        Args:
+            symbol: Instrument identifier.
+            side: BUY or SELL.
+            price: Limit price. Ignored for MARKET orders.
+            quantity: Number of units to trade.
+            order_type: LIMIT, MARKET, or IOC.
+            timestamp: Order time. Uses current time if None.
+            tag: Optional client tag.
+
+        Returns:
+            Tuple of (submitted_order, list_of_trades_generated).
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+            OrderValidationError: If order parameters are invalid.
+        """
+        book = self.book(symbol)
+        result = book.submit_order(
+            side, price, quantity, order_type, timestamp, tag
+        )
+        self._sync_row(symbol, book)
+        return result
+
+    def submit_orders(
+        self, symbol: str, *args: Any, **kwargs: Any
+    ) -> Tuple[List[Order], List[Trade]]:
+        """Route a batch of orders to a symbol's book.
+
+        Accepts the same arguments as ``OrderBook.submit_orders``.
+
+        Args:
+            symbol: Instrument identifier.
+            *args: Positional arguments for ``OrderBook.submit_orders``.
+            **kwargs: Keyword arguments for ``OrderBook.submit_orders``.
+
+        Returns:
+            Tuple of (submitted_orders, all_trades_generated).
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+        """
+        book = self.book(symbol)
+        result = book.submit_orders(*args, **kwargs)
+        self._sync_row(symbol, book)
+        return result
+
+    def cancel_order(self, symbol: str, order_id: int) -> Order:
+        """Cancel an open order on a symbol's book.
+
+        Args:
+            symbol: Instrument identifier.
+            order_id: ID of the order to cancel.
+
+        Returns:
+            The cancelled order.
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+            OrderNotFoundError: If the order is not on that book.
+        """
+        book = self.book(symbol)
+        order = book.cancel_order(order_id)
+        self._sync_row(symbol, book)
+        return order
+
+    def cancel_orders(self, symbol: str, order_ids: Iterable[int]) -> List[Order]:
+        """Cancel several open orders on a symbol's book.
+
+        Args:
+            symbol: Instrument identifier.
+            order_ids: IDs of the orders to cancel.
+
+        Returns:
+            The cancelled orders.
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+        """
+        book = self.book(symbol)
+        orders = book.cancel_orders(order_ids)
+        self._sync_row(symbol, book)
+        return orders
+
+    def modify_order(
+        self,
+        symbol: str,
+        order_id: int,
+        new_price: Optional[float] = None,
+        new_qty: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> Tuple[Order, List[Trade]]:
+        """Amend an open order on a symbol's book.
+
+        Args:
+            symbol: Instrument identifier.
+            order_id: ID of the order to amend.
+            new_price: New limit price, or None to keep it.
+            new_qty: New total quantity, or None to keep it.
+            timestamp: Amendment time. Uses current time if None.
+
+        Returns:
+            Tuple of (amended_order, list_of_trades_generated).
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+        """
+        book = self.book(symbol)
+        result = book.modify_order(order_id, new_price, new_qty, timestamp)
+        self._sync_row(symbol, book)
+        return result
+
+    def execute_order(
+        self,
+        symbol: str,
+        order_id: int,
+        quantity: int,
+        price: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> Trade:
+        """Fill a resting order on a symbol's book against an outside party.
+
+        Args:
+            symbol: Instrument identifier.
+            order_id: ID of the resting order.
+            quantity: Executed quantity.
+            price: Execution price, or None for the order's limit price.
+            timestamp: Execution time. Uses current time if None.
+
+        Returns:
+            The executed Trade.
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+        """
+        book = self.book(symbol)
+        trade = book.execute_order(order_id, quantity, price, timestamp)
+        self._sync_row(symbol, book)
+        return trade
+
+    def top_of_book(self) -> np.ndarray:
+        """Return best bid/ask price and size for every symbol.
+
+        Returns:
+            Structured array of ``TOP_OF_BOOK_DTYPE`` with one row per
+            symbol, in ``symbols`` order. Empty sides have NaN price and
+            zero quantity.
+        """
+        count = len(self._books)
+        scales = self._price_scales[:count]
+        ticks_to_price = self._tick_sizes[:count] * scales
+
+        result = np.empty(count, dtype=TOP_OF_BOOK_DTYPE)
+        bid_qty = self._bid_qty[:count]
+        ask_qty = self._ask_qty[:count]
+        result["bid"] = np.where(
+            bid_qty > 0,
+            np.rint(self._bid_ticks[:count] * ticks_to_price) / scales,
+            np.nan,
+        )
+        result["ask"] = np.where(
+            ask_qty > 0,
+            np.rint(self._ask_ticks[:count] * ticks_to_price) / scales,
+            np.nan,
+        )
+        result["bid_qty"] = bid_qty
+        result["ask_qty"] = ask_qty
+        return result
+
+    def _sync_row(self, symbol: str, book: OrderBook) -> None:
+        """Copy a book's current top of book into the exchange arrays.
+
+        Args:
+            symbol: Instrument identifier.
+            book: The symbol's book, just mutated.
+        """
+        row = self._rows[symbol]
+        best_bid = book._best_bid
+        if best_bid is None:
+            self._bid_qty[row] = 0
+        else:
+            self._bid_ticks[row] = best_bid
+            self._bid_qty[row] = book._bids.levels[best_bid].quantity
+        best_ask = book._best_ask
+        if best_ask is None:
+            self._ask_qty[row] = 0
+        else:
+            self._ask_ticks[row] = best_ask
+            self._ask_qty[row] = book._asks.levels[best_ask].quantity
+
+    def _grow(self) -> None:
+        """Double the capacity of the per-symbol arrays."""
+        for name in (
+            "_bid_ticks", "_bid_qty", "_ask_ticks", "_ask_qty",
+            "_tick_sizes", "_price_scales",
+        ):
+            old = getattr(self, name)
+            grown = np.zeros(len(old) * 2, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
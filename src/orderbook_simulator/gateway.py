@@ -0,0 +1,299 @@
+"""asyncio order entry gateway.
+
+An ``OrderGateway`` lets many client coroutines trade against one
+``OrderBook`` concurrently. Requests go onto a bounded queue and a single
+owner task applies them to the book, so the book itself needs no locking.
+The owner drains whatever has accumulated (up to ``max_batch`` requests)
+and applies it synchronously as one micro-batch. Each client awaits its
+own future, which resolves to the same result the book call would return
+or raises the same exception.
+
+When the queue is full, clients block on enqueueing until the owner
+catches up, which bounds memory and latency under load. Under load, the
+owner's scheduling cost is paid once per batch instead of once per
+request.
+"""
+
+import asyncio
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .orderbook import Order, OrderBook, OrderType, Side, Trade
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# Requests queued before clients are made to wait
+DEFAULT_MAX_PENDING = 10_000
+
+# Requests applied per owner wake-up
+DEFAULT_MAX_BATCH = 1_000
+
+
+class GatewayClosedError(RuntimeError):
+    """Raised when a request is sent to a gateway that is not running."""
+
+
+class _Request(NamedTuple):
+    """A queued book call and the future awaiting its result."""
+
+    method: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: "asyncio.Future[Any]"
+
+
+class OrderGateway:
+    """Serializes concurrent order requests onto one book.
+
+    Use as an async context manager, or call ``start`` and ``close``::
+
+        async with OrderGateway(book) as gateway:
+            order, trades = await gateway.submit_order(Side.BUY, 100.0, 10)
+
+    Requests whose caller was cancelled before the owner reached them are
+    not applied.
+
+    Attributes:
+        book: Book owned by the gateway.
+        max_pending: Capacity of the inbound queue.
+        max_batch: Maximum requests applied per micro-batch.
+        batches: Number of micro-batches applied.
+        requests_applied: Number of requests applied to the book.
+    """
+
+    def __init__(
+        self,
+        book: Optional[OrderBook] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        """Initialize the gateway.
+
+        Args:
+            book: Book to drive. A fresh ``OrderBook`` if None.
+            max_pending: Queued requests before clients block.
+            max_batch: Maximum requests applied per micro-batch.
+
+        Raises:
+            ValueError: If max_pending or max_batch is not positive.
+        """
+        if max_pending <= 0:
+            raise ValueError(f"max_pending must be positive, got {max_pending}")
+        if max_batch <= 0:
+            raise ValueError(f"max_batch must be positive, got {max_batch}")
+        self.book = book if book is not None else OrderBook()
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests_applied = 0
+        # Created in start() so it binds to the running loop
+        self._queue: Optional[asyncio.Queue[Optional[_Request]]] = None
+        self._owner: Optional[asyncio.Task[None]] = None
+        self._closing = False
+
+    async def __aenter__(self) -> "Self":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued requests."""
+        return 0 if self._queue is None else self._queue.qsize()
+
+    async def start(self) -> None:
+        """Start the owner task on the running event loop.
+
+        Raises:
+            GatewayClosedError: If the gateway was already started.
+        """
+        if self._owner is not None:
+            raise GatewayClosedError("Gateway was already started")
+        queue: asyncio.Queue[Optional[_Request]] = asyncio.Queue(
+            maxsize=self.max_pending
+        )
+        self._queue = queue
+        self._owner = asyncio.get_running_loop().create_task(self._run(queue))
+
+    async def close(self) -> None:
+        """Apply every queued request, then stop the owner task."""
+        queue = self._queue
+        if self._owner is None or queue is None or self._closing:
+            return
+        self._closing = True
+        await queue.put(None)
+        await self._owner
+
+        # Clients that were blocked on a full queue enqueue after the
+        # owner has stopped; fail them rather than leave them waiting
+        while True:
+            while not queue.empty():
+                request = queue.get_nowait()
+                if request is not None and not request.future.done():
+                    request.future.set_exception(
+                        GatewayClosedError("Gateway closed")
+                    )
+            await asyncio.sleep(0)
+            if queue.empty():
+                break
+        logger.info(
+            "Gateway closed after %d requests in %d batches",
+            self.requests_applied, self.batches,
+        )
+
+    async def submit_order(
+        self,
+        side: Side,
+        price: float,
+        quantity: int,
+        order_type: OrderType = OrderType.LIMIT,
+        timestamp: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Tuple[Order, List[Trade]]:
+        """Submit an order through the gateway.
+
+        Args:
+            side: BUY or SELL.
+            price: Limit price (ignored for MARKET orders).
+            quantity: Number of units.
+            order_type: LIMIT, MARKET, or IOC.
+            timestamp: Order time. Uses current time if None.
+            tag: Optional client tag.
+
+        Returns:
+            Tuple of (order, trades_generated).
+
+        Raises:
+            GatewayClosedError: If the gateway is not running.
+            OrderValidationError: If the book rejects the order.
+        """
+        return await self._call(
+            self.book.submit_order,
+            side, price, quantity, order_type, timestamp, tag,
+        )
+
+    async def cancel_order(self, order_id: int) -> Order:
+        """Cancel an order through the gateway.
+
+        Args:
+            order_id: ID of the order to cancel.
+
+        Returns:
+            The cancelled order.
+
+        Raises:
+            GatewayClosedError: If the gateway is not running.
+            OrderNotFoundError: If the order is not found.
+            OrderValidationError: If the order is not open.
+        """
+        return await self._call(self.book.cancel_order, order_id)
+
+    async def modify_order(
+        self,
+        order_id: int,
+        new_price: Optional[float] = None,
+        new_qty: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> Tuple[Order, List[Trade]]:
+        """Amend an order through the gateway.
+
+        Args:
+            order_id: ID of the order to amend.
+            new_price: New limit price, or None to keep it.
+            new_qty: New total quantity, or None to keep it.
+            timestamp: Amend time. Uses current time if None.
+
+        Returns:
+            Tuple of (order, trades_generated).
+
+        Raises:
+            GatewayClosedError: If the gateway is not running.
+            OrderNotFoundError: If the order is not found.
+            OrderValidationError: If the amendment is invalid.
+        """
+        return await self._call(
+            self.book.modify_order, order_id, new_price, new_qty, timestamp
+        )
+
+    async def _call(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Queue a book call and wait for its result.
+
+        Blocks while the queue is full.
+
+        Args:
+            method: Bound book method.
+            *args: Positional arguments for the method.
+
+        Returns:
+            The method's return value.
+
+        Raises:
+            GatewayClosedError: If the gateway is not running.
+        """
+        queue = self._queue
+        if (
+            self._owner is None or queue is None or self._closing
+            or self._owner.done()
+        ):
+            raise GatewayClosedError("Gateway is not running")
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(_Request(method, args, future))
+        return await future
+
+    async def _run(self, queue: "asyncio.Queue[Optional[_Request]]") -> None:
+        """Owner task: drain the queue in micro-batches until closed.
+
+        Args:
+            queue: Inbound request queue.
+        """
+        max_batch = self.max_batch
+        stopping = False
+        while not stopping:
+            request = await queue.get()
+            batch: List[_Request] = []
+            while request is not None:
+                batch.append(request)
+                if len(batch) >= max_batch:
+                    break
+                try:
+                    request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            else:
+                stopping = True
+            self._apply(batch)
+            # Let clients blocked on a full queue refill it
+            await asyncio.sleep(0)
+
+    def _apply(self, batch: List[_Request]) -> None:
+        """Apply one micro-batch and resolve its futures.
+
+        Args:
+            batch: Requests in arrival order.
+        """
+        applied = 0
+        for method, args, future in batch:
+            if future.cancelled():
+                continue
+            # Whatever the book raises belongs to the caller, not the owner
+            try:
+                result = method(*args)
+            except Exception as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            applied += 1
+        self.batches += 1
+        self.requests_applied += applied
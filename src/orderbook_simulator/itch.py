@@ -0,0 +1,350 @@
+"""NASDAQ TotalView-ITCH 5.0 parser and book replayer.
+
+ITCH files are a stream of messages, each prefixed by a 2-byte big-endian
+length. The replayer memory-maps the file and walks it in place: the
+message type byte and stock locate are read first so messages for
+untracked stocks are skipped without decoding, and the order messages
+that are kept are decoded with precompiled ``struct`` layouts straight
+from the mapped buffer. Nothing is copied or materialized; pass a
+``RetentionPolicy`` through the book arguments to also bound the books'
+order and trade history over a full trading day.
+
+Decoded messages drive an ``Exchange`` with one ``OrderBook`` per stock:
+
+- ``A``/``F`` (add order) submit a resting limit order.
+- ``E``/``C`` (order executed) fill the resting order in place.
+- ``X`` (order cancel) reduces it; ``D`` (order delete) cancels it.
+- ``U`` (order replace) cancels it and adds the replacement, which takes
+  a new reference number and loses time priority.
+- ``R`` (stock directory) maps stock locate codes to symbols.
+
+Other message types are skipped.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .exchange import Exchange
+from .orderbook import (
+    OrderNotFoundError,
+    OrderType,
+    OrderValidationError,
+    Side,
+)
+
+logger = logging.getLogger(__name__)
+
+# ITCH prices carry 4 implied decimal places
+ITCH_PRICE_SCALE = 10_000
+
+# Tick size matching ITCH price precision
+ITCH_TICK_SIZE = 1.0 / ITCH_PRICE_SCALE
+
+# ITCH timestamps are nanoseconds since midnight
+_NANOS_PER_SECOND = 1e9
+
+# Message framing: 2-byte length prefix, then the type byte
+_LENGTH = struct.Struct(">H")
+# Stock locate, shared by every message right after the type byte
+_LOCATE = struct.Struct(">H")
+
+# Message bodies after the type byte. The 6-byte timestamp is split into
+# high 16 and low 32 bits; the 2-byte tracking number is skipped.
+_STOCK_DIRECTORY = struct.Struct(">H2xHI8s")
+_ADD_ORDER = struct.Struct(">H2xHIQcI8sI")
+_ORDER_EXECUTED = struct.Struct(">H2xHIQI")
+_ORDER_EXECUTED_WITH_PRICE = struct.Struct(">H2xHIQIQcI")
+_ORDER_CANCEL = struct.Struct(">H2xHIQI")
+_ORDER_DELETE = struct.Struct(">H2xHIQ")
+_ORDER_REPLACE = struct.Struct(">H2xHIQQII")
+
+_TYPE_STOCK_DIRECTORY = ord("R")
+_TYPE_ADD = ord("A")
+_TYPE_ADD_MPID = ord("F")
+_TYPE_EXECUTED = ord("E")
+_TYPE_EXECUTED_WITH_PRICE = ord("C")
+_TYPE_CANCEL = ord("X")
+_TYPE_DELETE = ord("D")
+_TYPE_REPLACE = ord("U")
+
+# Message types that may introduce a stock locate we have not seen yet
+_TYPES_WITH_STOCK = (_TYPE_STOCK_DIRECTORY, _TYPE_ADD, _TYPE_ADD_MPID)
+
+_SIDE_BY_INDICATOR = {b"B": Side.BUY, b"S": Side.SELL}
+
+
+class ItchReplayer:
+    """Replays ITCH 5.0 order messages into per-stock order books.
+
+    Attributes:
+        exchange: Exchange holding one book per replayed stock.
+        strict: Whether messages that cannot be applied raise. If False
+            they are logged, counted in ``skipped`` and dropped, which
+            allows replaying a file that starts mid-session.
+        messages: Number of messages read.
+        skipped: Number of tracked messages dropped in non-strict mode.
+    """
+
+    def __init__(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        tick_size: float = ITCH_TICK_SIZE,
+        strict: bool = True,
+        **book_kwargs: Any,
+    ) -> None:
+        """Initialize the replayer.
+
+        Args:
+            symbols: Stocks to replay. Every stock in the feed if None.
+                Messages for other stocks are skipped without decoding.
+            tick_size: Tick size for every book.
+            strict: Raise on messages that cannot be applied.
+            **book_kwargs: Extra ``OrderBook`` arguments for every book.
+        """
+        self.exchange = Exchange(tick_size=tick_size, **book_kwargs)
+        self.strict = strict
+        self.messages = 0
+        self.skipped = 0
+        self._wanted = None if symbols is None else frozenset(symbols)
+
+        # Stock locate -> symbol, or None for stocks that are not replayed
+        self._symbols: Dict[int, Optional[str]] = {}
+        # Live ITCH order reference number -> book order ID
+        self._orders: Dict[int, int] = {}
+
+    def replay_file(self, path: Union[str, os.PathLike]) -> int:
+        """Memory-map an ITCH file and replay every message in it.
+
+        Args:
+            path: Path to an uncompressed ITCH 5.0 file.
+
+        Returns:
+            Number of messages read.
+        """
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self.replay(mapped)
+
+    def replay(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> int:
+        """Replay length-prefixed ITCH messages from a buffer.
+
+        Args:
+            buffer: Buffer holding whole messages.
+
+        Returns:
+            Number of messages read.
+
+        Raises:
+            ValueError: If the buffer ends inside a message.
+            OrderNotFoundError: In strict mode, if a message references an
+                unknown order.
+            OrderValidationError: In strict mode, if a book rejects a
+                message.
+        """
+        symbols = self._symbols
+        unpack_length = _LENGTH.unpack_from
+        unpack_locate = _LOCATE.unpack_from
+        end = len(buffer)
+        offset = 0
+        count = 0
+
+        while offset < end:
+            start = offset + 2
+            if start > end:
+                raise ValueError(f"Truncated ITCH message at offset {offset}")
+            (length,) = unpack_length(buffer, offset)
+            offset = start + length
+            if offset > end:
+                raise ValueError(f"Truncated ITCH message at offset {start - 2}")
+            count += 1
+
+            kind = buffer[start]
+            (locate,) = unpack_locate(buffer, start + 1)
+            symbol = symbols.get(locate)
+            if symbol is None:
+                if locate in symbols or kind not in _TYPES_WITH_STOCK:
+                    continue
+                symbol = self._register_locate(buffer, start, kind, locate)
+                if symbol is None:
+                    continue
+            if kind == _TYPE_STOCK_DIRECTORY:
+                continue
+
+            try:
+                self._apply(buffer, start + 1, kind, symbol)
+            except (OrderNotFoundError, OrderValidationError) as exc:
+                if self.strict:
+                    raise
+                self.skipped += 1
+                logger.debug("Skipped ITCH %r message: %s", chr(kind), exc)
+
+        self.messages += count
+        return count
+
+    def _register_locate(
+        self, buffer: Any, start: int, kind: int, locate: int
+    ) -> Optional[str]:
+        """Resolve the symbol of a stock locate on its first appearance.
+
+        Args:
+            buffer: Message buffer.
+            start: Offset of the message type byte.
+            kind: Message type byte.
+            locate: Stock locate code.
+
+        Returns:
+            The symbol if the stock is replayed, else None.
+        """
+        if kind == _TYPE_STOCK_DIRECTORY:
+            stock = _STOCK_DIRECTORY.unpack_from(buffer, start + 1)[3]
+        else:
+            stock = _ADD_ORDER.unpack_from(buffer, start + 1)[6]
+        symbol = stock.decode("ascii").rstrip()
+
+        if self._wanted is not None and symbol not in self._wanted:
+            self._symbols[locate] = None
+            return None
+        self._symbols[locate] = symbol
+        if symbol not in self.exchange.symbols:
+            self.exchange.add_symbol(symbol)
+        return symbol
+
+    def _apply(self, buffer: Any, body: int, kind: int, symbol: str) -> None:
+        """Decode one order message and apply it to the symbol's book.
+
+        Args:
+            buffer: Message buffer.
+            body: Offset just past the message type byte.
+            kind: Message type byte.
+            symbol: Symbol of the message's stock.
+        """
+        exchange = self.exchange
+        orders = self._orders
+
+        if kind == _TYPE_ADD or kind == _TYPE_ADD_MPID:
+            _, ts_hi, ts_lo, ref, side, shares, _, price = (
+                _ADD_ORDER.unpack_from(buffer, body)
+            )
+            self._add(symbol, ref, _SIDE_BY_INDICATOR[side], shares, price,
+                      ((ts_hi << 32) | ts_lo) / _NANOS_PER_SECOND)
+
+        elif kind == _TYPE_EXECUTED:
+            _, ts_hi, ts_lo, ref, shares = _ORDER_EXECUTED.unpack_from(buffer, body)
+            self._execute(symbol, ref, shares, None,
+                          ((ts_hi << 32) | ts_lo) / _NANOS_PER_SECOND)
+
+        elif kind == _TYPE_EXECUTED_WITH_PRICE:
+            _, ts_hi, ts_lo, ref, shares, _, _, price = (
+                _ORDER_EXECUTED_WITH_PRICE.unpack_from(buffer, body)
+            )
+            self._execute(symbol, ref, shares, price / ITCH_PRICE_SCALE,
+                          ((ts_hi << 32) | ts_lo) / _NANOS_PER_SECOND)
+
+        elif kind == _TYPE_CANCEL:
+            _, _, _, ref, shares = _ORDER_CANCEL.unpack_from(buffer, body)
+            order_id = self._order_id(ref)
+            order = exchange.book(symbol).get_order(order_id)
+            if shares >= order.remaining:
+                exchange.cancel_order(symbol, order_id)
+                del orders[ref]
+            else:
+                exchange.modify_order(
+                    symbol, order_id, new_qty=order.quantity - shares
+                )
+
+        elif kind == _TYPE_DELETE:
+            _, _, _, ref = _ORDER_DELETE.unpack_from(buffer, body)
+            exchange.cancel_order(symbol, self._order_id(ref))
+            del orders[ref]
+
+        elif kind == _TYPE_REPLACE:
+            _, ts_hi, ts_lo, ref, new_ref, shares, price = (
+                _ORDER_REPLACE.unpack_from(buffer, body)
+            )
+            order_id = self._order_id(ref)
+            book = exchange.book(symbol)
+            side = book.get_order(order_id).side
+            # Reject a bad replacement before the original leaves the book
+            book._validate_order_params(
+                side, price / ITCH_PRICE_SCALE, shares, OrderType.LIMIT
+            )
+            book._price_to_ticks(price / ITCH_PRICE_SCALE)
+            exchange.cancel_order(symbol, order_id)
+            del orders[ref]
+            self._add(symbol, new_ref, side, shares, price,
+                      ((ts_hi << 32) | ts_lo) / _NANOS_PER_SECOND)
+
+    def _add(
+        self,
+        symbol: str,
+        ref: int,
+        side: Side,
+        shares: int,
+        price: int,
+        timestamp: float,
+    ) -> None:
+        """Submit a resting order and remember its reference number.
+
+        Args:
+            symbol: Stock symbol.
+            ref: ITCH order reference number.
+            side: Order side.
+            shares: Order size.
+            price: Price in ITCH fixed-point units.
+            timestamp: Event time in seconds since midnight.
+        """
+        order, _ = self.exchange.submit_order(
+            symbol, side, price / ITCH_PRICE_SCALE, shares, OrderType.LIMIT,
+            timestamp,
+        )
+        if order.remaining > 0:
+            self._orders[ref] = order.order_id
+
+    def _execute(
+        self,
+        symbol: str,
+        ref: int,
+        shares: int,
+        price: Optional[float],
+        timestamp: float,
+    ) -> None:
+        """Execute part or all of a resting order and forget it once filled.
+
+        Whether the order is filled is decided from its size before the
+        execution, since a filled order may be evicted from the book under
+        a retention policy.
+
+        Args:
+            symbol: Stock symbol.
+            ref: ITCH order reference number.
+            shares: Executed size.
+            price: Execution price, or None for the order's limit price.
+            timestamp: Event time in seconds since midnight.
+        """
+        order_id = self._order_id(ref)
+        remaining = self.exchange.book(symbol).get_order(order_id).remaining
+        self.exchange.execute_order(symbol, order_id, shares, price, timestamp)
+        if shares == remaining:
+            del self._orders[ref]
+
+    def _order_id(self, ref: int) -> int:
+        """Translate an ITCH order reference number into a book order ID.
+
+        Args:
+            ref: ITCH order reference number.
+
+        Returns:
+            Book order ID.
+
+        Raises:
+            OrderNotFoundError: If the reference is not live.
+        """
+        try:
+            return self._orders[ref]
+        except KeyError:
+            raise OrderNotFoundError(f"ITCH order {ref} is not live") from None
@@ -0,0 +1,346 @@
+"""Binary event journal for order books.
+
+A ``JournalWriter`` attached to an ``OrderBook`` appends one fixed-width
+record per accepted submit, cancel, amend or execution, through a buffered
+file. A ``JournalReader`` memory-maps the file and exposes every record at
+once as a read-only NumPy structured array, so replaying a session needs
+no parsing and no per-record objects: columns are sliced out of the map a
+chunk at a time and fed straight to the book.
+
+Records hold everything needed to reproduce the book exactly, including
+the order IDs originally assigned. Client tags are not journaled; mass
+cancels are recorded as one cancel record per order.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional, Union
+
+import numpy as np
+
+from .orderbook import (
+    _ORDER_TYPE_CODE,
+    _SIDE_CODE,
+    ORDER_TYPE_BY_CODE,
+    SIDE_BY_CODE,
+    Order,
+    OrderBook,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# File signature and format version written in the header
+JOURNAL_MAGIC = b"OBJ\x00"
+JOURNAL_VERSION = 1
+
+# Bytes buffered in memory before a write to disk
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Records converted per step during replay
+DEFAULT_REPLAY_CHUNK = 1 << 16
+
+# Record kinds
+KIND_SUBMIT = 1
+KIND_CANCEL = 2
+KIND_MODIFY = 3
+KIND_EXECUTE = 4
+
+# Fixed-width little-endian record layout (40 bytes). ``price`` is the
+# order's limit price for submits and amends and the execution price for
+# executions; ``quantity`` is the total order quantity for submits and
+# amends and the executed quantity for executions.
+JOURNAL_DTYPE = np.dtype([
+    ("kind", "u1"),
+    ("side", "u1"),
+    ("order_type", "u1"),
+    ("reserved", "V5"),
+    ("order_id", "<i8"),
+    ("quantity", "<i8"),
+    ("price", "<f8"),
+    ("timestamp", "<f8"),
+])
+
+# Same layout as JOURNAL_DTYPE, for packing single records on append
+_RECORD = struct.Struct("<BBB5xqqdd")
+
+# Header: magic, version, record size, then padding to 16 bytes
+_HEADER = struct.Struct("<4sHH8x")
+HEADER_SIZE = _HEADER.size
+
+PathLike = Union[str, os.PathLike]
+
+
+class JournalError(ValueError):
+    """Raised when a journal file is malformed or of another version."""
+
+
+def _check_header(header: bytes) -> None:
+    """Validate a journal file header.
+
+    Args:
+        header: First HEADER_SIZE bytes of the file.
+
+    Raises:
+        JournalError: If the header is missing or incompatible.
+    """
+    if len(header) < HEADER_SIZE:
+        raise JournalError("File is too short to be a journal")
+    magic, version, record_size = _HEADER.unpack_from(header)
+    if magic != JOURNAL_MAGIC:
+        raise JournalError("Not an order book journal")
+    if version != JOURNAL_VERSION or record_size != JOURNAL_DTYPE.itemsize:
+        raise JournalError(
+            f"Unsupported journal version {version} "
+            f"(record size {record_size})"
+        )
+
+
+class JournalWriter:
+    """Appends fixed-width event records to a journal file.
+
+    Pass the writer to ``OrderBook(journal=...)`` and the book records
+    each accepted operation after applying it. Records reach the disk when
+    the buffer fills, on ``flush`` and on ``close``.
+
+    Attributes:
+        path: Journal file path.
+        records_written: Number of records appended by this writer.
+    """
+
+    def __init__(
+        self, path: PathLike, buffer_size: int = DEFAULT_BUFFER_SIZE
+    ) -> None:
+        """Open a journal for appending, creating it if needed.
+
+        Args:
+            path: Journal file path.
+            buffer_size: Bytes buffered in memory between disk writes.
+
+        Raises:
+            JournalError: If an existing file is not a compatible journal.
+        """
+        self.path = path
+        self.records_written = 0
+        # Held open across calls and released by close()
+        file = open(path, "ab", buffering=buffer_size)  # noqa: SIM115
+        try:
+            if file.tell() == 0:
+                file.write(_HEADER.pack(
+                    JOURNAL_MAGIC, JOURNAL_VERSION, JOURNAL_DTYPE.itemsize
+                ))
+            else:
+                with open(path, "rb") as existing:
+                    _check_header(existing.read(HEADER_SIZE))
+        except BaseException:
+            file.close()
+            raise
+        self._file: BinaryIO = file
+        self._pack = _RECORD.pack
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record_submit(self, order: Order) -> None:
+        """Append a submit record for a newly accepted order.
+
+        Args:
+            order: The submitted order.
+        """
+        self._file.write(self._pack(
+            KIND_SUBMIT, _SIDE_CODE[order.side],
+            _ORDER_TYPE_CODE[order.order_type], order.order_id,
+            order.quantity, order.price, order.timestamp,
+        ))
+        self.records_written += 1
+
+    def record_cancel(self, order: Order, timestamp: float) -> None:
+        """Append a cancel record.
+
+        Args:
+            order: The cancelled order.
+            timestamp: Book event time of the cancel.
+        """
+        self._file.write(self._pack(
+            KIND_CANCEL, _SIDE_CODE[order.side],
+            _ORDER_TYPE_CODE[order.order_type], order.order_id,
+            order.quantity, order.price, timestamp,
+        ))
+        self.records_written += 1
+
+    def record_modify(self, order: Order) -> None:
+        """Append an amend record holding the order's new price and size.
+
+        Args:
+            order: The amended order.
+        """
+        self._file.write(self._pack(
+            KIND_MODIFY, _SIDE_CODE[order.side],
+            _ORDER_TYPE_CODE[order.order_type], order.order_id,
+            order.quantity, order.price, order.timestamp,
+        ))
+        self.records_written += 1
+
+    def record_execute(
+        self, order: Order, quantity: int, price: float, timestamp: float
+    ) -> None:
+        """Append an execution record.
+
+        Args:
+            order: The resting order that was filled.
+            quantity: Executed quantity.
+            price: Execution price.
+            timestamp: Execution time.
+        """
+        self._file.write(self._pack(
+            KIND_EXECUTE, _SIDE_CODE[order.side],
+            _ORDER_TYPE_CODE[order.order_type], order.order_id,
+            quantity, price, timestamp,
+        ))
+        self.records_written += 1
+
+    def flush(self) -> None:
+        """Write buffered records to the operating system."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the journal file."""
+        if not self._file.closed:
+            self._file.close()
+            logger.info(
+                "Closed journal %s (%d records written)",
+                self.path, self.records_written,
+            )
+
+
+class JournalReader:
+    """Memory-mapped, read-only view of a journal file.
+
+    Attributes:
+        path: Journal file path.
+        records: Structured array of ``JOURNAL_DTYPE`` over the mapped file.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """Map a journal file.
+
+        Args:
+            path: Journal file path.
+
+        Raises:
+            JournalError: If the file is not a compatible journal or ends
+                inside a record.
+        """
+        self.path = path
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            _check_header(handle.read(HEADER_SIZE))
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        body = size - HEADER_SIZE
+        if body % JOURNAL_DTYPE.itemsize:
+            self._map.close()
+            raise JournalError(f"Journal {path} ends inside a record")
+        self.records: np.ndarray = np.frombuffer(
+            self._map, dtype=JOURNAL_DTYPE, offset=HEADER_SIZE,
+            count=body // JOURNAL_DTYPE.itemsize,
+        )
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def replay(
+        self,
+        book: Optional[OrderBook] = None,
+        chunk_size: int = DEFAULT_REPLAY_CHUNK,
+    ) -> OrderBook:
+        """Re-apply every journaled operation to a book.
+
+        Orders get the same IDs they had when journaled, so cancels and
+        amends resolve exactly as they did originally.
+
+        Args:
+            book: Book to replay into. A fresh ``OrderBook`` if None; it
+                should have the tick size of the journaled book.
+            chunk_size: Records converted from the map per step.
+
+        Returns:
+            The book after replay.
+        """
+        if book is None:
+            book = OrderBook()
+        for chunk in self._chunks(chunk_size):
+            _apply_chunk(book, chunk)
+        logger.info("Replayed %d journal records", len(self.records))
+        return book
+
+    def close(self) -> None:
+        """Release the memory map.
+
+        If arrays obtained from ``records`` are still referenced, the map
+        stays open until they are garbage collected.
+        """
+        self.records = self.records[:0].copy()
+        try:
+            self._map.close()
+        except BufferError:
+            logger.debug("Journal %s still has live record views", self.path)
+
+    def _chunks(self, chunk_size: int) -> Iterator[np.ndarray]:
+        """Yield consecutive record slices of at most chunk_size rows.
+
+        Args:
+            chunk_size: Rows per slice.
+
+        Yields:
+            Structured array views over the map.
+        """
+        records = self.records
+        for start in range(0, len(records), chunk_size):
+            yield records[start:start + chunk_size]
+
+
+def _apply_chunk(book: OrderBook, chunk: np.ndarray) -> None:
+    """Apply a slice of journal records to a book.
+
+    Args:
+        book: Book to mutate.
+        chunk: Structured array of ``JOURNAL_DTYPE`` records.
+    """
+    order_ids = book._order_ids
+    submit = book.submit_order
+    rows = zip(
+        chunk["kind"].tolist(), chunk["side"].tolist(),
+        chunk["order_type"].tolist(), chunk["order_id"].tolist(),
+        chunk["quantity"].tolist(), chunk["price"].tolist(),
+        chunk["timestamp"].tolist(),
+    )
+    for kind, side, order_type, order_id, quantity, price, timestamp in rows:
+        if kind == KIND_SUBMIT:
+            order_ids.next_id = order_id
+            submit(
+                SIDE_BY_CODE[side], price, quantity,
+                ORDER_TYPE_BY_CODE[order_type], timestamp,
+            )
+        elif kind == KIND_CANCEL:
+            book.cancel_order(order_id)
+        elif kind == KIND_MODIFY:
+            book.modify_order(order_id, price, quantity, timestamp)
+        elif kind == KIND_EXECUTE:
+            book.execute_order(order_id, quantity, price, timestamp)
+        else:
+            raise JournalError(f"Unknown journal record kind {kind}")
+
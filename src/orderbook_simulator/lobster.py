@@ -0,0 +1,383 @@
+"""LOBSTER message and orderbook file loader.
+
+LOBSTER data comes as a pair of headerless CSV files per stock and day:
+
+- The message file has one event per row: time (seconds after midnight),
+  event type, order ID, size, price (dollars x 10,000) and direction
+  (1 buy, -1 sell; for executions, the side of the resting order).
+- The orderbook file has the book state after each message, as
+  ``ask_price_1, ask_size_1, bid_price_1, bid_size_1, ...`` for a fixed
+  number of levels. Empty levels carry placeholder prices.
+
+Both files are read in chunks with pandas and converted column-wise with
+NumPy, then replayed through a ``ReplayEngine``. In validation mode, the
+reconstructed top levels after every message are collected into a chunk
+array in the same layout and compared against the orderbook file in one
+vectorized pass per chunk.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .orderbook import OrderBook, Side
+from .replay import (
+    AddOrder,
+    CancelOrder,
+    ExecuteOrder,
+    ReplayEngine,
+    ReplayEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+# LOBSTER prices are integer dollars x 10,000
+LOBSTER_PRICE_SCALE = 10_000
+
+# Placeholder prices LOBSTER writes for empty book levels
+EMPTY_ASK_PRICE = 9_999_999_999
+EMPTY_BID_PRICE = -9_999_999_999
+
+# Rows read per chunk from each file
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Maximum divergent rows kept in detail by a validation run
+DEFAULT_MAX_DIVERGENCES = 100
+
+# Message file columns, in file order
+MESSAGE_COLUMNS = ("time", "type", "order_id", "size", "price", "direction")
+
+# LOBSTER event type codes
+EVENT_SUBMIT = 1
+EVENT_CANCEL = 2
+EVENT_DELETE = 3
+EVENT_EXECUTE_VISIBLE = 4
+EVENT_EXECUTE_HIDDEN = 5
+EVENT_CROSS = 6
+EVENT_HALT = 7
+
+# Number of columns per level in the orderbook file
+_COLUMNS_PER_LEVEL = 4
+
+PathLike = Union[str, os.PathLike]
+
+
+@dataclass(frozen=True)
+class Divergence:
+    """A message after which the reconstructed book differs from LOBSTER's.
+
+    Both rows use the orderbook file layout (integer prices x 10,000).
+
+    Attributes:
+        row: Zero-based message row.
+        time: Message time.
+        expected: Row from the LOBSTER orderbook file.
+        actual: Row reconstructed from the replayed book.
+    """
+
+    row: int
+    time: float
+    expected: np.ndarray
+    actual: np.ndarray
+
+
+@dataclass
+class LobsterReport:
+    """Summary of a LOBSTER replay.
+
+    Attributes:
+        messages: Message rows read.
+        applied: Events applied to the book.
+        ignored: Hidden executions, cross trades and halts, which do not
+            change the visible book.
+        skipped: Events the replay engine dropped in non-strict mode.
+        rows_checked: Orderbook rows compared in validation mode.
+        divergent_rows: Number of rows that did not match.
+        divergences: Details of the first divergent rows.
+    """
+
+    messages: int = 0
+    applied: int = 0
+    ignored: int = 0
+    skipped: int = 0
+    rows_checked: int = 0
+    divergent_rows: int = 0
+    divergences: List[Divergence] = field(default_factory=list)
+
+    @property
+    def matches(self) -> bool:
+        """Whether every checked row matched the orderbook file."""
+        return self.divergent_rows == 0
+
+
+def read_messages(
+    path: PathLike, chunksize: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """Read a LOBSTER message file in chunks.
+
+    Args:
+        path: Path to the message CSV file.
+        chunksize: Rows per chunk.
+
+    Yields:
+        ``(rows, 6)`` float64 arrays in ``MESSAGE_COLUMNS`` order.
+    """
+    import pandas as pd
+
+    reader = pd.read_csv(
+        path,
+        header=None,
+        names=list(MESSAGE_COLUMNS),
+        usecols=range(len(MESSAGE_COLUMNS)),
+        dtype=np.float64,
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk.to_numpy()
+
+
+def read_orderbook(
+    path: PathLike, chunksize: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """Read a LOBSTER orderbook file in chunks.
+
+    Args:
+        path: Path to the orderbook CSV file.
+        chunksize: Rows per chunk.
+
+    Yields:
+        ``(rows, 4 * levels)`` int64 arrays in file column order.
+    """
+    import pandas as pd
+
+    reader = pd.read_csv(
+        path, header=None, dtype=np.int64, chunksize=chunksize
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk.to_numpy()
+
+
+class LobsterReplayer:
+    """Replays LOBSTER message files into an order book.
+
+    Attributes:
+        engine: Replay engine driving the book; maps LOBSTER order IDs to
+            book order IDs.
+        chunksize: Rows read per chunk.
+    """
+
+    def __init__(
+        self,
+        book: Optional[OrderBook] = None,
+        strict: bool = True,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the replayer.
+
+        Args:
+            book: Book to replay into. A fresh ``OrderBook`` if None.
+            strict: Raise on events the book rejects or that reference
+                unknown orders. Files that start with a non-empty book need
+                ``strict=False``.
+            chunksize: Rows read per chunk.
+
+        Raises:
+            ValueError: If chunksize is not positive.
+        """
+        if chunksize <= 0:
+            raise ValueError(f"chunksize must be positive, got {chunksize}")
+        self.engine = ReplayEngine(book, strict=strict)
+        self.chunksize = chunksize
+
+    @property
+    def book(self) -> OrderBook:
+        """Return the book being replayed into."""
+        return self.engine.book
+
+    def replay(
+        self,
+        message_path: PathLike,
+        orderbook_path: Optional[PathLike] = None,
+        max_divergences: int = DEFAULT_MAX_DIVERGENCES,
+    ) -> LobsterReport:
+        """Replay a message file, optionally validating every row.
+
+        Args:
+            message_path: Path to the LOBSTER message file.
+            orderbook_path: Path to the matching orderbook file. If given,
+                the book's top levels are compared against it after every
+                message.
+            max_divergences: Maximum divergent rows kept in detail.
+
+        Returns:
+            Replay summary, including divergences in validation mode.
+
+        Raises:
+            ValueError: If the orderbook file has fewer rows than the
+                message file.
+        """
+        report = LobsterReport()
+        skipped_before = self.engine.skipped
+        messages = read_messages(message_path, self.chunksize)
+        if orderbook_path is None:
+            for chunk in messages:
+                self._replay_chunk(chunk, report)
+        else:
+            snapshots = read_orderbook(orderbook_path, self.chunksize)
+            for chunk in messages:
+                expected = next(snapshots, None)
+                if expected is None or len(expected) < len(chunk):
+                    raise ValueError(
+                        "Orderbook file has fewer rows than the message file"
+                    )
+                start = report.messages
+                actual = self._replay_chunk(chunk, report, expected.shape[1])
+                self._compare(chunk, start, expected, actual, report,
+                              max_divergences)
+
+        report.skipped = self.engine.skipped - skipped_before
+        logger.info(
+            "Replayed %d LOBSTER messages (%d divergent rows)",
+            report.messages, report.divergent_rows,
+        )
+        return report
+
+    def events(self, message_path: PathLike) -> Iterator[Optional[ReplayEvent]]:
+        """Lazily convert a message file into replay events.
+
+        Args:
+            message_path: Path to the LOBSTER message file.
+
+        Yields:
+            One event per row, or None for rows that do not change the
+            visible book.
+        """
+        for chunk in read_messages(message_path, self.chunksize):
+            yield from _chunk_events(chunk)
+
+    def _replay_chunk(
+        self,
+        chunk: np.ndarray,
+        report: LobsterReport,
+        snapshot_width: Optional[int] = None,
+    ) -> Optional[np.ndarray]:
+        """Apply one chunk of messages, capturing the book after each row.
+
+        Args:
+            chunk: Message rows.
+            report: Report updated in place.
+            snapshot_width: Orderbook file columns to reconstruct, or None
+                to skip reconstruction.
+
+        Returns:
+            Reconstructed orderbook rows, or None if not reconstructing.
+        """
+        apply = self.engine.try_apply
+        actual = None
+        if snapshot_width is not None:
+            actual = np.empty((len(chunk), snapshot_width), dtype=np.int64)
+            levels = snapshot_width // _COLUMNS_PER_LEVEL
+
+        for row, event in enumerate(_chunk_events(chunk)):
+            if event is None:
+                report.ignored += 1
+            elif apply(event) is not None:
+                report.applied += 1
+            if actual is not None:
+                self._snapshot_into(actual[row], levels)
+
+        report.messages += len(chunk)
+        return actual
+
+    def _snapshot_into(self, out: np.ndarray, levels: int) -> None:
+        """Write the book's top levels in orderbook file layout.
+
+        Args:
+            out: Row to fill.
+            levels: Number of levels per side.
+        """
+        out[0::4] = EMPTY_ASK_PRICE
+        out[2::4] = EMPTY_BID_PRICE
+        out[1::4] = 0
+        out[3::4] = 0
+        bids, asks = self.book.get_book_depth(levels)
+        for index, level in enumerate(asks):
+            out[4 * index] = round(level.price * LOBSTER_PRICE_SCALE)
+            out[4 * index + 1] = level.quantity
+        for index, level in enumerate(bids):
+            out[4 * index + 2] = round(level.price * LOBSTER_PRICE_SCALE)
+            out[4 * index + 3] = level.quantity
+
+    @staticmethod
+    def _compare(
+        chunk: np.ndarray,
+        start: int,
+        expected: np.ndarray,
+        actual: np.ndarray,
+        report: LobsterReport,
+        max_divergences: int,
+    ) -> None:
+        """Record rows where the reconstructed book differs from LOBSTER's.
+
+        Args:
+            chunk: Message rows of the chunk.
+            start: Row number of the chunk's first message.
+            expected: Orderbook file rows for the chunk.
+            actual: Reconstructed rows for the chunk.
+            report: Report updated in place.
+            max_divergences: Maximum divergent rows kept in detail.
+        """
+        expected = expected[:len(actual)]
+        report.rows_checked += len(actual)
+        rows = np.flatnonzero((expected != actual).any(axis=1))
+        report.divergent_rows += len(rows)
+
+        room = max_divergences - len(report.divergences)
+        for row in rows[:max(room, 0)].tolist():
+            report.divergences.append(Divergence(
+                start + row, float(chunk[row, 0]),
+                expected[row].copy(), actual[row].copy(),
+            ))
+
+
+def _chunk_events(chunk: np.ndarray) -> Iterator[Optional[ReplayEvent]]:
+    """Convert a chunk of message rows into replay events.
+
+    Column conversions are done once per chunk with NumPy; only event
+    construction is per row.
+
+    Args:
+        chunk: ``(rows, 6)`` message array.
+
+    Yields:
+        One event per row, or None for rows that do not change the
+        visible book.
+    """
+    times = chunk[:, 0].tolist()
+    types = chunk[:, 1].astype(np.int64).tolist()
+    order_ids = chunk[:, 2].astype(np.int64).tolist()
+    sizes = chunk[:, 3].astype(np.int64).tolist()
+    prices = (chunk[:, 4] / LOBSTER_PRICE_SCALE).tolist()
+    buys = (chunk[:, 5] > 0).tolist()
+
+    rows: Iterator[Tuple[float, int, int, int, float, bool]] = zip(
+        times, types, order_ids, sizes, prices, buys
+    )
+    for time, kind, order_id, size, price, buy in rows:
+        if kind == EVENT_SUBMIT:
+            yield AddOrder(
+                time, order_id, Side.BUY if buy else Side.SELL, price, size
+            )
+        elif kind == EVENT_EXECUTE_VISIBLE:
+            yield ExecuteOrder(time, order_id, size, price)
+        elif kind == EVENT_CANCEL:
+            yield CancelOrder(time, order_id, size)
+        elif kind == EVENT_DELETE:
+            yield CancelOrder(time, order_id)
+        else:
+            yield None
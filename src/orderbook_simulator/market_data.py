@@ -0,0 +1,692 @@
+"""Market data feeds built on order book events.
+
+``L2UpdateQueue`` is the pull-style counterpart of
+``OrderBook.subscribe_levels``: it subscribes to a book and buffers every
+level delta until a consumer polls or drains it, so a feed handler can
+batch its reads on its own schedule instead of reacting inside the
+matching path.
+
+``L3Feed`` turns ``OrderBook.subscribe_orders`` into a sequenced
+market-by-order stream. Every message gets the next sequence number and is
+kept in a bounded replay buffer, so a consumer that misses messages can
+ask for the range it lost. A consumer joining late builds an ``L3Book``
+replica from a snapshot of the resting orders stamped with the last
+sequence number it reflects, then applies the tail of the stream after it.
+
+``BboPublisher`` conflates the book's best bid and offer for consumers
+that only need the latest top of book. It follows the L2 stream, ignores
+every level change behind the touch, and delivers to each subscriber at
+most once per interval or per N top-of-book changes, always with the
+latest state rather than a backlog.
+"""
+
+import heapq
+import logging
+from collections import deque
+from itertools import count, islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .orderbook import (
+    BookLevel,
+    LevelUpdate,
+    OrderAction,
+    OrderBook,
+    OrderUpdate,
+    Side,
+)
+
+logger = logging.getLogger(__name__)
+
+# Messages an L3 feed keeps for gap recovery
+DEFAULT_REPLAY_BUFFER = 100_000
+
+
+class SequenceGapError(LookupError):
+    """Raised when an L3 message is out of sequence or no longer buffered."""
+
+
+class L3Message(NamedTuple):
+    """Sequenced market-by-order message.
+
+    Attributes:
+        sequence: Feed sequence number, starting at 1.
+        action: Kind of change.
+        order_id: Order identifier.
+        side: Side of the order.
+        price: Order price, or the execution price for EXECUTE.
+        quantity: Quantity added, executed, reduced or deleted.
+        timestamp: Event time.
+    """
+
+    sequence: int
+    action: OrderAction
+    order_id: int
+    side: Side
+    price: float
+    quantity: int
+    timestamp: float
+
+
+class L3Snapshot(NamedTuple):
+    """Resting orders of a book as of a feed sequence number.
+
+    Attributes:
+        sequence: Last sequence number reflected in the snapshot.
+        orders: One ADD update per resting order with its remaining
+            quantity, bids then asks, best level first and in queue order
+            within each level.
+    """
+
+    sequence: int
+    orders: List[OrderUpdate]
+
+
+class Bbo(NamedTuple):
+    """Best bid and offer with the quantity resting at each.
+
+    Attributes:
+        bid: Best bid price, or None if there are no bids.
+        bid_quantity: Total quantity at the best bid.
+        ask: Best ask price, or None if there are no asks.
+        ask_quantity: Total quantity at the best ask.
+    """
+
+    bid: Optional[float]
+    bid_quantity: int
+    ask: Optional[float]
+    ask_quantity: int
+
+
+class L2UpdateQueue:
+    """Buffered queue of L2 level updates from one book.
+
+    With a ``maxlen``, the oldest buffered updates are discarded when the
+    buffer is full; ``dropped`` counts them so a consumer can tell its
+    view is stale and resynchronize from ``OrderBook.get_book_depth``.
+
+    Attributes:
+        book: Book being followed.
+        maxlen: Maximum buffered updates, or None for unbounded.
+        dropped: Number of updates discarded because the buffer was full.
+    """
+
+    def __init__(self, book: OrderBook, maxlen: Optional[int] = None) -> None:
+        """Subscribe a new queue to a book.
+
+        Args:
+            book: Book to follow.
+            maxlen: Maximum buffered updates, or None for unbounded.
+
+        Raises:
+            ValueError: If maxlen is not positive.
+        """
+        if maxlen is not None and maxlen <= 0:
+            raise ValueError(f"maxlen must be positive, got {maxlen}")
+        self.book = book
+        self.maxlen = maxlen
+        self.dropped = 0
+        self._buffer: Deque[LevelUpdate] = deque(maxlen=maxlen)
+        self._subscribed = True
+        book.subscribe_levels(self._push)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def poll(self) -> Optional[LevelUpdate]:
+        """Take the oldest buffered update.
+
+        Returns:
+            The update, or None if the queue is empty.
+        """
+        if self._buffer:
+            return self._buffer.popleft()
+        return None
+
+    def drain(self, max_items: Optional[int] = None) -> List[LevelUpdate]:
+        """Take buffered updates, oldest first.
+
+        Args:
+            max_items: Maximum number of updates to take, or None for all.
+
+        Returns:
+            The updates taken.
+        """
+        buffer = self._buffer
+        if max_items is None or max_items >= len(buffer):
+            updates = list(buffer)
+            buffer.clear()
+            return updates
+        return [buffer.popleft() for _ in range(max(max_items, 0))]
+
+    def close(self) -> None:
+        """Unsubscribe from the book. Buffered updates remain readable."""
+        if self._subscribed:
+            self.book.unsubscribe_levels(self._push)
+            self._subscribed = False
+
+    def _push(self, update: LevelUpdate) -> None:
+        """Buffer an update, counting any overflow.
+
+        Args:
+            update: Level update from the book.
+        """
+        buffer = self._buffer
+        if self.maxlen is not None and len(buffer) == self.maxlen:
+            self.dropped += 1
+        buffer.append(update)
+
+
+class L3Feed:
+    """Sequenced market-by-order feed from one book.
+
+    Attributes:
+        book: Book being published.
+        sequence: Sequence number of the last message published (0 before
+            the first).
+    """
+
+    def __init__(
+        self, book: OrderBook, buffer_size: int = DEFAULT_REPLAY_BUFFER
+    ) -> None:
+        """Start publishing a book's order events.
+
+        Args:
+            book: Book to publish.
+            buffer_size: Most recent messages kept for replay.
+
+        Raises:
+            ValueError: If buffer_size is not positive.
+        """
+        if buffer_size <= 0:
+            raise ValueError(f"buffer_size must be positive, got {buffer_size}")
+        self.book = book
+        self.sequence = 0
+        self._buffer: Deque[L3Message] = deque(maxlen=buffer_size)
+        self._listeners: List[Callable[[L3Message], Any]] = []
+        self._subscribed = True
+        book.subscribe_orders(self._publish)
+
+    def subscribe(self, callback: Callable[[L3Message], Any]) -> None:
+        """Register a callback for every new message.
+
+        Args:
+            callback: Function called with each L3Message.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[L3Message], Any]) -> None:
+        """Remove a registered callback.
+
+        Args:
+            callback: Previously registered callback.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._listeners.remove(callback)
+
+    def replay(self, from_sequence: int) -> List[L3Message]:
+        """Return buffered messages from a sequence number onwards.
+
+        Args:
+            from_sequence: First sequence number wanted.
+
+        Returns:
+            Messages from from_sequence to the latest, oldest first. Empty
+            if from_sequence is past the latest message.
+
+        Raises:
+            SequenceGapError: If messages from from_sequence have already
+                left the replay buffer.
+        """
+        if from_sequence > self.sequence:
+            return []
+        buffer = self._buffer
+        oldest = buffer[0].sequence if buffer else self.sequence + 1
+        if from_sequence < oldest:
+            raise SequenceGapError(
+                f"Messages before sequence {oldest} are no longer buffered "
+                f"(requested {from_sequence})"
+            )
+        return list(islice(buffer, from_sequence - oldest, None))
+
+    def snapshot(self) -> L3Snapshot:
+        """Capture the resting orders as of the current sequence number.
+
+        Returns:
+            Snapshot of every resting order in priority order.
+        """
+        orders: List[OrderUpdate] = []
+        for side in (self.book._bids, self.book._asks):
+            for level in side.iter_levels():
+                orders.extend(
+                    OrderUpdate(
+                        OrderAction.ADD, order.order_id, order.side,
+                        order.price, order.remaining, order.timestamp,
+                    )
+                    for order in level
+                )
+        return L3Snapshot(self.sequence, orders)
+
+    def join(self) -> "L3Book":
+        """Create a live replica of the book for a late subscriber.
+
+        Returns:
+            An L3Book loaded from a snapshot and subscribed to the feed.
+        """
+        replica = L3Book()
+        replica.load_snapshot(self.snapshot())
+        self.subscribe(replica.apply)
+        return replica
+
+    def close(self) -> None:
+        """Stop publishing. Buffered messages remain available for replay."""
+        if self._subscribed:
+            self.book.unsubscribe_orders(self._publish)
+            self._subscribed = False
+
+    def _publish(self, update: OrderUpdate) -> None:
+        """Sequence, buffer and fan out one order event.
+
+        Args:
+            update: Order event from the book.
+        """
+        self.sequence += 1
+        message = L3Message(self.sequence, *update)
+        self._buffer.append(message)
+        for listener in self._listeners:
+            listener(message)
+
+
+class L3Book:
+    """Order-level replica of a book, maintained from an L3 feed.
+
+    Orders are kept in arrival order, so iterating one price level yields
+    its queue in priority order.
+
+    Attributes:
+        sequence: Last sequence number applied.
+        orders: Resting orders by ID, as ``[side, price, remaining]``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty replica at sequence 0."""
+        self.sequence = 0
+        self.orders: Dict[int, list] = {}
+
+    def load_snapshot(self, snapshot: L3Snapshot) -> None:
+        """Replace the replica's state with a snapshot.
+
+        Args:
+            snapshot: Snapshot from ``L3Feed.snapshot``.
+        """
+        self.orders = {
+            update.order_id: [update.side, update.price, update.quantity]
+            for update in snapshot.orders
+        }
+        self.sequence = snapshot.sequence
+
+    def apply(self, message: L3Message) -> bool:
+        """Apply the next message of the stream.
+
+        Messages at or below the current sequence number are ignored, so
+        a live stream buffered while a snapshot was fetched can be applied
+        as is.
+
+        Args:
+            message: Message to apply.
+
+        Returns:
+            True if applied, False if it was already reflected.
+
+        Raises:
+            SequenceGapError: If messages between the current sequence
+                number and this one are missing.
+        """
+        if message.sequence <= self.sequence:
+            return False
+        if message.sequence != self.sequence + 1:
+            raise SequenceGapError(
+                f"Expected sequence {self.sequence + 1}, got {message.sequence}"
+            )
+
+        action = message.action
+        if action is OrderAction.ADD:
+            self.orders[message.order_id] = [
+                message.side, message.price, message.quantity
+            ]
+        elif action is OrderAction.DELETE:
+            del self.orders[message.order_id]
+        else:
+            order = self.orders[message.order_id]
+            order[2] -= message.quantity
+            if order[2] == 0:
+                del self.orders[message.order_id]
+        self.sequence = message.sequence
+        return True
+
+    def recover(self, feed: L3Feed) -> int:
+        """Catch up with a feed after missing messages.
+
+        Replays the missing range from the feed's buffer, or reloads from a
+        fresh snapshot if the range has already left it.
+
+        Args:
+            feed: Feed the replica follows.
+
+        Returns:
+            Number of messages replayed (0 after a snapshot reload).
+        """
+        try:
+            missed = feed.replay(self.sequence + 1)
+        except SequenceGapError:
+            logger.info(
+                "Gap after sequence %d is no longer buffered, reloading "
+                "from snapshot", self.sequence,
+            )
+            self.load_snapshot(feed.snapshot())
+            return 0
+        for message in missed:
+            self.apply(message)
+        return len(missed)
+
+    def depth(self, side: Side) -> List[BookLevel]:
+        """Aggregate one side of the replica into price levels.
+
+        Args:
+            side: Side to aggregate.
+
+        Returns:
+            Levels sorted best price first.
+        """
+        levels: Dict[float, List[int]] = {}
+        for order_side, price, remaining in self.orders.values():
+            if order_side is side:
+                level = levels.setdefault(price, [0, 0])
+                level[0] += remaining
+                level[1] += 1
+        return [
+            BookLevel(price, quantity, count)
+            for price, (quantity, count) in sorted(
+                levels.items(), reverse=side is Side.BUY
+            )
+        ]
+
+    def queue(self, side: Side, price: float) -> List[int]:
+        """Return the IDs of orders resting at a price, in priority order.
+
+        Args:
+            side: Side of the level.
+            price: Level price.
+
+        Returns:
+            Order IDs, first in queue first.
+        """
+        return [
+            order_id
+            for order_id, (order_side, order_price, _) in self.orders.items()
+            if order_side is side and order_price == price
+        ]
+
+
+class _BboSubscription:
+    """Throttle state of one BBO subscriber."""
+
+    __slots__ = ("callback", "entry", "last", "throttle", "timed")
+
+    def __init__(
+        self, callback: Callable[[Bbo], Any], throttle: float, timed: bool
+    ) -> None:
+        self.callback = callback
+        self.throttle = throttle
+        self.timed = timed
+        self.last: Optional[Bbo] = None
+        # Tiebreak of the subscription's live heap entry, if any
+        self.entry = -1
+
+
+class BboPublisher:
+    """Conflating top-of-book publisher for one book.
+
+    Each subscriber is throttled either by time (``interval``, measured
+    on ``clock``) or by top-of-book changes (``every``). Once a
+    subscriber's throttle has elapsed, the next change delivers the
+    current BBO to it; intermediate states are conflated away. Subscribers
+    wait in heaps ordered by when they are next due, so a level change
+    behind the touch costs one comparison and a top-of-book change only
+    touches the subscribers that are due.
+
+    The BBO is read once at the end of each book operation that touched
+    the best levels (via ``OrderBook.subscribe_commits``), so a sweep
+    through several levels or a whole ``submit_orders`` batch is a single
+    change, and subscribers never see a state from the middle of matching.
+
+    Deliveries happen on book events. Call ``poll`` to deliver to interval
+    subscribers whose interval elapsed while the book was quiet, and
+    ``flush`` to deliver the latest state to everyone regardless of
+    throttles.
+
+    Attributes:
+        book: Book being followed.
+        bbo: Current best bid and offer.
+        changes: Number of top-of-book changes seen.
+    """
+
+    def __init__(
+        self, book: OrderBook, clock: Optional[Callable[[], float]] = None
+    ) -> None:
+        """Attach a publisher to a book.
+
+        Args:
+            book: Book to follow.
+            clock: Time source for interval throttles. Defaults to the
+                book's event clock (the timestamp of its latest event).
+        """
+        self.book = book
+        self.changes = 0
+        self._clock = clock if clock is not None else lambda: book._clock
+        self._subscriptions: Dict[Callable[[Bbo], Any], _BboSubscription] = {}
+        # (due, tiebreak, subscription) for time and change throttles
+        self._timed: List[Tuple[float, int, _BboSubscription]] = []
+        self._counted: List[Tuple[float, int, _BboSubscription]] = []
+        # Subscribers whose throttle has elapsed, waiting for a change
+        self._ready: List[_BboSubscription] = []
+        self._tiebreak = count()
+        self.bbo = self._read_bbo()
+        self._dirty = False
+        self._subscribed = True
+        book.subscribe_levels(self._on_level)
+        book.subscribe_commits(self._on_commit)
+
+    def subscribe(
+        self,
+        callback: Callable[[Bbo], Any],
+        interval: Optional[float] = None,
+        every: Optional[int] = None,
+    ) -> None:
+        """Register a conflated BBO subscriber.
+
+        The subscriber receives the BBO on the first change after
+        subscribing, then at most once per throttle period.
+
+        Args:
+            callback: Function called with each delivered Bbo.
+            interval: Minimum time between deliveries.
+            every: Minimum number of top-of-book changes between
+                deliveries. Exactly one of interval and every is required.
+
+        Raises:
+            ValueError: If not exactly one throttle is given, it is not
+                positive, or the callback is already subscribed.
+        """
+        if interval is not None and every is None:
+            subscription = _BboSubscription(callback, interval, True)
+        elif every is not None and interval is None:
+            subscription = _BboSubscription(callback, every, False)
+        else:
+            raise ValueError("Exactly one of interval and every is required")
+        if subscription.throttle <= 0:
+            raise ValueError(
+                f"Throttle must be positive, got {subscription.throttle}"
+            )
+        if callback in self._subscriptions:
+            raise ValueError("Callback is already subscribed")
+        self._subscriptions[callback] = subscription
+        self._ready.append(subscription)
+
+    def unsubscribe(self, callback: Callable[[Bbo], Any]) -> None:
+        """Remove a subscriber.
+
+        Args:
+            callback: Previously registered callback.
+
+        Raises:
+            KeyError: If the callback is not subscribed.
+        """
+        subscription = self._subscriptions.pop(callback)
+        if subscription in self._ready:
+            self._ready.remove(subscription)
+
+    def poll(self) -> int:
+        """Deliver to subscribers that are due and have not seen the BBO.
+
+        Returns:
+            Number of deliveries made.
+        """
+        return self._deliver_due()
+
+    def flush(self) -> int:
+        """Deliver the BBO to every subscriber that has not seen it.
+
+        Throttles of the subscribers delivered to restart from the flush.
+
+        Returns:
+            Number of deliveries made.
+        """
+        bbo = self.bbo
+        stale = [s for s in self._subscriptions.values() if s.last != bbo]
+        if stale:
+            self._ready = [s for s in self._ready if s.last == bbo]
+            self._send(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """Stop following the book."""
+        if self._subscribed:
+            self.book.unsubscribe_levels(self._on_level)
+            self.book.unsubscribe_commits(self._on_commit)
+            self._subscribed = False
+
+    def _on_level(self, update: LevelUpdate) -> None:
+        """Mark the BBO stale if a level change reached the touch.
+
+        Args:
+            update: Level update from the book.
+        """
+        if self._dirty:
+            return
+        bbo = self.bbo
+        if update.side is Side.BUY:
+            if bbo.bid is not None and update.price < bbo.bid:
+                return
+        elif bbo.ask is not None and update.price > bbo.ask:
+            return
+        self._dirty = True
+
+    def _on_commit(self) -> None:
+        """Re-read the BBO once a write has completed, if it may have moved."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        bbo = self.bbo
+        current = self._read_bbo()
+        if current == bbo:
+            return
+        self.bbo = current
+        self.changes += 1
+        self._deliver_due()
+
+    def _read_bbo(self) -> Bbo:
+        """Read the top of both sides from the book.
+
+        Returns:
+            The current Bbo.
+        """
+        book = self.book
+        bid_ticks = book._bids.best()
+        ask_ticks = book._asks.best()
+        bid = ask = None
+        bid_quantity = ask_quantity = 0
+        if bid_ticks is not None:
+            bid = book._ticks_to_price(bid_ticks)
+            bid_quantity = book._bids.levels[bid_ticks].quantity
+        if ask_ticks is not None:
+            ask = book._ticks_to_price(ask_ticks)
+            ask_quantity = book._asks.levels[ask_ticks].quantity
+        return Bbo(bid, bid_quantity, ask, ask_quantity)
+
+    def _deliver_due(self) -> int:
+        """Deliver the BBO to due subscribers that have not seen it.
+
+        Subscribers already up to date stay ready for the next change.
+
+        Returns:
+            Number of deliveries made.
+        """
+        ready = self._ready
+        subscriptions = self._subscriptions
+        timed = self._timed
+        if timed:
+            now = self._clock()
+            while timed and timed[0][0] <= now:
+                _, entry, subscription = heapq.heappop(timed)
+                if subscriptions.get(subscription.callback) is subscription and (
+                    subscription.entry == entry
+                ):
+                    ready.append(subscription)
+        counted = self._counted
+        while counted and counted[0][0] <= self.changes:
+            _, entry, subscription = heapq.heappop(counted)
+            if subscriptions.get(subscription.callback) is subscription and (
+                subscription.entry == entry
+            ):
+                ready.append(subscription)
+        if not ready:
+            return 0
+
+        bbo = self.bbo
+        stale = [s for s in ready if s.last != bbo]
+        if stale:
+            self._ready = [s for s in ready if s.last == bbo]
+            self._send(stale)
+        return len(stale)
+
+    def _send(self, subscriptions: List[_BboSubscription]) -> None:
+        """Deliver the BBO and restart each subscriber's throttle.
+
+        Args:
+            subscriptions: Subscribers to deliver to.
+        """
+        bbo = self.bbo
+        now = self._clock() if any(s.timed for s in subscriptions) else 0.0
+        for subscription in subscriptions:
+            subscription.last = bbo
+            subscription.entry = entry = next(self._tiebreak)
+            if subscription.timed:
+                heapq.heappush(self._timed, (
+                    now + subscription.throttle, entry, subscription
+                ))
+            else:
+                heapq.heappush(self._counted, (
+                    self.changes + subscription.throttle, entry, subscription
+                ))
+            subscription.callback(bbo)
@@ -5,12 +5,39 @@ market orders, and IOC (immediate-or-cancel) orders. Tracks full trade
 history and provides real-time book state queries.
 """
 
+import bisect
 import logging
+import math
+import sys
 import time
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from itertools import islice, takewhile
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+import numpy as np
+
+from .trade_log import TradeLog
+
+if TYPE_CHECKING:
+    from .journal import JournalWriter
 
 
 logger = logging.getLogger(__name__)
@@ -24,6 +51,19 @@ MAX_ORDER_QUANTITY = 1_000_000
 # Minimum valid price
 MIN_PRICE = 0.01
 
+# Relative tolerance when checking that a float price lies on the tick grid
+TICK_TOLERANCE = 1e-6
+
+# Per-instance __slots__ for the hot record types where dataclasses support it
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Book side backends selectable on OrderBook
+BACKEND_SORTED = "sorted"
+BACKEND_DENSE = "dense"
+
+# Default number of ticks covered by a dense ladder window
+DEFAULT_DENSE_WINDOW = 4096
+
 
 class Side(Enum):
     """Order side: BUY or SELL."""
@@ -49,8 +89,32 @@ class OrderStatus(Enum):
     CANCELLED = "CANCELLED"
 
 
-@dataclass
-class Order:
+class OrderAction(Enum):
+    """Kind of change to an individual resting order (L3 event)."""
+
+    ADD = "ADD"
+    EXECUTE = "EXECUTE"
+    REDUCE = "REDUCE"
+    DELETE = "DELETE"
+
+
+class _QueueLinks:
+    """Intrusive queue links for an order resting at a price level.
+
+    Kept outside the dataclass fields so that comparison, ``asdict``,
+    copying and pickling see only the order itself, never the chain of
+    orders queued around it.
+    """
+
+    __slots__ = ("_level", "_next", "_prev")
+
+    _level: Optional["_PriceLevel"]
+    _prev: Optional["Order"]
+    _next: Optional["Order"]
+
+
+@dataclass(**_SLOTS)
+class Order(_QueueLinks):
     """Represents a single order in the book.
 
     Attributes:
@@ -62,6 +126,9 @@ class Order:
         order_type: LIMIT, MARKET, or IOC.
         timestamp: Order creation time.
         status: Current order status.
+        price_ticks: Limit price as an integer number of ticks (0 for
+            market orders). Used for all matching and level keys.
+        tag: Optional client tag, usable for mass cancels.
     """
 
     order_id: int
@@ -72,9 +139,23 @@ class Order:
     order_type: OrderType = OrderType.LIMIT
     timestamp: float = 0.0
     status: OrderStatus = OrderStatus.OPEN
+    price_ticks: int = 0
+    tag: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        self._level = self._prev = self._next = None
 
-@dataclass(frozen=True)
+    def __getstate__(self) -> Tuple[Any, ...]:
+        # Queue links are left out: a copy is never queued at a level
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for f, value in zip(fields(self), state):
+            setattr(self, f.name, value)
+        self._level = self._prev = self._next = None
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Trade:
     """Represents a matched trade between two orders.
 
@@ -95,7 +176,7 @@ class Trade:
     timestamp: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class BookLevel:
     """Aggregated price level in the order book.
 
@@ -110,6 +191,230 @@ class BookLevel:
     order_count: int
 
 
+class LevelUpdate(NamedTuple):
+    """Incremental change to one aggregated price level (L2 delta).
+
+    A quantity and order count of zero mean the level was removed.
+
+    Attributes:
+        side: Side of the level.
+        price: Level price.
+        quantity: New total quantity at the level.
+        order_count: New number of orders at the level.
+    """
+
+    side: Side
+    price: float
+    quantity: int
+    order_count: int
+
+
+class OrderUpdate(NamedTuple):
+    """Change to one resting order (L3, market-by-order event).
+
+    ADD carries the quantity that came to rest, EXECUTE the filled
+    quantity at the execution price, REDUCE the quantity removed in place
+    and DELETE the quantity still open when the order left the book. An
+    order whose remaining quantity reaches zero through executions leaves
+    the book without a DELETE.
+
+    Attributes:
+        action: Kind of change.
+        order_id: Order identifier.
+        side: Side of the order.
+        price: Order price, or the execution price for EXECUTE.
+        quantity: Quantity added, executed, reduced or deleted.
+        timestamp: Event time.
+    """
+
+    action: OrderAction
+    order_id: int
+    side: Side
+    price: float
+    quantity: int
+    timestamp: float
+
+
+class OrderSpec(NamedTuple):
+    """Parameters of one order in a batch submission.
+
+    Attributes:
+        side: BUY or SELL.
+        price: Limit price. Ignored for MARKET orders.
+        quantity: Number of units to trade.
+        order_type: LIMIT, MARKET, or IOC.
+        timestamp: Order time. Uses the batch time if None.
+        tag: Optional client tag.
+    """
+
+    side: Side
+    price: float
+    quantity: int
+    order_type: OrderType = OrderType.LIMIT
+    timestamp: Optional[float] = None
+    tag: Optional[str] = None
+
+
+# Integer codes accepted by the array form of OrderBook.submit_orders
+SIDE_BY_CODE: Tuple[Side, ...] = (Side.BUY, Side.SELL)
+ORDER_TYPE_BY_CODE: Tuple[OrderType, ...] = (
+    OrderType.LIMIT, OrderType.MARKET, OrderType.IOC,
+)
+_SIDE_CODE = {side: code for code, side in enumerate(SIDE_BY_CODE)}
+_ORDER_TYPE_CODE = {
+    order_type: code for code, order_type in enumerate(ORDER_TYPE_BY_CODE)
+}
+_MARKET_CODE = _ORDER_TYPE_CODE[OrderType.MARKET]
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Bounds on how many terminal orders and trades an OrderBook keeps.
+
+    Terminal (FILLED or CANCELLED) orders are evicted from the order index
+    once they are older than ``terminal_order_ttl`` seconds of event time
+    or once more than ``max_terminal_orders`` of them are held, whichever
+    comes first. Trade history becomes a ring buffer of ``max_trades``.
+
+    Attributes:
+        terminal_order_ttl: Seconds to keep terminal orders (0 evicts them
+            immediately). None disables time-based eviction.
+        max_terminal_orders: Maximum terminal orders kept, oldest evicted
+            first. None disables count-based eviction.
+        max_trades: Maximum trades kept in history. None keeps all trades.
+        on_order_evicted: Optional callback receiving each evicted Order.
+        on_trade_evicted: Optional callback receiving each evicted Trade.
+    """
+
+    terminal_order_ttl: Optional[float] = None
+    max_terminal_orders: Optional[int] = None
+    max_trades: Optional[int] = None
+    on_order_evicted: Optional[Callable[[Order], None]] = None
+    on_trade_evicted: Optional[Callable[[Trade], None]] = None
+
+    def __post_init__(self) -> None:
+        """Validate retention bounds.
+
+        Raises:
+            ValueError: If any bound is negative, or max_trades is zero.
+        """
+        if self.terminal_order_ttl is not None and self.terminal_order_ttl < 0:
+            raise ValueError(
+                f"terminal_order_ttl must be >= 0, got {self.terminal_order_ttl}"
+            )
+        if self.max_terminal_orders is not None and self.max_terminal_orders < 0:
+            raise ValueError(
+                "max_terminal_orders must be >= 0, "
+                f"got {self.max_terminal_orders}"
+            )
+        if self.max_trades is not None and self.max_trades <= 0:
+            raise ValueError(f"max_trades must be positive, got {self.max_trades}")
+
+    @property
+    def bounds_orders(self) -> bool:
+        """Whether terminal orders are subject to eviction."""
+        return (
+            self.terminal_order_ttl is not None
+            or self.max_terminal_orders is not None
+        )
+
+
+class TradeView(Sequence):  # type: ignore[type-arg]
+    """Read-only, non-copying view over a book's trade history.
+
+    Reflects trades executed after the view was created. Integer indexing
+    and ``len`` are O(1) near either end. Slicing returns a new list and
+    walks the history from whichever end is nearer, so ``trades[-n:]``
+    costs O(n) however long the history is.
+    """
+
+    __slots__ = ("_trades",)
+
+    def __init__(self, trades: Deque[Trade]) -> None:
+        self._trades = trades
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __iter__(self) -> Iterator[Trade]:
+        return iter(self._trades)
+
+    def __reversed__(self) -> Iterator[Trade]:
+        return reversed(self._trades)
+
+    @overload
+    def __getitem__(self, index: int) -> Trade: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Trade]: ...
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._trades))
+            if step > 0:
+                return self._span(start, stop)[::step]
+            if start <= stop:
+                return []
+            # Positions start, start + step, ... above stop, descending
+            low = start - (start - stop - 1) // -step * -step
+            return self._span(low, start + 1)[::-1][::-step]
+        return self._trades[index]
+
+    def _span(self, start: int, stop: int) -> List[Trade]:
+        """Copy trades [start, stop) in order, walking from the nearer end.
+
+        Args:
+            start: First position (normalized, non-negative).
+            stop: Position after the last one.
+
+        Returns:
+            The trades in history order.
+        """
+        trades = self._trades
+        if stop <= start:
+            return []
+        size = len(trades)
+        if start >= size - stop:
+            span = list(islice(reversed(trades), size - stop, size - start))
+            span.reverse()
+            return span
+        return list(islice(trades, start, stop))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TradeView, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeView({len(self._trades)} trades)"
+
+
+class IdSequence:
+    """Monotonic integer ID generator, shareable between order books.
+
+    A ``step`` greater than one interleaves several sequences without
+    collisions, e.g. one per worker process.
+
+    Attributes:
+        next_id: ID that will be handed out next.
+        step: Increment between consecutive IDs.
+    """
+
+    __slots__ = ("next_id", "step")
+
+    def __init__(self, start: int = 1, step: int = 1) -> None:
+        if step <= 0:
+            raise ValueError(f"step must be positive, got {step}")
+        self.next_id = start
+        self.step = step
+
+    def take(self) -> int:
+        """Return the next ID and advance the sequence."""
+        value = self.next_id
+        self.next_id = value + self.step
+        return value
+
+
 class OrderValidationError(ValueError):
     """Raised when an order fails validation."""
 
@@ -118,6 +423,516 @@ class OrderNotFoundError(KeyError):
     """Raised when an order is not found in the book."""
 
 
+class _PriceLevel:
+    """FIFO queue of resting orders at one price.
+
+    Orders are chained through their own ``_prev``/``_next`` links, so
+    appending, popping the head and unlinking an arbitrary order are all
+    O(1) while arrival order (time priority) is preserved. Aggregate
+    quantity and order count are kept as running totals.
+
+    Attributes:
+        ticks: Level price in ticks.
+        head: Oldest order at this level, or None if empty.
+        tail: Newest order at this level, or None if empty.
+        quantity: Total remaining quantity resting at this level.
+        order_count: Number of orders resting at this level.
+    """
+
+    __slots__ = ("head", "order_count", "quantity", "tail", "ticks")
+
+    def __init__(self, ticks: int) -> None:
+        self.ticks = ticks
+        self.head: Optional[Order] = None
+        self.tail: Optional[Order] = None
+        self.quantity = 0
+        self.order_count = 0
+
+    def __bool__(self) -> bool:
+        return self.head is not None
+
+    def __iter__(self) -> Iterator[Order]:
+        order = self.head
+        while order is not None:
+            yield order
+            order = order._next
+
+    def append(self, order: Order) -> None:
+        """Append an order to the back of the queue.
+
+        Args:
+            order: Order to enqueue.
+        """
+        order._level = self
+        order._prev = self.tail
+        order._next = None
+        if self.tail is None:
+            self.head = order
+        else:
+            self.tail._next = order
+        self.tail = order
+        self.quantity += order.remaining
+        self.order_count += 1
+
+    def remove(self, order: Order) -> None:
+        """Unlink an order from anywhere in the queue.
+
+        Args:
+            order: Order currently queued at this level.
+        """
+        prev_order, next_order = order._prev, order._next
+        if prev_order is None:
+            self.head = next_order
+        else:
+            prev_order._next = next_order
+        if next_order is None:
+            self.tail = prev_order
+        else:
+            next_order._prev = prev_order
+        order._level = order._prev = order._next = None
+        self.quantity -= order.remaining
+        self.order_count -= 1
+
+
+class _BookSide:
+    """One side of the book: price levels plus a sorted price ladder.
+
+    Level prices (in integer ticks) are kept in a bisect-maintained array
+    ordered so that the best price is always the last element. Asks are
+    stored negated, which lets both sides share the same ascending array
+    while keeping top-of-book peeks and pops O(1).
+
+    Attributes:
+        levels: Price in ticks -> queue of resting orders (time-sorted).
+    """
+
+    __slots__ = ("_keys", "_sign", "levels")
+
+    def __init__(self, is_bid: bool) -> None:
+        self.levels: Dict[int, _PriceLevel] = {}
+        self._keys: List[int] = []
+        self._sign = 1 if is_bid else -1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def best(self) -> Optional[int]:
+        """Return the best price in ticks on this side, or None if empty."""
+        if not self._keys:
+            return None
+        return self._sign * self._keys[-1]
+
+    def get_or_create(self, ticks: int) -> _PriceLevel:
+        """Return the order queue at a price, creating the level if needed.
+
+        Args:
+            ticks: Level price in ticks.
+
+        Returns:
+            The (possibly new) price level.
+        """
+        level = self.levels.get(ticks)
+        if level is None:
+            level = self.levels[ticks] = _PriceLevel(ticks)
+            bisect.insort(self._keys, self._sign * ticks)
+        return level
+
+    def load_levels(self, levels: List[_PriceLevel]) -> None:
+        """Install populated levels into an empty side in one step.
+
+        Args:
+            levels: Levels with their aggregates set, best first.
+        """
+        sign = self._sign
+        self.levels.update((level.ticks, level) for level in levels)
+        self._keys = [sign * level.ticks for level in reversed(levels)]
+
+    def remove_level(self, ticks: int) -> None:
+        """Delete a price level from the side.
+
+        Args:
+            ticks: Level price in ticks to remove.
+        """
+        del self.levels[ticks]
+        key = self._sign * ticks
+        if self._keys[-1] == key:
+            self._keys.pop()
+            return
+        index = bisect.bisect_left(self._keys, key)
+        del self._keys[index]
+
+    def iter_levels(self) -> Iterator[_PriceLevel]:
+        """Iterate price levels from best to worst."""
+        sign = self._sign
+        levels = self.levels
+        for key in reversed(self._keys):
+            yield levels[sign * key]
+
+    def pop_levels(
+        self, low: Optional[int] = None, high: Optional[int] = None
+    ) -> List[_PriceLevel]:
+        """Remove every level with ``low <= ticks <= high`` in one step.
+
+        Args:
+            low: Lowest tick price to remove, or None for unbounded.
+            high: Highest tick price to remove, or None for unbounded.
+
+        Returns:
+            Removed levels, best first.
+        """
+        keys = self._keys
+        if self._sign > 0:
+            low_key, high_key = low, high
+        else:
+            low_key = None if high is None else -high
+            high_key = None if low is None else -low
+        start = 0 if low_key is None else bisect.bisect_left(keys, low_key)
+        stop = len(keys) if high_key is None else bisect.bisect_right(keys, high_key)
+
+        sign = self._sign
+        removed = [self.levels.pop(sign * key) for key in reversed(keys[start:stop])]
+        del keys[start:stop]
+        return removed
+
+    def update(self, level: _PriceLevel) -> None:
+        """Record a change in a level's aggregates (no-op for this backend).
+
+        Args:
+            level: Level whose quantity or order count changed.
+        """
+
+    def depth(self, limit: Optional[int]) -> List[Tuple[int, int, int]]:
+        """Return (ticks, quantity, order_count) for the top levels.
+
+        Args:
+            limit: Maximum number of levels, or None for all.
+
+        Returns:
+            Level aggregates sorted from best to worst.
+        """
+        return [
+            (level.ticks, level.quantity, level.order_count)
+            for level in islice(self.iter_levels(), limit)
+        ]
+
+
+class _DenseBookSide:
+    """One side of the book backed by dense per-tick arrays.
+
+    Level quantity and order count live in NumPy arrays indexed by tick
+    offset from ``base``, so best-price moves, depth-at-price and top-N
+    depth are array indexing and slicing. FIFO queues are still kept per
+    level for matching. The window recenters (and grows if needed) when a
+    price falls outside it.
+
+    Attributes:
+        levels: Price in ticks -> queue of resting orders (time-sorted).
+    """
+
+    __slots__ = (
+        "_base", "_best_index", "_count", "_is_bid", "_quantity", "levels",
+    )
+
+    def __init__(self, is_bid: bool, window: int) -> None:
+        self.levels: Dict[int, _PriceLevel] = {}
+        self._is_bid = is_bid
+        self._base: Optional[int] = None
+        self._quantity = np.zeros(window, dtype=np.int64)
+        self._count = np.zeros(window, dtype=np.int64)
+        self._best_index: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def best(self) -> Optional[int]:
+        """Return the best price in ticks on this side, or None if empty."""
+        if self._best_index is None or self._base is None:
+            return None
+        return self._base + self._best_index
+
+    def get_or_create(self, ticks: int) -> _PriceLevel:
+        """Return the order queue at a price, creating the level if needed.
+
+        Args:
+            ticks: Level price in ticks.
+
+        Returns:
+            The (possibly new) price level.
+        """
+        level = self.levels.get(ticks)
+        if level is not None:
+            return level
+
+        index = self._index_for(ticks)
+        level = self.levels[ticks] = _PriceLevel(ticks)
+        best = self._best_index
+        if (
+            best is None
+            or (self._is_bid and index > best)
+            or (not self._is_bid and index < best)
+        ):
+            self._best_index = index
+        return level
+
+    def load_levels(self, levels: List[_PriceLevel]) -> None:
+        """Install populated levels into an empty side in one step.
+
+        Args:
+            levels: Levels with their aggregates set, best first.
+        """
+        if not levels:
+            return
+        self.levels.update((level.ticks, level) for level in levels)
+        ticks = np.fromiter(
+            (level.ticks for level in levels), dtype=np.int64, count=len(levels)
+        )
+        low, high = int(ticks.min()), int(ticks.max())
+        size = len(self._count)
+        while high - low + 1 > size // 2:
+            size *= 2
+        self._base = base = (low + high) // 2 - size // 2
+        self._quantity = np.zeros(size, dtype=np.int64)
+        self._count = np.zeros(size, dtype=np.int64)
+        indices = ticks - base
+        self._quantity[indices] = [level.quantity for level in levels]
+        self._count[indices] = [level.order_count for level in levels]
+        self._best_index = int(indices[0])
+
+    def remove_level(self, ticks: int) -> None:
+        """Delete a price level and move the best pointer if it was the top.
+
+        Args:
+            ticks: Level price in ticks to remove.
+        """
+        del self.levels[ticks]
+        assert self._base is not None
+        index = ticks - self._base
+        self._quantity[index] = 0
+        self._count[index] = 0
+        if index != self._best_index:
+            return
+
+        if self._is_bid:
+            occupied = np.flatnonzero(self._count[:index])
+            self._best_index = int(occupied[-1]) if occupied.size else None
+        else:
+            occupied = np.flatnonzero(self._count[index + 1:])
+            self._best_index = (
+                index + 1 + int(occupied[0]) if occupied.size else None
+            )
+
+    def iter_levels(self) -> Iterator[_PriceLevel]:
+        """Iterate price levels from best to worst."""
+        levels = self.levels
+        base = self._base
+        for index in self._occupied():
+            yield levels[base + index]
+
+    def pop_levels(
+        self, low: Optional[int] = None, high: Optional[int] = None
+    ) -> List[_PriceLevel]:
+        """Remove every level with ``low <= ticks <= high`` in one step.
+
+        Args:
+            low: Lowest tick price to remove, or None for unbounded.
+            high: Highest tick price to remove, or None for unbounded.
+
+        Returns:
+            Removed levels, best first.
+        """
+        if self._base is None or not self.levels:
+            return []
+        size = len(self._count)
+        start = 0 if low is None else max(low - self._base, 0)
+        stop = size if high is None else min(high - self._base + 1, size)
+        if start >= stop:
+            return []
+
+        occupied = np.flatnonzero(self._count[start:stop]) + start
+        if self._is_bid:
+            occupied = occupied[::-1]
+        base = self._base
+        removed = [self.levels.pop(base + index) for index in occupied.tolist()]
+        self._quantity[start:stop] = 0
+        self._count[start:stop] = 0
+
+        remaining = np.flatnonzero(self._count)
+        if remaining.size == 0:
+            self._best_index = None
+        else:
+            self._best_index = int(remaining[-1 if self._is_bid else 0])
+        return removed
+
+    def update(self, level: _PriceLevel) -> None:
+        """Mirror a level's aggregates into the dense arrays.
+
+        Args:
+            level: Level whose quantity or order count changed.
+        """
+        assert self._base is not None
+        index = level.ticks - self._base
+        self._quantity[index] = level.quantity
+        self._count[index] = level.order_count
+
+    def depth(self, limit: Optional[int]) -> List[Tuple[int, int, int]]:
+        """Return (ticks, quantity, order_count) for the top levels.
+
+        Args:
+            limit: Maximum number of levels, or None for all.
+
+        Returns:
+            Level aggregates sorted from best to worst.
+        """
+        indices = self._occupied()[:limit]
+        if indices.size == 0:
+            return []
+        return list(zip(
+            (indices + self._base).tolist(),
+            self._quantity[indices].tolist(),
+            self._count[indices].tolist(),
+        ))
+
+    def _occupied(self) -> np.ndarray:
+        """Return occupied array indices ordered from best to worst."""
+        best = self._best_index
+        if best is None:
+            return np.empty(0, dtype=np.intp)
+        if self._is_bid:
+            return np.flatnonzero(self._count[:best + 1])[::-1]
+        return np.flatnonzero(self._count[best:]) + best
+
+    def _index_for(self, ticks: int) -> int:
+        """Map a tick price to an array index, recentering if needed.
+
+        Args:
+            ticks: Price in ticks.
+
+        Returns:
+            Index of the price within the window.
+        """
+        if self._base is None:
+            self._base = ticks - len(self._count) // 2
+        index = ticks - self._base
+        if 0 <= index < len(self._count):
+            return index
+        self._recenter(ticks)
+        return ticks - self._base
+
+    def _recenter(self, ticks: int) -> None:
+        """Move (and if necessary grow) the window so it covers ``ticks``.
+
+        Args:
+            ticks: Price in ticks that must fit in the new window.
+        """
+        assert self._base is not None
+        old_base = self._base
+        occupied = np.flatnonzero(self._count)
+        low, high = ticks, ticks
+        if occupied.size:
+            low = min(low, old_base + int(occupied[0]))
+            high = max(high, old_base + int(occupied[-1]))
+
+        size = len(self._count)
+        while high - low + 1 > size // 2:
+            size *= 2
+        new_base = (low + high) // 2 - size // 2
+
+        quantity = np.zeros(size, dtype=np.int64)
+        count = np.zeros(size, dtype=np.int64)
+        shifted = occupied + (old_base - new_base)
+        quantity[shifted] = self._quantity[occupied]
+        count[shifted] = self._count[occupied]
+
+        self._base = new_base
+        self._quantity = quantity
+        self._count = count
+        if self._best_index is not None:
+            self._best_index += old_base - new_base
+        logger.debug(
+            "Dense ladder recentered: base=%d, window=%d", new_base, size,
+        )
+
+
+_AnyBookSide = Union[_BookSide, _DenseBookSide]
+
+
+def _encode(
+    values: Sequence,  # type: ignore[type-arg]
+    codes: Dict,  # type: ignore[type-arg]
+    code_count: int,
+    name: str,
+) -> np.ndarray:
+    """Convert enum members or integer codes to an int8 code array.
+
+    Args:
+        values: Enum members or integer codes.
+        codes: Enum member -> integer code.
+        code_count: Number of valid codes.
+        name: Field name used in error messages.
+
+    Returns:
+        Integer code per value.
+
+    Raises:
+        OrderValidationError: If a value is not a known member or code.
+    """
+    array = np.asarray(values)
+    if array.dtype == object:
+        try:
+            array = np.fromiter(
+                (codes[value] for value in values), dtype=np.int8,
+                count=len(values),
+            )
+        except KeyError as exc:
+            raise OrderValidationError(f"Unknown {name} {exc.args[0]!r}") from exc
+    elif array.size and array.dtype.kind not in "iu":
+        raise OrderValidationError(
+            f"{name} codes must be integers, got {array.dtype}"
+        )
+    elif array.size and (array.min() < 0 or array.max() >= code_count):
+        raise OrderValidationError(f"{name} codes must be in [0, {code_count})")
+    return array.astype(np.int8, copy=False).reshape(-1)
+
+
+def _quantities(values: Sequence) -> np.ndarray:  # type: ignore[type-arg]
+    """Convert batch quantities to an int64 array without truncating.
+
+    Args:
+        values: Per-order quantities.
+
+    Returns:
+        Quantity per order.
+
+    Raises:
+        OrderValidationError: If a quantity is not a whole number in
+            (0, ``MAX_ORDER_QUANTITY``].
+    """
+    array = np.asarray(values)
+    if array.dtype == object:
+        # Python ints too large for int64, or mixed element types
+        try:
+            array = array.astype(np.float64)
+        except (TypeError, ValueError, OverflowError) as exc:
+            raise OrderValidationError(f"Invalid quantities: {exc}") from exc
+    array = array.reshape(-1)
+    if array.size and array.dtype.kind not in "iuf":
+        raise OrderValidationError(
+            f"Quantities must be integers, got {array.dtype}"
+        )
+
+    invalid = (array <= 0) | (array > MAX_ORDER_QUANTITY)
+    if array.dtype.kind == "f":
+        with np.errstate(invalid="ignore"):
+            invalid |= ~np.isfinite(array) | (array != np.trunc(array))
+    if invalid.any():
+        index = int(np.argmax(invalid))
+        raise OrderValidationError(
+            f"Batch order {index}: Quantity must be a whole number in "
+            f"(0, {MAX_ORDER_QUANTITY}], got {array[index].item()}"
+        )
+    return array.astype(np.int64)
+
+
 class OrderBook:
     """Price-time priority limit order book with matching engine.
 
@@ -125,131 +940,711 @@ class OrderBook:
     against resting liquidity using price-time priority. Unmatched
     portions of limit orders rest in the book.
 
-    Attributes:
-        symbol: Trading instrument symbol.
-        tick_size: Minimum price increment.
-    """
+    Prices are converted to integer ticks once, when an order is
+    submitted; matching and level keys work purely on ints and float
+    prices are only reconstructed by the query APIs and trade records.
+
+    Two book side backends are available: ``"sorted"`` (a bisect ladder
+    over a dict of levels, suited to sparse or unbounded prices) and
+    ``"dense"`` (per-tick NumPy arrays around a moving window, suited to
+    instruments that trade inside a known band).
+
+    Attributes:
+        symbol: Trading instrument symbol.
+        tick_size: Minimum price increment.
+        backend: Book side backend name.
+    """
+
+    def __init__(
+        self,
+        symbol: str = "SIM",
+        tick_size: float = DEFAULT_TICK_SIZE,
+        backend: str = BACKEND_SORTED,
+        dense_window: int = DEFAULT_DENSE_WINDOW,
+        retention: Optional[RetentionPolicy] = None,
+        columnar_trades: bool = False,
+        order_ids: Optional[IdSequence] = None,
+        trade_ids: Optional[IdSequence] = None,
+        journal: Optional["JournalWriter"] = None,
+    ) -> None:
+        """Initialize the order book.
+
+        Args:
+            symbol: Trading instrument identifier.
+            tick_size: Minimum price increment.
+            backend: ``"sorted"`` or ``"dense"``.
+            dense_window: Initial window width in ticks for the dense backend.
+            retention: Eviction policy for terminal orders and trade
+                history. None keeps everything.
+            columnar_trades: Also record trades in a columnar TradeLog,
+                available as ``trade_log``.
+            order_ids: Order ID sequence, shared when several books must
+                issue globally unique IDs. A private sequence if None.
+            trade_ids: Trade ID sequence, shared likewise.
+            journal: Optional journal recording every accepted submit,
+                cancel, amend and execution, for later replay.
+
+        Raises:
+            ValueError: If tick_size <= 0, the backend is unknown or
+                dense_window < 2.
+        """
+        if tick_size <= 0:
+            raise ValueError(f"tick_size must be positive, got {tick_size}")
+        if backend not in (BACKEND_SORTED, BACKEND_DENSE):
+            raise ValueError(f"Unknown backend {backend!r}")
+        if dense_window < 2:
+            raise ValueError(
+                f"dense_window must be at least 2, got {dense_window}"
+            )
+
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.backend = backend
+
+        # Decimal places needed to print a tick-aligned price exactly
+        exponent = Decimal(repr(tick_size)).normalize().as_tuple().exponent
+        self._price_decimals = max(0, -int(exponent))
+
+        # Price level -> FIFO order queue, with a sorted or dense ladder
+        self._bids: _AnyBookSide
+        self._asks: _AnyBookSide
+        if backend == BACKEND_DENSE:
+            self._bids = _DenseBookSide(is_bid=True, window=dense_window)
+            self._asks = _DenseBookSide(is_bid=False, window=dense_window)
+        else:
+            self._bids = _BookSide(is_bid=True)
+            self._asks = _BookSide(is_bid=False)
+
+        # Cached top of book, maintained incrementally on every book change
+        self._best_bid: Optional[int] = None
+        self._best_ask: Optional[int] = None
+
+        # Order ID -> Order for fast lookup
+        self._orders: Dict[int, Order] = {}
+
+        # Number of orders currently resting in the book
+        self._open_order_count = 0
+
+        # Client tag -> resting orders carrying it
+        self._orders_by_tag: Dict[str, Dict[int, Order]] = {}
+
+        # Trade history (a ring buffer when retention caps it)
+        self.retention = retention or RetentionPolicy()
+        self._trades: Deque[Trade] = deque(maxlen=self.retention.max_trades)
+        self._on_trade_evicted = self.retention.on_trade_evicted
+        self._trade_view = TradeView(self._trades)
+
+        # Optional columnar copy of every trade (unaffected by retention)
+        self.trade_log: Optional[TradeLog] = (
+            TradeLog() if columnar_trades else None
+        )
+
+        # (event time, order_id) of terminal orders awaiting eviction
+        self._track_terminal = self.retention.bounds_orders
+        self._terminal_orders: Deque[Tuple[float, int]] = deque()
+        self._clock = 0.0
+
+        # Auto-incrementing IDs (possibly shared with other books)
+        self._order_ids = order_ids or IdSequence()
+        self._trade_ids = trade_ids or IdSequence()
+        self._trade_total = 0
+
+        # Optional write-ahead record of accepted operations
+        self.journal = journal
+
+        # Subscribers to L2 level deltas
+        self._level_listeners: List[Callable[[LevelUpdate], None]] = []
+
+        # Subscribers to L3 order events
+        self._order_listeners: List[Callable[[OrderUpdate], None]] = []
+
+        # Callbacks run once each completed write operation has been applied
+        self._commit_listeners: List[Callable[[], None]] = []
+
+        logger.info(
+            "OrderBook initialized: symbol=%s, tick_size=%s, backend=%s",
+            symbol, tick_size, backend,
+        )
+
+    @property
+    def trades(self) -> TradeView:
+        """Return a read-only, non-copying view of retained trades."""
+        return self._trade_view
+
+    def trades_since(self, trade_id: int) -> List[Trade]:
+        """Return retained trades with an ID greater than ``trade_id``.
+
+        Cost is proportional to the number of trades returned, so polling
+        with the last seen ID is O(new trades) per call.
+
+        Args:
+            trade_id: Last trade ID already consumed (0 for all trades).
+
+        Returns:
+            Trades in execution order.
+        """
+        recent = list(takewhile(
+            lambda trade: trade.trade_id > trade_id, reversed(self._trades)
+        ))
+        recent.reverse()
+        return recent
+
+    @property
+    def trade_count(self) -> int:
+        """Return total number of executed trades, including evicted ones."""
+        return self._trade_total
+
+    @property
+    def order_count(self) -> int:
+        """Return total number of open orders in the book."""
+        return self._open_order_count
+
+    def submit_order(
+        self,
+        side: Side,
+        price: float,
+        quantity: int,
+        order_type: OrderType = OrderType.LIMIT,
+        timestamp: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Tuple[Order, List[Trade]]:
+        """Submit a new order to the book.
+
+        Args:
+            side: BUY or SELL.
+            price: Limit price. Ignored for MARKET orders.
+            quantity: Number of units to trade.
+            order_type: LIMIT, MARKET, or IOC.
+            timestamp: Order time. Uses current time if None.
+            tag: Optional client tag, usable with ``cancel_by_tag``.
+
+        Returns:
+            Tuple of (submitted_order, list_of_trades_generated).
+
+        Raises:
+            OrderValidationError: If order parameters are invalid.
+        """
+        self._validate_order_params(side, price, quantity, order_type)
+        price_ticks = (
+            0 if order_type is OrderType.MARKET else self._price_to_ticks(price)
+        )
+
+        if timestamp is None:
+            timestamp = time.time()
+        self._clock = timestamp
+
+        order = self._create_order(
+            side, price_ticks, quantity, order_type, timestamp, tag
+        )
+        trades = self._process_order(order)
+        if self.journal is not None:
+            self.journal.record_submit(order)
+        if self._commit_listeners:
+            self._publish_commit()
+
+        if self._track_terminal:
+            self._evict_terminal_orders()
+
+        logger.debug(
+            "Order %d: %s %s %d @ %.2f -> %d trades",
+            order.order_id, side.value, order_type.value,
+            quantity, price, len(trades),
+        )
+        return order, trades
+
+    def submit_orders(
+        self,
+        orders: Optional[Sequence] = None,  # type: ignore[type-arg]
+        *,
+        sides: Optional[Sequence] = None,  # type: ignore[type-arg]
+        prices: Optional[Sequence] = None,  # type: ignore[type-arg]
+        quantities: Optional[Sequence] = None,  # type: ignore[type-arg]
+        order_types: Optional[Sequence] = None,  # type: ignore[type-arg]
+        timestamps: Optional[Sequence] = None,  # type: ignore[type-arg]
+        tags: Optional[Sequence[Optional[str]]] = None,
+    ) -> Tuple[List[Order], List[Trade]]:
+        """Submit many orders in one call.
+
+        Orders are given either as a sequence of ``OrderSpec`` (or plain
+        tuples in the same field order), or as parallel arrays via the
+        keyword arguments. Array sides and order types may be enum members
+        or integer codes (see ``SIDE_BY_CODE`` and ``ORDER_TYPE_BY_CODE``).
+
+        The whole batch is validated up front, so either every order is
+        applied or none is. Orders are then matched in sequence exactly as
+        repeated ``submit_order`` calls would, with clock reads, retention
+        and logging done once per batch.
+
+        Args:
+            orders: Sequence of order specs.
+            sides: Per-order sides (array form).
+            prices: Per-order limit prices (array form).
+            quantities: Per-order quantities (array form).
+            order_types: Per-order types (array form). Defaults to LIMIT.
+            timestamps: Per-order times (array form). Defaults to the
+                current time for every order.
+            tags: Per-order client tags (array form). Defaults to None.
+
+        Returns:
+            Tuple of (submitted_orders, all_trades_generated).
+
+        Raises:
+            OrderValidationError: If any order in the batch is invalid.
+            ValueError: If both or neither input forms are given, or the
+                arrays differ in length.
+        """
+        if orders is not None:
+            arrays = (sides, prices, quantities, order_types, timestamps, tags)
+            if any(array is not None for array in arrays):
+                raise ValueError("Pass either orders or arrays, not both")
+            specs = [OrderSpec(*spec) for spec in orders]
+            sides = [spec.side for spec in specs]
+            prices = [spec.price for spec in specs]
+            quantities = [spec.quantity for spec in specs]
+            order_types = [spec.order_type for spec in specs]
+            timestamps = [spec.timestamp for spec in specs]
+            tags = [spec.tag for spec in specs]
+        elif sides is None or prices is None or quantities is None:
+            raise ValueError("sides, prices and quantities are required")
+
+        side_codes = _encode(sides, _SIDE_CODE, len(SIDE_BY_CODE), "side")
+        count = len(side_codes)
+        if order_types is None:
+            type_codes = np.zeros(count, dtype=np.int8)
+        else:
+            type_codes = _encode(
+                order_types, _ORDER_TYPE_CODE, len(ORDER_TYPE_BY_CODE),
+                "order_type",
+            )
+        price_arr = np.asarray(prices, dtype=np.float64)
+        qty_arr = _quantities(quantities)
+        if not (len(type_codes) == len(price_arr) == len(qty_arr) == count):
+            raise ValueError("Batch arrays must all have the same length")
+
+        ticks = self._validate_batch(side_codes, price_arr, qty_arr, type_codes)
+
+        batch_time = time.time()
+        if timestamps is None:
+            times: List[float] = [batch_time] * count
+        else:
+            times = [batch_time if t is None else t for t in timestamps]
+            if len(times) != count:
+                raise ValueError("Batch arrays must all have the same length")
+        tag_list: Sequence[Optional[str]] = (
+            [None] * count if tags is None else tags
+        )
+        if len(tag_list) != count:
+            raise ValueError("Batch arrays must all have the same length")
+
+        submitted: List[Order] = []
+        trades: List[Trade] = []
+        for side_code, price_ticks, quantity, type_code, timestamp, tag in zip(
+            side_codes.tolist(), ticks.tolist(), qty_arr.tolist(),
+            type_codes.tolist(), times, tag_list,
+        ):
+            self._clock = timestamp
+            order = self._create_order(
+                SIDE_BY_CODE[side_code], price_ticks, quantity,
+                ORDER_TYPE_BY_CODE[type_code], timestamp, tag,
+            )
+            trades.extend(self._process_order(order))
+            submitted.append(order)
+
+        if self.journal is not None:
+            for order in submitted:
+                self.journal.record_submit(order)
+        if self._commit_listeners:
+            self._publish_commit()
+
+        if self._track_terminal:
+            self._evict_terminal_orders()
+
+        logger.debug(
+            "Batch of %d orders -> %d trades", len(submitted), len(trades),
+        )
+        return submitted, trades
+
+    def cancel_order(self, order_id: int) -> Order:
+        """Cancel an open order.
+
+        Args:
+            order_id: ID of the order to cancel.
+
+        Returns:
+            The cancelled order.
+
+        Raises:
+            OrderNotFoundError: If order not found.
+            OrderValidationError: If order is already filled/cancelled.
+        """
+        order = self._get_order(order_id)
+        self._validate_cancellable(order)
+
+        self._remove_from_book(order)
+        order.status = OrderStatus.CANCELLED
+        if self._track_terminal:
+            self._mark_terminal(order)
+            self._evict_terminal_orders()
+        if self._order_listeners:
+            self._publish_order(
+                OrderAction.DELETE, order, order.remaining, order.price,
+                self._clock,
+            )
+        if self.journal is not None:
+            self.journal.record_cancel(order, self._clock)
+        if self._commit_listeners:
+            self._publish_commit()
+
+        logger.debug("Cancelled order %d", order_id)
+        return order
+
+    def cancel_orders(self, order_ids: Iterable[int]) -> List[Order]:
+        """Cancel several open orders at once.
 
-    def __init__(
-        self,
-        symbol: str = "SIM",
-        tick_size: float = DEFAULT_TICK_SIZE,
-    ) -> None:
-        """Initialize the order book.
+        Every ID is checked before anything is cancelled, so the call is
+        all-or-nothing. Emptied levels are dropped and the top of book is
+        refreshed once per side rather than once per order.
 
         Args:
-            symbol: Trading instrument identifier.
-            tick_size: Minimum price increment.
+            order_ids: IDs of the orders to cancel.
+
+        Returns:
+            The cancelled orders, in the order given.
 
         Raises:
-            ValueError: If tick_size <= 0.
+            OrderNotFoundError: If any order is not found.
+            OrderValidationError: If any order is already filled/cancelled
+                or appears twice.
         """
-        if tick_size <= 0:
-            raise ValueError(f"tick_size must be positive, got {tick_size}")
+        orders = [self._get_order(order_id) for order_id in order_ids]
+        seen = set()
+        for order in orders:
+            self._validate_cancellable(order)
+            if order.order_id in seen:
+                raise OrderValidationError(
+                    f"Order {order.order_id} listed more than once"
+                )
+            seen.add(order.order_id)
+
+        touched = set()
+        for order in orders:
+            level = order._level
+            if level is None:
+                continue
+            book = self._bids if order.side is Side.BUY else self._asks
+            level.remove(order)
+            self._open_order_count -= 1
+            self._unindex_tag(order)
+            if level:
+                book.update(level)
+            else:
+                book.remove_level(level.ticks)
+            if self._level_listeners:
+                self._publish_level(
+                    order.side, level.ticks, level.quantity, level.order_count
+                )
+            touched.add(order.side)
+        for side in touched:
+            self._refresh_best(side)
+
+        return self._finish_mass_cancel(orders)
+
+    def cancel_side(self, side: Side) -> List[Order]:
+        """Cancel every resting order on one side of the book.
 
-        self.symbol = symbol
-        self.tick_size = tick_size
+        Args:
+            side: Side to clear.
 
-        # Price level -> list of orders (time-sorted)
-        self._bids: Dict[float, List[Order]] = defaultdict(list)
-        self._asks: Dict[float, List[Order]] = defaultdict(list)
+        Returns:
+            The cancelled orders, best price first.
+        """
+        return self.cancel_price_range(side)
 
-        # Order ID -> Order for fast lookup
-        self._orders: Dict[int, Order] = {}
+    def cancel_price_range(
+        self,
+        side: Side,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+    ) -> List[Order]:
+        """Cancel every resting order on a side within a price range.
 
-        # Trade history
-        self._trades: List[Trade] = []
+        Matching levels are removed wholesale rather than order by order.
 
-        # Auto-incrementing IDs
-        self._next_order_id = 1
-        self._next_trade_id = 1
+        Args:
+            side: Side to cancel on.
+            low: Lowest price to cancel (inclusive), or None for unbounded.
+            high: Highest price to cancel (inclusive), or None for unbounded.
 
-        logger.info(
-            "OrderBook initialized: symbol=%s, tick_size=%s",
-            symbol, tick_size,
+        Returns:
+            The cancelled orders, best price first.
+        """
+        tick_size = self.tick_size
+        low_ticks = None if low is None else math.ceil(
+            low / tick_size - TICK_TOLERANCE
         )
+        high_ticks = None if high is None else math.floor(
+            high / tick_size + TICK_TOLERANCE
+        )
+        book = self._bids if side is Side.BUY else self._asks
+        orders: List[Order] = []
+        for level in book.pop_levels(low_ticks, high_ticks):
+            self._open_order_count -= level.order_count
+            if self._level_listeners:
+                self._publish_level(side, level.ticks, 0, 0)
+            order = level.head
+            while order is not None:
+                next_order = order._next
+                order._level = order._prev = order._next = None
+                self._unindex_tag(order)
+                orders.append(order)
+                order = next_order
+        self._refresh_best(side)
+
+        return self._finish_mass_cancel(orders)
+
+    def cancel_by_tag(self, tag: str) -> List[Order]:
+        """Cancel every resting order submitted with a client tag.
 
-    @property
-    def trades(self) -> List[Trade]:
-        """Return list of all executed trades."""
-        return list(self._trades)
-
-    @property
-    def trade_count(self) -> int:
-        """Return total number of executed trades."""
-        return len(self._trades)
+        Args:
+            tag: Client tag given at submission.
 
-    @property
-    def order_count(self) -> int:
-        """Return total number of open orders in the book."""
-        return sum(
-            1
-            for order in self._orders.values()
-            if order.status in (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED)
-        )
+        Returns:
+            The cancelled orders, in submission order.
+        """
+        tagged = self._orders_by_tag.get(tag)
+        if not tagged:
+            return []
+        return self.cancel_orders(list(tagged))
 
-    def submit_order(
+    def modify_order(
         self,
-        side: Side,
-        price: float,
-        quantity: int,
-        order_type: OrderType = OrderType.LIMIT,
+        order_id: int,
+        new_price: Optional[float] = None,
+        new_qty: Optional[int] = None,
         timestamp: Optional[float] = None,
     ) -> Tuple[Order, List[Trade]]:
-        """Submit a new order to the book.
+        """Amend the price and/or quantity of an open order.
+
+        ``new_qty`` is the new total order quantity, so the remaining
+        quantity becomes ``new_qty`` minus what has already filled. A pure
+        quantity reduction is applied in place in O(1) and keeps the
+        order's time priority. A price change or quantity increase moves
+        the order to the back of its (new) level; a new price that crosses
+        the spread is matched like an incoming order.
 
         Args:
-            side: BUY or SELL.
-            price: Limit price. Ignored for MARKET orders.
-            quantity: Number of units to trade.
-            order_type: LIMIT, MARKET, or IOC.
-            timestamp: Order time. Uses current time if None.
+            order_id: ID of the order to amend.
+            new_price: New limit price, or None to keep the current one.
+            new_qty: New total quantity, or None to keep the current one.
+            timestamp: Amendment time, used for any resulting trades.
+                Uses current time if None.
 
         Returns:
-            Tuple of (submitted_order, list_of_trades_generated).
+            Tuple of (amended_order, list_of_trades_generated).
 
         Raises:
-            OrderValidationError: If order parameters are invalid.
+            OrderNotFoundError: If order not found.
+            OrderValidationError: If the order is not open, or the new price
+                or quantity is invalid.
         """
-        self._validate_order_params(side, price, quantity, order_type)
+        order = self._get_order(order_id)
+        self._validate_cancellable(order, "modify")
+
+        new_ticks = order.price_ticks
+        if new_price is not None:
+            self._validate_order_params(
+                order.side, new_price, order.remaining, OrderType.LIMIT
+            )
+            new_ticks = self._price_to_ticks(new_price)
+
+        filled = order.quantity - order.remaining
+        quantity = order.quantity if new_qty is None else new_qty
+        if quantity <= filled or quantity > MAX_ORDER_QUANTITY:
+            raise OrderValidationError(
+                f"New quantity must be in ({filled}, {MAX_ORDER_QUANTITY}], "
+                f"got {quantity}"
+            )
+
+        if new_ticks == order.price_ticks and quantity <= order.quantity:
+            self._reduce_in_place(order, order.quantity - quantity)
+            if self.journal is not None:
+                self.journal.record_modify(order)
+            if self._commit_listeners:
+                self._publish_commit()
+            return order, []
 
         if timestamp is None:
             timestamp = time.time()
+        self._clock = timestamp
 
-        order = self._create_order(side, price, quantity, order_type, timestamp)
-        self._orders[order.order_id] = order
+        self._remove_from_book(order)
+        if self._order_listeners:
+            self._publish_order(
+                OrderAction.DELETE, order, order.remaining, order.price,
+                timestamp,
+            )
+        order.price_ticks = new_ticks
+        order.price = self._ticks_to_price(new_ticks)
+        order.quantity = quantity
+        order.remaining = quantity - filled
+        order.timestamp = timestamp
 
         trades = self._match_order(order)
-        self._handle_post_match(order, order_type)
+        if order.remaining > 0:
+            self._add_to_book(order)
+        elif self._track_terminal:
+            self._mark_terminal(order)
+            self._evict_terminal_orders()
+        if self.journal is not None:
+            self.journal.record_modify(order)
+        if self._commit_listeners:
+            self._publish_commit()
 
         logger.debug(
-            "Order %d: %s %s %d @ %.2f -> %d trades",
-            order.order_id, side.value, order_type.value,
-            quantity, price, len(trades),
+            "Modified order %d: %d @ %.2f -> %d trades",
+            order_id, quantity, order.price, len(trades),
         )
         return order, trades
 
-    def cancel_order(self, order_id: int) -> Order:
-        """Cancel an open order.
+    def execute_order(
+        self,
+        order_id: int,
+        quantity: int,
+        price: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> Trade:
+        """Fill a resting order against a counterparty outside the book.
+
+        Used when replaying feeds that report executions of individual
+        resting orders without the aggressing order (e.g. ITCH). The fill
+        keeps the order's queue position; the trade records order ID 0 as
+        the unseen counterparty.
 
         Args:
-            order_id: ID of the order to cancel.
+            order_id: ID of the resting order.
+            quantity: Executed quantity.
+            price: Execution price, or None for the order's limit price.
+            timestamp: Execution time. Uses current time if None.
 
         Returns:
-            The cancelled order.
+            The executed Trade.
 
         Raises:
             OrderNotFoundError: If order not found.
-            OrderValidationError: If order is already filled/cancelled.
+            OrderValidationError: If the order is not open or quantity
+                exceeds its remaining size.
         """
         order = self._get_order(order_id)
-        self._validate_cancellable(order)
+        self._validate_cancellable(order, "execute")
+        if quantity <= 0 or quantity > order.remaining:
+            raise OrderValidationError(
+                f"Execution quantity must be in (0, {order.remaining}], "
+                f"got {quantity}"
+            )
 
-        self._remove_from_book(order)
-        order.status = OrderStatus.CANCELLED
+        if timestamp is None:
+            timestamp = time.time()
+        self._clock = timestamp
+        if price is None:
+            price = order.price
+
+        contra_side = Side.SELL if order.side is Side.BUY else Side.BUY
+        contra = Order(
+            0, contra_side, price, quantity, quantity, OrderType.MARKET,
+            timestamp,
+        )
+        level = order._level
+        if level is not None:
+            level.quantity -= quantity
+        trade = self._execute_trade(contra, order, price, quantity)
 
-        logger.debug("Cancelled order %d", order_id)
-        return order
+        if order.remaining == 0:
+            self._remove_from_book(order)
+            if self._track_terminal:
+                self._mark_terminal(order)
+                self._evict_terminal_orders()
+        elif level is not None:
+            book = self._bids if order.side is Side.BUY else self._asks
+            book.update(level)
+            if self._level_listeners:
+                self._publish_level(
+                    order.side, level.ticks, level.quantity, level.order_count
+                )
+        if self.journal is not None:
+            self.journal.record_execute(order, quantity, price, timestamp)
+        if self._commit_listeners:
+            self._publish_commit()
+        return trade
+
+    def subscribe_levels(self, callback: Callable[[LevelUpdate], None]) -> None:
+        """Register a callback for incremental L2 updates.
+
+        The callback is invoked synchronously with a LevelUpdate every time
+        a price level's aggregate quantity or order count changes, in the
+        order the changes happen.
+
+        Args:
+            callback: Function called with each LevelUpdate.
+        """
+        self._level_listeners.append(callback)
+
+    def unsubscribe_levels(self, callback: Callable[[LevelUpdate], None]) -> None:
+        """Remove a callback registered with subscribe_levels.
+
+        Args:
+            callback: Previously registered callback.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._level_listeners.remove(callback)
+
+    def subscribe_orders(self, callback: Callable[[OrderUpdate], None]) -> None:
+        """Register a callback for order-level (L3) events.
+
+        The callback is invoked synchronously with an OrderUpdate for every
+        order that rests, executes, is reduced in place or leaves the book
+        other than by filling, in the order the changes happen.
+
+        Args:
+            callback: Function called with each OrderUpdate.
+        """
+        self._order_listeners.append(callback)
+
+    def unsubscribe_orders(self, callback: Callable[[OrderUpdate], None]) -> None:
+        """Remove a callback registered with subscribe_orders.
+
+        Args:
+            callback: Previously registered callback.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._order_listeners.remove(callback)
+
+    def subscribe_commits(self, callback: Callable[[], None]) -> None:
+        """Register a callback run after every successful write.
+
+        The callback runs on the writing thread once a submit, cancel,
+        amend, execution or mass cancel has been fully applied, so the book
+        is in a consistent state when it is called. Level and order events
+        for the operation have all been published by then.
+
+        Args:
+            callback: Function called with no arguments.
+        """
+        self._commit_listeners.append(callback)
+
+    def unsubscribe_commits(self, callback: Callable[[], None]) -> None:
+        """Remove a callback registered with subscribe_commits.
+
+        Args:
+            callback: Previously registered callback.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._commit_listeners.remove(callback)
 
     def get_order(self, order_id: int) -> Order:
         """Look up an order by ID.
@@ -271,8 +1666,9 @@ class OrderBook:
         Returns:
             Best bid price, or None if no bids.
         """
-        active_prices = self._active_bid_prices()
-        return max(active_prices) if active_prices else None
+        if self._best_bid is None:
+            return None
+        return self._ticks_to_price(self._best_bid)
 
     def best_ask(self) -> Optional[float]:
         """Return the best (lowest) ask price.
@@ -280,8 +1676,9 @@ class OrderBook:
         Returns:
             Best ask price, or None if no asks.
         """
-        active_prices = self._active_ask_prices()
-        return min(active_prices) if active_prices else None
+        if self._best_ask is None:
+            return None
+        return self._ticks_to_price(self._best_ask)
 
     def get_midprice(self) -> Optional[float]:
         """Calculate the mid-price between best bid and ask.
@@ -289,10 +1686,10 @@ class OrderBook:
         Returns:
             Mid-price, or None if either side is empty.
         """
-        bid = self.best_bid()
-        ask = self.best_ask()
+        bid = self._best_bid
+        ask = self._best_ask
         if bid is not None and ask is not None:
-            return (bid + ask) / 2.0
+            return self._ticks_to_price(bid + ask) / 2.0
         return None
 
     def get_spread(self) -> Optional[float]:
@@ -301,10 +1698,10 @@ class OrderBook:
         Returns:
             Spread in price units, or None if either side is empty.
         """
-        bid = self.best_bid()
-        ask = self.best_ask()
+        bid = self._best_bid
+        ask = self._best_ask
         if bid is not None and ask is not None:
-            return ask - bid
+            return self._ticks_to_price(ask - bid)
         return None
 
     def get_book_depth(
@@ -318,10 +1715,32 @@ class OrderBook:
         Returns:
             Tuple of (bid_levels, ask_levels), each sorted by price priority.
         """
-        bid_levels = self._aggregate_side(self._bids, reverse=True)[:levels]
-        ask_levels = self._aggregate_side(self._asks, reverse=False)[:levels]
+        bid_levels = self._aggregate_side(self._bids, levels)
+        ask_levels = self._aggregate_side(self._asks, levels)
         return bid_levels, ask_levels
 
+    def get_depth_at_price(self, side: Side, price: float) -> BookLevel:
+        """Get the aggregate resting liquidity at a single price.
+
+        Args:
+            side: Book side to look at.
+            price: Level price.
+
+        Returns:
+            BookLevel at that price (zero quantity if the level is empty).
+
+        Raises:
+            OrderValidationError: If price is not a multiple of tick_size.
+        """
+        ticks = self._price_to_ticks(price)
+        book = self._bids if side == Side.BUY else self._asks
+        level = book.levels.get(ticks)
+        if level is None:
+            return BookLevel(self._ticks_to_price(ticks), 0, 0)
+        return BookLevel(
+            self._ticks_to_price(ticks), level.quantity, level.order_count
+        )
+
     def get_vwap(self, side: Side, quantity: int) -> Optional[float]:
         """Calculate volume-weighted average price for sweeping quantity.
 
@@ -335,11 +1754,11 @@ class OrderBook:
         Returns:
             VWAP if sufficient liquidity, None otherwise.
         """
-        levels = self._get_opposing_levels(side)
-        return self._compute_vwap(levels, quantity)
+        book = self._asks if side == Side.BUY else self._bids
+        return self._compute_vwap(book.iter_levels(), quantity)
 
     def _compute_vwap(
-        self, levels: List[BookLevel], quantity: int
+        self, levels: Iterable[_PriceLevel], quantity: int
     ) -> Optional[float]:
         """Compute VWAP across price levels for a given quantity.
 
@@ -351,11 +1770,11 @@ class OrderBook:
             VWAP if sufficient liquidity, None otherwise.
         """
         remaining = quantity
-        total_cost = 0.0
+        total_ticks = 0
 
         for level in levels:
             fill_qty = min(remaining, level.quantity)
-            total_cost += fill_qty * level.price
+            total_ticks += fill_qty * level.ticks
             remaining -= fill_qty
             if remaining <= 0:
                 break
@@ -363,7 +1782,7 @@ class OrderBook:
         if remaining > 0:
             return None  # Insufficient liquidity
 
-        return total_cost / quantity
+        return total_ticks * self.tick_size / quantity
 
     def _validate_order_params(
         self,
@@ -387,43 +1806,153 @@ class OrderBook:
             raise OrderValidationError(
                 f"Quantity must be in (0, {MAX_ORDER_QUANTITY}], got {quantity}"
             )
-        if order_type != OrderType.MARKET and price < MIN_PRICE:
+        if order_type == OrderType.MARKET:
+            return
+        if not math.isfinite(price):
+            raise OrderValidationError(f"Price must be finite, got {price}")
+        if price < MIN_PRICE:
             raise OrderValidationError(
                 f"Price must be >= {MIN_PRICE}, got {price}"
             )
 
+    def _validate_batch(
+        self,
+        side_codes: np.ndarray,
+        prices: np.ndarray,
+        quantities: np.ndarray,
+        type_codes: np.ndarray,
+    ) -> np.ndarray:
+        """Validate a batch of orders and convert their prices to ticks.
+
+        Args:
+            side_codes: Per-order side codes.
+            prices: Per-order float prices.
+            quantities: Per-order quantities.
+            type_codes: Per-order order type codes.
+
+        Returns:
+            Per-order prices in ticks (0 for market orders).
+
+        Raises:
+            OrderValidationError: Describing the first invalid order.
+        """
+        is_market = type_codes == _MARKET_CODE
+        with np.errstate(invalid="ignore"):
+            ticks = np.rint(prices / self.tick_size)
+            off_grid = (
+                np.abs(ticks * self.tick_size - prices)
+                > self.tick_size * TICK_TOLERANCE
+            )
+        invalid = (
+            (quantities <= 0)
+            | (quantities > MAX_ORDER_QUANTITY)
+            | (~is_market & (
+                ~np.isfinite(prices) | (prices < MIN_PRICE) | off_grid
+            ))
+        )
+        if invalid.any():
+            index = int(np.argmax(invalid))
+            try:
+                order_type = ORDER_TYPE_BY_CODE[type_codes[index]]
+                self._validate_order_params(
+                    SIDE_BY_CODE[side_codes[index]], float(prices[index]),
+                    int(quantities[index]), order_type,
+                )
+                self._price_to_ticks(float(prices[index]))
+            except OrderValidationError as exc:
+                raise OrderValidationError(f"Batch order {index}: {exc}") from exc
+            raise OrderValidationError(f"Batch order {index}: Invalid order")
+
+        ticks[is_market] = 0
+        return ticks.astype(np.int64)
+
+    def _price_to_ticks(self, price: float) -> int:
+        """Convert a float price to an integer number of ticks.
+
+        Args:
+            price: Price in currency units.
+
+        Returns:
+            Price in ticks.
+
+        Raises:
+            OrderValidationError: If price is not finite or not a multiple
+                of tick_size.
+        """
+        if not math.isfinite(price):
+            raise OrderValidationError(f"Price must be finite, got {price}")
+        ticks = round(price / self.tick_size)
+        if abs(ticks * self.tick_size - price) > self.tick_size * TICK_TOLERANCE:
+            raise OrderValidationError(
+                f"Price {price} is not a multiple of tick_size {self.tick_size}"
+            )
+        return ticks
+
+    def _ticks_to_price(self, ticks: int) -> float:
+        """Convert an integer number of ticks back to a float price.
+
+        Args:
+            ticks: Price in ticks.
+
+        Returns:
+            Price in currency units, rounded to the tick grid.
+        """
+        return round(ticks * self.tick_size, self._price_decimals)
+
     def _create_order(
         self,
         side: Side,
-        price: float,
+        price_ticks: int,
         quantity: int,
         order_type: OrderType,
         timestamp: float,
+        tag: Optional[str] = None,
     ) -> Order:
         """Create a new Order object with auto-incremented ID.
 
         Args:
             side: Order side.
-            price: Order price.
+            price_ticks: Order price in ticks (0 for market orders).
             quantity: Order quantity.
             order_type: Type of order.
             timestamp: Creation time.
+            tag: Optional client tag.
 
         Returns:
             New Order instance.
         """
         order = Order(
-            order_id=self._next_order_id,
+            order_id=self._order_ids.take(),
             side=side,
-            price=price,
+            price=self._ticks_to_price(price_ticks),
             quantity=quantity,
             remaining=quantity,
             order_type=order_type,
             timestamp=timestamp,
+            price_ticks=price_ticks,
+            tag=tag,
         )
-        self._next_order_id += 1
         return order
 
+    def _process_order(self, order: Order) -> List[Trade]:
+        """Register, match and rest or cancel a newly created order.
+
+        Args:
+            order: Validated incoming order.
+
+        Returns:
+            Trades generated by the order.
+        """
+        self._orders[order.order_id] = order
+        trades = self._match_order(order)
+        self._handle_post_match(order, order.order_type)
+
+        if self._track_terminal and order.status in (
+            OrderStatus.FILLED, OrderStatus.CANCELLED,
+        ):
+            self._mark_terminal(order)
+        return trades
+
     def _match_order(self, order: Order) -> List[Trade]:
         """Match an incoming order against the resting book.
 
@@ -433,7 +1962,7 @@ class OrderBook:
         Returns:
             List of trades generated.
         """
-        if order.side == Side.BUY:
+        if order.side is Side.BUY:
             return self._match_buy(order)
         return self._match_sell(order)
 
@@ -447,16 +1976,28 @@ class OrderBook:
             List of trades.
         """
         trades: List[Trade] = []
-        sorted_prices = sorted(self._active_ask_prices())
+        asks = self._asks
+        is_market = order.order_type is OrderType.MARKET
 
-        for ask_price in sorted_prices:
-            if order.remaining <= 0:
+        while order.remaining > 0:
+            ask_ticks = self._best_ask
+            if ask_ticks is None:
                 break
-            if order.order_type != OrderType.MARKET and ask_price > order.price:
+            if not is_market and ask_ticks > order.price_ticks:
                 break
-            trades.extend(self._fill_at_price(order, self._asks[ask_price], ask_price))
+            resting_orders = asks.levels[ask_ticks]
+            trades.extend(self._fill_at_price(order, resting_orders, ask_ticks))
+            if not resting_orders:
+                asks.remove_level(ask_ticks)
+                self._best_ask = asks.best()
+            else:
+                asks.update(resting_orders)
+            if self._level_listeners:
+                self._publish_level(
+                    Side.SELL, ask_ticks, resting_orders.quantity,
+                    resting_orders.order_count,
+                )
 
-        self._cleanup_empty_levels(self._asks)
         return trades
 
     def _match_sell(self, order: Order) -> List[Trade]:
@@ -469,50 +2010,64 @@ class OrderBook:
             List of trades.
         """
         trades: List[Trade] = []
-        sorted_prices = sorted(self._active_bid_prices(), reverse=True)
+        bids = self._bids
+        is_market = order.order_type is OrderType.MARKET
 
-        for bid_price in sorted_prices:
-            if order.remaining <= 0:
+        while order.remaining > 0:
+            bid_ticks = self._best_bid
+            if bid_ticks is None:
                 break
-            if order.order_type != OrderType.MARKET and bid_price < order.price:
+            if not is_market and bid_ticks < order.price_ticks:
                 break
-            trades.extend(self._fill_at_price(order, self._bids[bid_price], bid_price))
+            resting_orders = bids.levels[bid_ticks]
+            trades.extend(self._fill_at_price(order, resting_orders, bid_ticks))
+            if not resting_orders:
+                bids.remove_level(bid_ticks)
+                self._best_bid = bids.best()
+            else:
+                bids.update(resting_orders)
+            if self._level_listeners:
+                self._publish_level(
+                    Side.BUY, bid_ticks, resting_orders.quantity,
+                    resting_orders.order_count,
+                )
 
-        self._cleanup_empty_levels(self._bids)
         return trades
 
     def _fill_at_price(
         self,
         aggressor: Order,
-        resting_orders: List[Order],
-        price: float,
+        resting_orders: _PriceLevel,
+        price_ticks: int,
     ) -> List[Trade]:
         """Fill an aggressor against resting orders at a price level.
 
         Args:
             aggressor: Incoming order.
-            resting_orders: Orders resting at this price level.
-            price: Execution price.
+            resting_orders: Queue of orders resting at this price level.
+            price_ticks: Execution price in ticks.
 
         Returns:
             Trades generated at this level.
         """
         trades: List[Trade] = []
-        orders_to_remove: List[Order] = []
-
-        for resting in resting_orders:
-            if aggressor.remaining <= 0:
-                break
+        append_trade = trades.append
+        execute = self._execute_trade
+        price = self._ticks_to_price(price_ticks)
 
+        while aggressor.remaining > 0 and resting_orders.head is not None:
+            resting = resting_orders.head
             fill_qty = min(aggressor.remaining, resting.remaining)
-            trade = self._execute_trade(aggressor, resting, price, fill_qty)
-            trades.append(trade)
+            append_trade(execute(aggressor, resting, price, fill_qty))
+            resting_orders.quantity -= fill_qty
 
             if resting.remaining == 0:
-                orders_to_remove.append(resting)
-
-        for order in orders_to_remove:
-            resting_orders.remove(order)
+                resting_orders.remove(resting)
+                self._open_order_count -= 1
+                if resting.tag is not None:
+                    self._unindex_tag(resting)
+                if self._track_terminal:
+                    self._mark_terminal(resting)
 
         return trades
 
@@ -540,19 +2095,36 @@ class OrderBook:
         self._update_order_status(aggressor)
         self._update_order_status(resting)
 
-        buy_id = aggressor.order_id if aggressor.side == Side.BUY else resting.order_id
-        sell_id = resting.order_id if aggressor.side == Side.BUY else aggressor.order_id
+        if aggressor.side is Side.BUY:
+            buy_id, sell_id = aggressor.order_id, resting.order_id
+        else:
+            buy_id, sell_id = resting.order_id, aggressor.order_id
+
+        trade_ids = self._trade_ids
+        trade_id = trade_ids.next_id
+        trade_ids.next_id = trade_id + trade_ids.step
+        self._trade_total += 1
 
         trade = Trade(
-            trade_id=self._next_trade_id,
+            trade_id=trade_id,
             buy_order_id=buy_id,
             sell_order_id=sell_id,
             price=price,
             quantity=quantity,
             timestamp=aggressor.timestamp,
         )
-        self._next_trade_id += 1
-        self._trades.append(trade)
+        if self._order_listeners:
+            self._publish_order(
+                OrderAction.EXECUTE, resting, quantity, price, trade.timestamp
+            )
+        history = self._trades
+        if self._on_trade_evicted is not None and len(history) == history.maxlen:
+            self._on_trade_evicted(history[0])
+        history.append(trade)
+        if self.trade_log is not None:
+            self.trade_log.append(
+                trade.trade_id, buy_id, sell_id, price, quantity, trade.timestamp
+            )
         return trade
 
     def _update_order_status(self, order: Order) -> None:
@@ -561,9 +2133,10 @@ class OrderBook:
         Args:
             order: Order to update.
         """
-        if order.remaining == 0:
+        remaining = order.remaining
+        if remaining == 0:
             order.status = OrderStatus.FILLED
-        elif order.remaining < order.quantity:
+        elif remaining < order.quantity:
             order.status = OrderStatus.PARTIALLY_FILLED
 
     def _handle_post_match(
@@ -592,8 +2165,31 @@ class OrderBook:
         Args:
             order: Order to add.
         """
-        book = self._bids if order.side == Side.BUY else self._asks
-        book[order.price].append(order)
+        price = order.price_ticks
+        self._open_order_count += 1
+        if order.tag is not None:
+            self._orders_by_tag.setdefault(order.tag, {})[order.order_id] = order
+        if order.side is Side.BUY:
+            level = self._bids.get_or_create(price)
+            level.append(order)
+            self._bids.update(level)
+            if self._best_bid is None or price > self._best_bid:
+                self._best_bid = price
+        else:
+            level = self._asks.get_or_create(price)
+            level.append(order)
+            self._asks.update(level)
+            if self._best_ask is None or price < self._best_ask:
+                self._best_ask = price
+        if self._level_listeners:
+            self._publish_level(
+                order.side, price, level.quantity, level.order_count
+            )
+        if self._order_listeners:
+            self._publish_order(
+                OrderAction.ADD, order, order.remaining, order.price,
+                order.timestamp,
+            )
 
     def _remove_from_book(self, order: Order) -> None:
         """Remove an order from the book.
@@ -601,13 +2197,173 @@ class OrderBook:
         Args:
             order: Order to remove.
         """
-        book = self._bids if order.side == Side.BUY else self._asks
-        if order.price in book:
-            book[order.price] = [
-                o for o in book[order.price] if o.order_id != order.order_id
-            ]
-            if not book[order.price]:
-                del book[order.price]
+        level = order._level
+        if level is None:
+            return
+        level.remove(order)
+        self._open_order_count -= 1
+        self._unindex_tag(order)
+        book = self._bids if order.side is Side.BUY else self._asks
+        if level:
+            book.update(level)
+        else:
+            book.remove_level(level.ticks)
+            self._refresh_best(order.side)
+        if self._level_listeners:
+            self._publish_level(
+                order.side, level.ticks, level.quantity, level.order_count
+            )
+
+    def _publish_level(
+        self, side: Side, ticks: int, quantity: int, order_count: int
+    ) -> None:
+        """Send a level delta to every L2 subscriber.
+
+        Args:
+            side: Side of the level.
+            ticks: Level price in ticks.
+            quantity: New total quantity at the level.
+            order_count: New number of orders at the level.
+        """
+        update = LevelUpdate(
+            side, self._ticks_to_price(ticks), quantity, order_count
+        )
+        for listener in self._level_listeners:
+            listener(update)
+
+    def _publish_order(
+        self,
+        action: OrderAction,
+        order: Order,
+        quantity: int,
+        price: float,
+        timestamp: float,
+    ) -> None:
+        """Send an order event to every L3 subscriber.
+
+        Args:
+            action: Kind of change.
+            order: Order that changed.
+            quantity: Quantity added, executed, reduced or deleted.
+            price: Order or execution price.
+            timestamp: Event time.
+        """
+        update = OrderUpdate(
+            action, order.order_id, order.side, price, quantity, timestamp
+        )
+        for listener in self._order_listeners:
+            listener(update)
+
+    def _publish_commit(self) -> None:
+        """Run every commit callback."""
+        for listener in self._commit_listeners:
+            listener()
+
+    def _refresh_best(self, side: Side) -> None:
+        """Re-read the cached best price for one side from its ladder.
+
+        Args:
+            side: Side whose top of book changed.
+        """
+        if side == Side.BUY:
+            self._best_bid = self._bids.best()
+        else:
+            self._best_ask = self._asks.best()
+
+    def _reduce_in_place(self, order: Order, reduction: int) -> None:
+        """Shrink a resting order without touching its queue position.
+
+        Args:
+            order: Resting order.
+            reduction: Quantity to remove (may be 0).
+        """
+        if reduction == 0:
+            return
+        order.quantity -= reduction
+        order.remaining -= reduction
+        if self._order_listeners:
+            self._publish_order(
+                OrderAction.REDUCE, order, reduction, order.price, self._clock
+            )
+        level = order._level
+        if level is not None:
+            level.quantity -= reduction
+            book = self._bids if order.side is Side.BUY else self._asks
+            book.update(level)
+            if self._level_listeners:
+                self._publish_level(
+                    order.side, level.ticks, level.quantity, level.order_count
+                )
+
+    def _finish_mass_cancel(self, orders: List[Order]) -> List[Order]:
+        """Mark unlinked orders cancelled and apply retention once.
+
+        Args:
+            orders: Orders already removed from the book.
+
+        Returns:
+            The same orders.
+        """
+        for order in orders:
+            order.status = OrderStatus.CANCELLED
+            if self._track_terminal:
+                self._mark_terminal(order)
+        if self._track_terminal:
+            self._evict_terminal_orders()
+        if self._order_listeners:
+            for order in orders:
+                self._publish_order(
+                    OrderAction.DELETE, order, order.remaining, order.price,
+                    self._clock,
+                )
+        if self.journal is not None:
+            for order in orders:
+                self.journal.record_cancel(order, self._clock)
+        if self._commit_listeners:
+            self._publish_commit()
+
+        logger.debug("Cancelled %d orders", len(orders))
+        return orders
+
+    def _unindex_tag(self, order: Order) -> None:
+        """Drop a resting order from the client tag index.
+
+        Args:
+            order: Order leaving the book.
+        """
+        if order.tag is None:
+            return
+        tagged = self._orders_by_tag[order.tag]
+        del tagged[order.order_id]
+        if not tagged:
+            del self._orders_by_tag[order.tag]
+
+    def _mark_terminal(self, order: Order) -> None:
+        """Queue a FILLED or CANCELLED order for retention-based eviction.
+
+        Args:
+            order: Order that just reached a terminal status.
+        """
+        self._terminal_orders.append((self._clock, order.order_id))
+
+    def _evict_terminal_orders(self) -> None:
+        """Drop terminal orders that fall outside the retention policy."""
+        policy = self.retention
+        terminal = self._terminal_orders
+        max_orders = policy.max_terminal_orders
+        ttl = policy.terminal_order_ttl
+        cutoff = None if ttl is None else self._clock - ttl
+
+        while terminal:
+            marked_at, order_id = terminal[0]
+            over_count = max_orders is not None and len(terminal) > max_orders
+            expired = cutoff is not None and marked_at <= cutoff
+            if not (over_count or expired):
+                break
+            terminal.popleft()
+            order = self._orders.pop(order_id)
+            if policy.on_order_evicted is not None:
+                policy.on_order_evicted(order)
 
     def _get_order(self, order_id: int) -> Order:
         """Get order by ID or raise.
@@ -625,81 +2381,39 @@ class OrderBook:
             raise OrderNotFoundError(f"Order {order_id} not found")
         return self._orders[order_id]
 
-    def _validate_cancellable(self, order: Order) -> None:
-        """Validate that an order can be cancelled.
+    def _validate_cancellable(
+        self, order: Order, action: str = "cancel"
+    ) -> None:
+        """Validate that an order can be cancelled (or otherwise amended).
 
         Args:
             order: Order to check.
+            action: Verb used in the error message.
 
         Raises:
             OrderValidationError: If order cannot be cancelled.
         """
         if order.status in (OrderStatus.FILLED, OrderStatus.CANCELLED):
             raise OrderValidationError(
-                f"Cannot cancel order {order.order_id}: status={order.status.value}"
+                f"Cannot {action} order {order.order_id}: "
+                f"status={order.status.value}"
             )
 
-    def _active_bid_prices(self) -> List[float]:
-        """Return bid prices with active orders.
-
-        Returns:
-            List of prices with non-empty order lists.
-        """
-        return [p for p, orders in self._bids.items() if orders]
-
-    def _active_ask_prices(self) -> List[float]:
-        """Return ask prices with active orders.
-
-        Returns:
-            List of prices with non-empty order lists.
-        """
-        return [p for p, orders in self._asks.items() if orders]
-
     def _aggregate_side(
         self,
-        side: Dict[float, List[Order]],
-        reverse: bool,
+        side: _AnyBookSide,
+        limit: Optional[int] = None,
     ) -> List[BookLevel]:
         """Aggregate orders by price level.
 
         Args:
             side: Book side (bids or asks).
-            reverse: Sort descending if True.
-
-        Returns:
-            Aggregated BookLevel list, sorted by price.
-        """
-        levels: List[BookLevel] = []
-        for price, orders in side.items():
-            active = [o for o in orders if o.remaining > 0]
-            if active:
-                total_qty = sum(o.remaining for o in active)
-                levels.append(BookLevel(price, total_qty, len(active)))
-
-        levels.sort(key=lambda lvl: lvl.price, reverse=reverse)
-        return levels
-
-    def _get_opposing_levels(self, side: Side) -> List[BookLevel]:
-        """Get the opposing side's price levels for VWAP calculation.
-
-        Args:
-            side: The aggressor's side (BUY sweeps asks, SELL sweeps bids).
+            limit: Maximum number of levels to return, or None for all.
 
         Returns:
-            Sorted BookLevel list of the opposing side.
-        """
-        if side == Side.BUY:
-            return self._aggregate_side(self._asks, reverse=False)
-        return self._aggregate_side(self._bids, reverse=True)
-
-    def _cleanup_empty_levels(
-        self, side: Dict[float, List[Order]]
-    ) -> None:
-        """Remove price levels with no remaining orders.
-
-        Args:
-            side: Book side to clean.
+            Aggregated BookLevel list, sorted by price priority.
         """
-        empty_prices = [p for p, orders in side.items() if not orders]
-        for price in empty_prices:
-            del side[price]
+        return [
+            BookLevel(self._ticks_to_price(ticks), quantity, order_count)
+            for ticks, quantity, order_count in side.depth(limit)
+        ]
@@ -0,0 +1,422 @@
+"""Event-sourced replay of historical order flow.
+
+A ``ReplayEngine`` consumes a stream of typed order events from any
+iterable (a list, a generator reading a file, a network feed) and applies
+them to an ``OrderBook`` one at a time, yielding an update per event. The
+stream is never materialized, so memory use is independent of its length;
+only a bounded reorder window and the map of live external order IDs are
+held.
+
+Historical feeds carry their own order IDs. The engine maps them onto the
+book's IDs for as long as the order rests and forgets them once it is
+filled or cancelled. Pair the book with a ``RetentionPolicy`` to bound its
+own order and trade history as well.
+"""
+
+import heapq
+import logging
+from itertools import count
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .orderbook import (
+    Order,
+    OrderBook,
+    OrderNotFoundError,
+    OrderStatus,
+    OrderType,
+    OrderValidationError,
+    Side,
+    Trade,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AddOrder(NamedTuple):
+    """A new limit (or IOC) order.
+
+    Attributes:
+        timestamp: Event time.
+        order_id: Feed-assigned order ID.
+        side: BUY or SELL.
+        price: Limit price.
+        quantity: Number of units.
+        order_type: LIMIT or IOC.
+    """
+
+    timestamp: float
+    order_id: int
+    side: Side
+    price: float
+    quantity: int
+    order_type: OrderType = OrderType.LIMIT
+
+
+class MarketOrder(NamedTuple):
+    """A market order, which never rests on the book.
+
+    Attributes:
+        timestamp: Event time.
+        side: BUY or SELL.
+        quantity: Number of units.
+    """
+
+    timestamp: float
+    side: Side
+    quantity: int
+
+
+class CancelOrder(NamedTuple):
+    """Full or partial cancellation of a resting order.
+
+    A partial cancel keeps the order's time priority.
+
+    Attributes:
+        timestamp: Event time.
+        order_id: Feed-assigned order ID.
+        quantity: Quantity to cancel, or None to cancel the whole order.
+    """
+
+    timestamp: float
+    order_id: int
+    quantity: Optional[int] = None
+
+
+class ModifyOrder(NamedTuple):
+    """Amendment of a resting order's price and/or total quantity.
+
+    Attributes:
+        timestamp: Event time.
+        order_id: Feed-assigned order ID.
+        new_price: New limit price, or None to keep it.
+        new_qty: New total quantity, or None to keep it.
+    """
+
+    timestamp: float
+    order_id: int
+    new_price: Optional[float] = None
+    new_qty: Optional[int] = None
+
+
+class ExecuteOrder(NamedTuple):
+    """Execution of a resting order against an unseen counterparty.
+
+    Attributes:
+        timestamp: Event time.
+        order_id: Feed-assigned order ID.
+        quantity: Executed quantity.
+        price: Execution price, or None for the order's limit price.
+    """
+
+    timestamp: float
+    order_id: int
+    quantity: int
+    price: Optional[float] = None
+
+
+ReplayEvent = Union[AddOrder, MarketOrder, CancelOrder, ModifyOrder, ExecuteOrder]
+
+
+class BookUpdate(NamedTuple):
+    """State change produced by applying one event.
+
+    Attributes:
+        event: The event that was applied.
+        order: The book order created or touched by the event.
+        trades: Trades generated by the event.
+        best_bid: Best bid after the event, or None if empty.
+        best_ask: Best ask after the event, or None if empty.
+    """
+
+    event: ReplayEvent
+    order: Order
+    trades: List[Trade]
+    best_bid: Optional[float]
+    best_ask: Optional[float]
+
+
+class ReplayEngine:
+    """Applies a stream of historical order events to an order book.
+
+    Events are expected in timestamp order. Feeds with small amounts of
+    jitter can be replayed with a ``reorder_window``: events are buffered
+    in a heap of that many entries and released oldest first.
+
+    Attributes:
+        book: The book being driven.
+        strict: Whether invalid events raise. If False they are logged,
+            counted in ``skipped`` and dropped.
+        skipped: Number of events dropped in non-strict mode.
+        events_applied: Number of events applied so far.
+    """
+
+    def __init__(
+        self,
+        book: Optional[OrderBook] = None,
+        reorder_window: int = 0,
+        strict: bool = True,
+    ) -> None:
+        """Initialize the replay engine.
+
+        Args:
+            book: Book to replay into. A fresh ``OrderBook`` if None.
+            reorder_window: Number of events buffered to restore timestamp
+                order. 0 applies events as they arrive.
+            strict: Raise on invalid events instead of skipping them.
+
+        Raises:
+            ValueError: If reorder_window is negative.
+        """
+        if reorder_window < 0:
+            raise ValueError(f"reorder_window must be >= 0, got {reorder_window}")
+        self.book = book if book is not None else OrderBook()
+        self.strict = strict
+        self.skipped = 0
+        self.events_applied = 0
+        self._reorder_window = reorder_window
+        self._last_timestamp = float("-inf")
+
+        # Live orders by feed ID, and feed ID by book order ID
+        self._live: Dict[int, Order] = {}
+        self._feed_ids: Dict[int, int] = {}
+
+    def replay(self, events: Iterable[ReplayEvent]) -> Iterator[BookUpdate]:
+        """Lazily apply events, yielding one update per applied event.
+
+        Args:
+            events: Iterable of event records.
+
+        Yields:
+            A BookUpdate for each event applied.
+
+        Raises:
+            ValueError: If an event is older than one already applied,
+                even after reordering.
+            OrderNotFoundError: In strict mode, if an event references an
+                unknown feed order ID.
+            OrderValidationError: In strict mode, if the book rejects an
+                event.
+        """
+        for event in self._ordered(events):
+            update = self.try_apply(event)
+            if update is not None:
+                yield update
+
+    def run(self, events: Iterable[ReplayEvent]) -> int:
+        """Apply every event, discarding the updates.
+
+        Args:
+            events: Iterable of event records.
+
+        Returns:
+            Number of events applied.
+        """
+        applied = 0
+        for _ in self.replay(events):
+            applied += 1
+        return applied
+
+    def apply(self, event: ReplayEvent) -> BookUpdate:
+        """Apply a single event immediately.
+
+        Args:
+            event: Event record.
+
+        Returns:
+            The resulting book update.
+
+        Raises:
+            ValueError: If the event is older than one already applied.
+            OrderNotFoundError: If the event references an unknown feed
+                order ID.
+            OrderValidationError: If the book rejects the event.
+        """
+        if event.timestamp < self._last_timestamp:
+            raise ValueError(
+                f"Event at t={event.timestamp} is older than the last applied "
+                f"event at t={self._last_timestamp}"
+            )
+
+        if isinstance(event, AddOrder):
+            order, trades = self._apply_add(event)
+        elif isinstance(event, MarketOrder):
+            order, trades = self.book.submit_order(
+                event.side, 0.0, event.quantity, OrderType.MARKET,
+                event.timestamp,
+            )
+        elif isinstance(event, CancelOrder):
+            order = self._apply_cancel(event)
+            trades = []
+        elif isinstance(event, ModifyOrder):
+            order, trades = self.book.modify_order(
+                self._book_id(event.order_id), event.new_price, event.new_qty,
+                event.timestamp,
+            )
+        elif isinstance(event, ExecuteOrder):
+            trade = self.book.execute_order(
+                self._book_id(event.order_id), event.quantity, event.price,
+                event.timestamp,
+            )
+            order = self._live[event.order_id]
+            trades = [trade]
+        else:
+            raise TypeError(f"Unsupported event type {type(event).__name__}")
+
+        self._last_timestamp = event.timestamp
+        self.events_applied += 1
+        self._forget_closed(order, trades)
+        return BookUpdate(
+            event, order, trades, self.book.best_bid(), self.book.best_ask()
+        )
+
+    def _ordered(self, events: Iterable[ReplayEvent]) -> Iterator[ReplayEvent]:
+        """Release events in timestamp order through the reorder window.
+
+        Args:
+            events: Iterable of event records.
+
+        Yields:
+            Events, oldest first within the window.
+        """
+        if self._reorder_window == 0:
+            yield from events
+            return
+
+        # Arrival counter keeps ties in feed order
+        heap: List[Tuple[float, int, ReplayEvent]] = []
+        arrival = count()
+        for event in events:
+            heapq.heappush(heap, (event.timestamp, next(arrival), event))
+            if len(heap) > self._reorder_window:
+                yield heapq.heappop(heap)[2]
+        while heap:
+            yield heapq.heappop(heap)[2]
+
+    def try_apply(self, event: ReplayEvent) -> Optional[BookUpdate]:
+        """Apply a single event immediately, honouring non-strict mode.
+
+        Like ``apply``, but when the engine is not strict an event the book
+        rejects or that references an unknown feed order ID is logged,
+        counted in ``skipped`` and dropped.
+
+        Args:
+            event: Event record.
+
+        Returns:
+            The book update, or None if the event was skipped.
+
+        Raises:
+            ValueError: If the event is older than one already applied.
+            OrderNotFoundError: In strict mode, if the event references an
+                unknown feed order ID.
+            OrderValidationError: In strict mode, if the book rejects the
+                event.
+        """
+        if self.strict:
+            return self.apply(event)
+        try:
+            return self.apply(event)
+        except (OrderNotFoundError, OrderValidationError) as exc:
+            self.skipped += 1
+            logger.debug("Skipped %r: %s", event, exc)
+            return None
+
+    def _apply_add(self, event: AddOrder) -> Tuple[Order, List[Trade]]:
+        """Submit a feed order and register its ID while it rests.
+
+        Args:
+            event: Add event.
+
+        Returns:
+            Tuple of (book_order, trades).
+
+        Raises:
+            OrderValidationError: If the feed ID is already live or the
+                book rejects the order.
+        """
+        if event.order_id in self._live:
+            raise OrderValidationError(
+                f"Feed order {event.order_id} is already live"
+            )
+        order, trades = self.book.submit_order(
+            event.side, event.price, event.quantity, event.order_type,
+            event.timestamp,
+        )
+        self._live[event.order_id] = order
+        self._feed_ids[order.order_id] = event.order_id
+        return order, trades
+
+    def _apply_cancel(self, event: CancelOrder) -> Order:
+        """Cancel a feed order in full, or reduce it in place.
+
+        Args:
+            event: Cancel event.
+
+        Returns:
+            The cancelled or reduced book order.
+        """
+        order_id = self._book_id(event.order_id)
+        order = self._live[event.order_id]
+        if event.quantity is None or event.quantity >= order.remaining:
+            return self.book.cancel_order(order_id)
+        if event.quantity <= 0:
+            raise OrderValidationError(
+                f"Cancel quantity must be positive, got {event.quantity}"
+            )
+        order, _ = self.book.modify_order(
+            order_id, new_qty=order.quantity - event.quantity
+        )
+        return order
+
+    def _book_id(self, feed_id: int) -> int:
+        """Translate a feed order ID into the book's order ID.
+
+        Args:
+            feed_id: Feed-assigned order ID.
+
+        Returns:
+            Book order ID.
+
+        Raises:
+            OrderNotFoundError: If no live order has that feed ID.
+        """
+        try:
+            return self._live[feed_id].order_id
+        except KeyError:
+            raise OrderNotFoundError(
+                f"Feed order {feed_id} is not live"
+            ) from None
+
+    def _forget_closed(self, order: Order, trades: List[Trade]) -> None:
+        """Drop ID mappings of orders that no longer rest on the book.
+
+        Args:
+            order: The order created or touched by the event.
+            trades: Trades the event generated.
+        """
+        live_ids = self._feed_ids
+        if not live_ids:
+            return
+        touched = [order.order_id]
+        for trade in trades:
+            touched.append(trade.buy_order_id)
+            touched.append(trade.sell_order_id)
+        for book_id in touched:
+            feed_id = live_ids.get(book_id)
+            if feed_id is None:
+                continue
+            live = self._live[feed_id]
+            if live.status in (OrderStatus.FILLED, OrderStatus.CANCELLED) or (
+                live.order_type is not OrderType.LIMIT
+            ):
+                del self._live[feed_id]
+                del live_ids[book_id]
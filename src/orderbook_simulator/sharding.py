@@ -0,0 +1,377 @@
+"""Process-sharded multi-symbol matching.
+
+Matching for different symbols is independent, so symbols are partitioned
+across a pool of worker processes, each owning an ``Exchange`` for its
+share of the universe. Events are routed to workers in batches over pipes;
+workers match their batches in parallel and the resulting trades are
+merged back in timestamp order.
+
+Events are plain tuples, which pickle cheaply:
+
+- ``("submit", symbol, side, price, quantity[, order_type[, timestamp[, tag]]])``
+- ``("cancel", symbol, order_id)``
+- ``("modify", symbol, order_id, new_price, new_qty[, timestamp])``
+"""
+
+import heapq
+import logging
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .exchange import TOP_OF_BOOK_DTYPE, Exchange, UnknownSymbolError
+from .orderbook import (
+    DEFAULT_TICK_SIZE,
+    IdSequence,
+    Trade,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# Wire format of a trade sent back by a worker:
+# (timestamp, trade_id, symbol, buy_order_id, sell_order_id, price, quantity)
+_TradeRow = Tuple[float, int, str, int, int, float, int]
+
+# Allowed tuple lengths per event kind, including kind and symbol
+_EVENT_ARITY = {"submit": (5, 8), "cancel": (3, 3), "modify": (5, 6)}
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one batch of events processed by a ShardedExchange.
+
+    Attributes:
+        order_ids: Per input event, the ID of the order it created or
+            touched, or None if the event failed.
+        errors: Input event index -> exception raised while applying it.
+        trades: (symbol, trade) pairs from all shards, in timestamp order.
+    """
+
+    order_ids: List[Optional[int]]
+    errors: Dict[int, Exception] = field(default_factory=dict)
+    trades: List[Tuple[str, Trade]] = field(default_factory=list)
+
+
+def _apply_event(
+    exchange: Exchange, event: Sequence[Any], trades: List[_TradeRow]
+) -> int:
+    """Apply one event tuple to a worker's exchange.
+
+    Args:
+        exchange: The worker's exchange.
+        event: Event tuple (see module docstring).
+        trades: Output list receiving wire-format trade rows.
+
+    Returns:
+        ID of the order created or touched by the event.
+
+    Raises:
+        ValueError: If the event kind is unknown.
+    """
+    kind, symbol = event[0], event[1]
+    if kind == "submit":
+        order, fills = exchange.submit_order(symbol, *event[2:])
+    elif kind == "cancel":
+        return exchange.cancel_order(symbol, event[2]).order_id
+    elif kind == "modify":
+        order, fills = exchange.modify_order(symbol, *event[2:])
+    else:
+        raise ValueError(f"Unknown event kind {kind!r}")
+
+    for trade in fills:
+        trades.append((
+            trade.timestamp, trade.trade_id, symbol, trade.buy_order_id,
+            trade.sell_order_id, trade.price, trade.quantity,
+        ))
+    return order.order_id
+
+
+def _shard_worker(
+    conn: Connection,
+    symbols: List[str],
+    tick_size: float,
+    shard_index: int,
+    shard_count: int,
+    book_kwargs: Dict[str, Any],
+) -> None:
+    """Worker process loop: apply event batches until a None sentinel.
+
+    Order and trade IDs are strided by shard so they stay unique across
+    the whole sharded exchange.
+
+    Args:
+        conn: Pipe end shared with the parent.
+        symbols: Symbols owned by this worker.
+        tick_size: Tick size for every book.
+        shard_index: Index of this worker.
+        shard_count: Total number of workers.
+        book_kwargs: Extra ``OrderBook`` arguments.
+    """
+    exchange = Exchange(
+        symbols,
+        tick_size,
+        order_ids=IdSequence(shard_index + 1, shard_count),
+        trade_ids=IdSequence(shard_index + 1, shard_count),
+        **book_kwargs,
+    )
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        results: List[Any] = []
+        trades: List[_TradeRow] = []
+        for event in batch:
+            # Any failure is reported against its event so the worker
+            # always answers the batch
+            try:
+                results.append(_apply_event(exchange, event, trades))
+            except Exception as exc:  # noqa: BLE001
+                results.append(exc)
+        conn.send((results, trades, exchange.top_of_book()))
+    conn.close()
+
+
+def _check_event(index: int, event: Sequence[Any]) -> None:
+    """Reject event tuples that cannot be routed or applied.
+
+    Args:
+        index: Position of the event in its batch.
+        event: Event tuple (see module docstring).
+
+    Raises:
+        ValueError: If the event is not a tuple of a known kind and length.
+    """
+    if not isinstance(event, (tuple, list)) or len(event) < 2:
+        raise ValueError(f"Event {index} is not an event tuple: {event!r}")
+    arity = _EVENT_ARITY.get(event[0])
+    if arity is None:
+        raise ValueError(f"Event {index} has unknown kind {event[0]!r}")
+    low, high = arity
+    if not low <= len(event) <= high:
+        raise ValueError(
+            f"Event {index} ({event[0]}) needs {low} to {high} fields, "
+            f"got {len(event)}"
+        )
+
+
+class ShardedExchange:
+    """Multi-symbol exchange whose books are spread over worker processes.
+
+    Symbols are assigned to workers round-robin in listing order. Each
+    ``process`` call splits a batch of events by shard, runs the shards
+    concurrently, and merges their trades by (timestamp, trade_id).
+
+    Attributes:
+        symbols: Listed symbols, in row order for ``top_of_book``.
+        workers: Number of worker processes.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        workers: Optional[int] = None,
+        tick_size: float = DEFAULT_TICK_SIZE,
+        start_method: Optional[str] = None,
+        **book_kwargs: Any,
+    ) -> None:
+        """Start the worker pool.
+
+        Args:
+            symbols: Symbols to list.
+            workers: Number of worker processes. Defaults to the CPU count,
+                capped at the number of symbols.
+            tick_size: Tick size for every book.
+            start_method: ``multiprocessing`` start method, or None for the
+                platform default.
+            **book_kwargs: Extra ``OrderBook`` arguments for every book.
+
+        Raises:
+            ValueError: If no symbols are given or workers < 1.
+        """
+        self.symbols = list(symbols)
+        if not self.symbols:
+            raise ValueError("At least one symbol is required")
+        if workers is None:
+            workers = min(os.cpu_count() or 1, len(self.symbols))
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.workers = workers
+
+        self._shard_of = {
+            symbol: index % workers for index, symbol in enumerate(self.symbols)
+        }
+        shard_symbols: List[List[str]] = [[] for _ in range(workers)]
+        for symbol in self.symbols:
+            shard_symbols[self._shard_of[symbol]].append(symbol)
+        # Per shard, the global top-of-book row of each of its symbols
+        row_of = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self._shard_rows = [
+            np.array([row_of[name] for name in names], dtype=np.intp)
+            for names in shard_symbols
+        ]
+
+        self._top = np.zeros(len(self.symbols), dtype=TOP_OF_BOOK_DTYPE)
+        self._top["bid"] = np.nan
+        self._top["ask"] = np.nan
+
+        context = multiprocessing.get_context(start_method)
+        self._conns: List[Connection] = []
+        self._processes: List[Any] = []
+        for index, names in enumerate(shard_symbols):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(  # type: ignore[attr-defined]
+                target=_shard_worker,
+                args=(child_conn, names, tick_size, index, workers, book_kwargs),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self._closed = False
+
+        logger.info(
+            "ShardedExchange started: %d symbols over %d workers",
+            len(self.symbols), workers,
+        )
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def shard_of(self, symbol: str) -> int:
+        """Return the worker index that owns a symbol.
+
+        Args:
+            symbol: Instrument identifier.
+
+        Returns:
+            Worker index.
+
+        Raises:
+            UnknownSymbolError: If the symbol is not listed.
+        """
+        try:
+            return self._shard_of[symbol]
+        except KeyError:
+            raise UnknownSymbolError(f"Symbol {symbol!r} is not listed") from None
+
+    def process(self, events: Iterable[Sequence[Any]]) -> BatchResult:
+        """Apply a batch of events across all shards.
+
+        Events for the same symbol are applied in the order given; shards
+        run concurrently. A failing event is reported in ``errors`` and
+        does not stop the rest of the batch.
+
+        Args:
+            events: Event tuples (see module docstring).
+
+        Returns:
+            Per-event order IDs and errors, plus merged trades.
+
+        Raises:
+            ValueError: If an event tuple is malformed.
+            UnknownSymbolError: If an event names an unlisted symbol. No
+                event in the batch is applied in either case.
+            RuntimeError: If the exchange has been closed, or a worker
+                process failed (the exchange is closed in that case).
+        """
+        if self._closed:
+            raise RuntimeError("ShardedExchange is closed")
+
+        batches: List[List[Sequence[Any]]] = [[] for _ in range(self.workers)]
+        positions: List[List[int]] = [[] for _ in range(self.workers)]
+        count = 0
+        for index, event in enumerate(events):
+            _check_event(index, event)
+            shard = self.shard_of(event[1])
+            batches[shard].append(event)
+            positions[shard].append(index)
+            count = index + 1
+
+        failure: Optional[Tuple[int, BaseException]] = None
+        sent = []
+        for shard in range(self.workers):
+            if not batches[shard]:
+                continue
+            try:
+                self._conns[shard].send(batches[shard])
+            except OSError as exc:
+                if failure is None:
+                    failure = (shard, exc)
+            else:
+                sent.append(shard)
+
+        # Collect every reply before using any, so a failed worker never
+        # leaves other shards' replies queued for the next batch
+        replies = []
+        for shard in sent:
+            try:
+                replies.append((shard, self._conns[shard].recv()))
+            except (EOFError, OSError) as exc:
+                if failure is None:
+                    failure = (shard, exc)
+        if failure is not None:
+            self.close()
+            raise RuntimeError(
+                f"Worker for shard {failure[0]} failed; exchange closed"
+            ) from failure[1]
+
+        order_ids: List[Optional[int]] = [None] * count
+        errors: Dict[int, Exception] = {}
+        shard_trades: List[List[_TradeRow]] = []
+        for shard, (results, trades, top) in replies:
+            for index, result in zip(positions[shard], results):
+                if isinstance(result, Exception):
+                    errors[index] = result
+                else:
+                    order_ids[index] = result
+            shard_trades.append(trades)
+            self._top[self._shard_rows[shard]] = top
+
+        merged = [
+            (row[2], Trade(row[1], row[3], row[4], row[5], row[6], row[0]))
+            for row in heapq.merge(*shard_trades, key=lambda r: (r[0], r[1]))
+        ]
+        return BatchResult(order_ids, errors, merged)
+
+    def top_of_book(self) -> np.ndarray:
+        """Return the BBO of every symbol as of the last processed batch.
+
+        Returns:
+            Structured array of ``TOP_OF_BOOK_DTYPE`` in ``symbols`` order.
+        """
+        return self._top.copy()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        logger.info("ShardedExchange stopped")
@@ -0,0 +1,349 @@
+"""Order book depth in shared memory for other processes.
+
+A ``SharedDepthPublisher`` keeps the top levels of a book, the last trade
+and a few summary fields in one fixed-layout record inside a
+``multiprocessing.shared_memory`` block. Readers in other processes attach
+a ``SharedDepthReader`` by block name and see the record as a NumPy
+structured array over the same memory, with no pickling or copying on the
+writer's side.
+
+Writes are guarded by a seqlock: the writer makes ``sequence`` odd before
+changing the record and even again afterwards. A reader copies the record
+and keeps the copy only if ``sequence`` was even and unchanged across the
+copy, so it never sees a torn update and never blocks the writer. The best
+bid and offer are level 0 of each side.
+"""
+
+import logging
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+from .concurrency import DEFAULT_SNAPSHOT_LEVELS, DepthPublisher, DepthSnapshot
+from .orderbook import BookLevel, OrderAction, OrderBook, OrderUpdate
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# Block signature and layout version written in the header
+SHARED_DEPTH_MAGIC = b"OBSD"
+SHARED_DEPTH_VERSION = 1
+
+# Read attempts before a reader gives up on a writer that never pauses
+DEFAULT_MAX_READ_ATTEMPTS = 100_000
+
+# Fixed header: signature, layout version, levels per side and tick size
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("format", "<u4"),
+    ("levels", "<i8"),
+    ("tick_size", "<f8"),
+    ("reserved", "V8"),
+])
+
+
+class SharedDepthError(ValueError):
+    """Raised when a shared memory block is not a compatible depth block."""
+
+
+def depth_record_dtype(levels: int) -> np.dtype:
+    """Return the record layout for a given depth.
+
+    Empty levels have a NaN price and zero quantity; unset spread, mid and
+    last-trade prices are NaN.
+
+    Args:
+        levels: Price levels per side.
+
+    Returns:
+        Structured dtype of one depth record.
+    """
+    return np.dtype([
+        ("sequence", "<u8"),
+        ("version", "<i8"),
+        ("timestamp", "<f8"),
+        ("bid_levels", "<i8"),
+        ("ask_levels", "<i8"),
+        ("bid_price", "<f8", (levels,)),
+        ("bid_quantity", "<i8", (levels,)),
+        ("bid_orders", "<i8", (levels,)),
+        ("ask_price", "<f8", (levels,)),
+        ("ask_quantity", "<i8", (levels,)),
+        ("ask_orders", "<i8", (levels,)),
+        ("spread", "<f8"),
+        ("midprice", "<f8"),
+        ("trade_count", "<i8"),
+        ("last_price", "<f8"),
+        ("last_quantity", "<i8"),
+        ("last_timestamp", "<f8"),
+    ])
+
+
+def _record_view(buffer: memoryview, levels: int) -> np.ndarray:
+    """Map the depth record of a block.
+
+    Args:
+        buffer: Shared memory buffer.
+        levels: Price levels per side.
+
+    Returns:
+        Zero-dimensional structured array over the record.
+    """
+    return np.ndarray(
+        (), dtype=depth_record_dtype(levels), buffer=buffer,
+        offset=HEADER_DTYPE.itemsize,
+    )
+
+
+class SharedDepthPublisher(DepthPublisher):
+    """Publishes a book's depth into a shared memory block.
+
+    Every snapshot the base ``DepthPublisher`` publishes is also written to
+    the block. The publisher owns the block; ``close`` detaches from the
+    book and unlinks it.
+
+    Attributes:
+        name: Shared memory block name to hand to readers.
+    """
+
+    def __init__(
+        self,
+        book: OrderBook,
+        levels: int = DEFAULT_SNAPSHOT_LEVELS,
+        name: Optional[str] = None,
+    ) -> None:
+        """Create the shared block and publish the book's current depth.
+
+        Args:
+            book: Book to publish.
+            levels: Price levels per side.
+            name: Block name. A unique name is generated if None.
+
+        Raises:
+            ValueError: If levels is not positive.
+            FileExistsError: If a block with that name already exists.
+        """
+        if levels <= 0:
+            raise ValueError(f"levels must be positive, got {levels}")
+        # Price, quantity and time of the latest execution
+        self._last_trade: Optional[Tuple[float, int, float]] = None
+
+        size = HEADER_DTYPE.itemsize + depth_record_dtype(levels).itemsize
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self._shm.name
+
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self._shm.buf)
+        header["magic"] = SHARED_DEPTH_MAGIC
+        header["format"] = SHARED_DEPTH_VERSION
+        header["levels"] = levels
+        header["tick_size"] = book.tick_size
+        self._record = _record_view(self._shm.buf, levels)
+        self._record["sequence"] = 0
+        self._record["trade_count"] = book.trade_count
+        for field in ("last_price", "last_timestamp"):
+            self._record[field] = np.nan
+
+        super().__init__(book, levels)
+        self._write(self._snapshot)
+        book.subscribe_orders(self._on_order)
+        logger.info("Publishing %s depth to shared memory %s", book.symbol,
+                    self.name)
+
+    def publish(self) -> DepthSnapshot:
+        """Publish a fresh snapshot to readers in this and other processes.
+
+        Returns:
+            The new snapshot.
+        """
+        snapshot = super().publish()
+        self._write(snapshot)
+        return snapshot
+
+    def close(self) -> None:
+        """Stop publishing and unlink the shared memory block.
+
+        Readers that are already attached keep their mapping.
+        """
+        if self._subscribed:
+            self.book.unsubscribe_orders(self._on_order)
+            super().close()
+            del self._record
+            self._shm.close()
+            self._shm.unlink()
+
+    def _on_order(self, update: OrderUpdate) -> None:
+        """Record executions as the last trade.
+
+        An execution marks the snapshot stale so the record is rewritten at
+        the end of the operation, even when it filled an order below the
+        published levels.
+
+        Args:
+            update: Order event from the book.
+        """
+        if update.action is OrderAction.EXECUTE:
+            self._last_trade = (update.price, update.quantity, update.timestamp)
+            self._dirty = True
+
+    def _write(self, snapshot: DepthSnapshot) -> None:
+        """Copy a snapshot and the last trade into the block under the seqlock.
+
+        Args:
+            snapshot: Snapshot to write.
+        """
+        record = self._record
+        sequence = int(record["sequence"])
+        record["sequence"] = sequence + 1
+
+        record["version"] = snapshot.version
+        record["timestamp"] = snapshot.timestamp
+        for prefix, levels in (("bid", snapshot.bids), ("ask", snapshot.asks)):
+            count = len(levels)
+            record[f"{prefix}_levels"] = count
+            prices = record[f"{prefix}_price"]
+            quantities = record[f"{prefix}_quantity"]
+            orders = record[f"{prefix}_orders"]
+            prices[count:] = np.nan
+            quantities[count:] = 0
+            orders[count:] = 0
+            if count:
+                prices[:count] = [level.price for level in levels]
+                quantities[:count] = [level.quantity for level in levels]
+                orders[:count] = [level.order_count for level in levels]
+        record["spread"] = np.nan if snapshot.spread is None else snapshot.spread
+        record["midprice"] = (
+            np.nan if snapshot.midprice is None else snapshot.midprice
+        )
+        last_trade = self._last_trade
+        if last_trade is not None:
+            record["trade_count"] = self.book.trade_count
+            (record["last_price"], record["last_quantity"],
+             record["last_timestamp"]) = last_trade
+
+        record["sequence"] = sequence + 2
+
+
+class SharedDepthReader:
+    """Read-only view of a depth block published by another process.
+
+    Attributes:
+        name: Shared memory block name.
+        levels: Price levels per side.
+        tick_size: Tick size of the published book.
+        record: Live zero-copy view of the record. Fields read directly
+            from it may mix two updates; use ``read`` for a consistent copy.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Attach to a published block.
+
+        Args:
+            name: Block name from ``SharedDepthPublisher.name``.
+
+        Raises:
+            FileNotFoundError: If no block has that name.
+            SharedDepthError: If the block is not a compatible depth block.
+        """
+        self.name = name
+        self._shm = _attach(name)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self._shm.buf)
+        if (
+            header["magic"].item() != SHARED_DEPTH_MAGIC
+            or int(header["format"]) != SHARED_DEPTH_VERSION
+        ):
+            self._shm.close()
+            raise SharedDepthError(f"{name} is not an order book depth block")
+        self.levels = int(header["levels"])
+        self.tick_size = float(header["tick_size"])
+        self.record = _record_view(self._shm.buf, self.levels)
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def sequence(self) -> int:
+        """Return the current seqlock value (even when no write is active)."""
+        return int(self.record["sequence"])
+
+    def read(self, max_attempts: int = DEFAULT_MAX_READ_ATTEMPTS) -> np.ndarray:
+        """Take a consistent copy of the record.
+
+        Args:
+            max_attempts: Copies attempted before giving up.
+
+        Returns:
+            Zero-dimensional structured array detached from shared memory.
+
+        Raises:
+            TimeoutError: If every attempt overlapped a write.
+        """
+        record = self.record
+        for _ in range(max_attempts):
+            before = int(record["sequence"])
+            if before & 1:
+                continue
+            copy = record.copy()
+            if int(record["sequence"]) == before:
+                return copy
+        raise TimeoutError(
+            f"No consistent read of {self.name} in {max_attempts} attempts"
+        )
+
+    def snapshot(self) -> DepthSnapshot:
+        """Take a consistent copy of the depth as a DepthSnapshot.
+
+        Returns:
+            Snapshot with the published levels, spread and mid.
+        """
+        record = self.read()
+        sides = []
+        for prefix in ("bid", "ask"):
+            count = int(record[f"{prefix}_levels"])
+            sides.append(tuple(
+                BookLevel(price, quantity, orders)
+                for price, quantity, orders in zip(
+                    record[f"{prefix}_price"][:count].tolist(),
+                    record[f"{prefix}_quantity"][:count].tolist(),
+                    record[f"{prefix}_orders"][:count].tolist(),
+                )
+            ))
+        spread = float(record["spread"])
+        midprice = float(record["midprice"])
+        return DepthSnapshot(
+            int(record["version"]), float(record["timestamp"]),
+            self.tick_size, sides[0], sides[1],
+            None if np.isnan(spread) else spread,
+            None if np.isnan(midprice) else midprice,
+        )
+
+    def close(self) -> None:
+        """Detach from the block. Arrays returned by ``read`` stay valid."""
+        if hasattr(self, "record"):
+            del self.record
+            self._shm.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking ownership of it.
+
+    Before Python 3.13, attaching registers the block with this process's
+    resource tracker, which would unlink it when the reader exits.
+
+    Args:
+        name: Block name.
+
+    Returns:
+        The attached block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
@@ -0,0 +1,279 @@
+"""Order book checkpoints in a columnar binary format.
+
+``save_snapshot`` writes a book's resting orders as parallel NumPy columns
+(in side, level and queue order, so FIFO priority is implicit in the row
+order), together with the ID counters, event clock and optionally the
+retained trade history, into a single uncompressed ``.npz`` archive.
+
+``load_snapshot`` rebuilds a book from those columns in bulk: orders are
+constructed straight from the column lists, chained into their levels and
+indexed without going through ``submit_order`` or the matching engine.
+Terminal orders still held in the book's order index are not saved.
+"""
+
+import gc
+import logging
+import os
+from collections import deque
+from itertools import chain, repeat
+from operator import attrgetter
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+from .orderbook import (
+    _PriceLevel,
+    IdSequence,
+    Order,
+    OrderBook,
+    OrderStatus,
+    OrderType,
+    Side,
+    Trade,
+)
+from .trade_log import TRADE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Format version stored in every snapshot
+SNAPSHOT_VERSION = 1
+
+# Resting order column -> dtype, in archive order. Side, type and status
+# are implied: rows are written bids first, only LIMIT orders rest, and a
+# resting order is PARTIALLY_FILLED exactly when remaining < quantity.
+ORDER_COLUMNS: Dict[str, type] = {
+    "order_id": np.int64,
+    "price_ticks": np.int64,
+    "quantity": np.int64,
+    "remaining": np.int64,
+    "timestamp": np.float64,
+}
+
+# Object array mapping a partially-filled flag to the order status
+_STATUSES = np.array(
+    [OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED], dtype=object
+)
+
+PathLike = Union[str, os.PathLike]
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is malformed or of another version."""
+
+
+def save_snapshot(
+    book: OrderBook, path: PathLike, include_trades: bool = False
+) -> None:
+    """Write a checkpoint of a book's resting state.
+
+    Args:
+        book: Book to checkpoint.
+        path: Destination file. NumPy appends ``.npz`` if missing.
+        include_trades: Also save the retained trade history.
+    """
+    resting: List[Order] = []
+    for level in book._bids.iter_levels():
+        resting.extend(level)
+    bid_count = len(resting)
+    for level in book._asks.iter_levels():
+        resting.extend(level)
+
+    arrays: Dict[str, Any] = {
+        f"orders.{name}": np.fromiter(
+            map(attrgetter(name), resting), dtype=dtype, count=len(resting)
+        )
+        for name, dtype in ORDER_COLUMNS.items()
+    }
+
+    tagged = [(row, o.tag) for row, o in enumerate(resting) if o.tag is not None]
+    arrays["tags.row"] = np.array([row for row, _ in tagged], dtype=np.int64)
+    arrays["tags.tag"] = np.array([tag for _, tag in tagged], dtype=np.str_)
+
+    if include_trades:
+        trades = book.trades
+        for name, dtype in TRADE_COLUMNS.items():
+            arrays[f"trades.{name}"] = np.fromiter(
+                (getattr(trade, name) for trade in trades),
+                dtype=dtype, count=len(trades),
+            )
+
+    arrays["meta.version"] = np.int64(SNAPSHOT_VERSION)
+    arrays["meta.symbol"] = np.str_(book.symbol)
+    arrays["meta.tick_size"] = np.float64(book.tick_size)
+    arrays["meta.clock"] = np.float64(book._clock)
+    arrays["meta.bid_count"] = np.int64(bid_count)
+    arrays["meta.ids"] = np.array([
+        book._order_ids.next_id, book._order_ids.step,
+        book._trade_ids.next_id, book._trade_ids.step,
+        book._trade_total,
+    ], dtype=np.int64)
+
+    np.savez(path, **arrays)
+    logger.info(
+        "Saved snapshot of %s: %d resting orders to %s",
+        book.symbol, len(resting), path,
+    )
+
+
+def load_snapshot(path: PathLike, **book_kwargs: Any) -> OrderBook:
+    """Rebuild a book from a checkpoint.
+
+    Args:
+        path: Snapshot file written by ``save_snapshot``.
+        **book_kwargs: Extra ``OrderBook`` arguments (e.g. ``backend`` or
+            ``retention``). Shared ID sequences passed here are advanced
+            past the snapshot's counters.
+
+    Returns:
+        A book with the same resting orders, queue priority, ID counters
+        and (if saved) trade history.
+
+    Raises:
+        SnapshotError: If the file is not a compatible snapshot.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        data = {name: archive[name] for name in archive.files}
+
+    if "meta.version" not in data:
+        raise SnapshotError(f"{path} is not an order book snapshot")
+    if int(data["meta.version"]) != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot version {int(data['meta.version'])}"
+        )
+
+    next_order, order_step, next_trade, trade_step, trade_total = (
+        data["meta.ids"].tolist()
+    )
+    order_ids = book_kwargs.pop("order_ids", None) or IdSequence(step=order_step)
+    trade_ids = book_kwargs.pop("trade_ids", None) or IdSequence(step=trade_step)
+    order_ids.next_id = max(order_ids.next_id, next_order)
+    trade_ids.next_id = max(trade_ids.next_id, next_trade)
+
+    book = OrderBook(
+        symbol=str(data["meta.symbol"]),
+        tick_size=float(data["meta.tick_size"]),
+        order_ids=order_ids,
+        trade_ids=trade_ids,
+        **book_kwargs,
+    )
+    book._clock = float(data["meta.clock"])
+    book._trade_total = trade_total
+
+    # Bulk allocation of many small objects would otherwise trigger
+    # repeated full collections
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        _restore_orders(book, data)
+        if "trades.trade_id" in data:
+            _restore_trades(book, data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    logger.info(
+        "Loaded snapshot of %s: %d resting orders", book.symbol,
+        book.order_count,
+    )
+    return book
+
+
+def _restore_orders(book: OrderBook, data: Dict[str, np.ndarray]) -> None:
+    """Recreate resting orders and their price levels.
+
+    Args:
+        book: Empty book to populate.
+        data: Snapshot arrays.
+    """
+    ticks = data["orders.price_ticks"]
+    count = len(ticks)
+    if count == 0:
+        return
+    bid_count = int(data["meta.bid_count"])
+    quantity = data["orders.quantity"]
+    remaining = data["orders.remaining"]
+
+    ticks_list = ticks.tolist()
+
+    # Rows are grouped by level; find each level's [start, end) slice
+    new_level = np.empty(count, dtype=bool)
+    new_level[0] = True
+    new_level[1:] = ticks[1:] != ticks[:-1]
+    if 0 < bid_count < count:
+        new_level[bid_count] = True
+    starts = np.flatnonzero(new_level)
+    ends = np.append(starts[1:], count)
+    bounds = list(zip(starts.tolist(), ends.tolist()))
+    counts = (ends - starts).tolist()
+    level_qty = np.add.reduceat(remaining, starts).tolist()
+
+    level_prices = np.round(
+        ticks[starts] * book.tick_size, book._price_decimals
+    ).tolist()
+    prices = chain.from_iterable(map(repeat, level_prices, counts))
+    tags: List[Any] = [None] * count
+    for row, tag in zip(data["tags.row"].tolist(), data["tags.tag"].tolist()):
+        tags[row] = tag
+
+    order_ids = data["orders.order_id"].tolist()
+    orders = list(map(
+        Order,
+        order_ids,
+        chain(repeat(Side.BUY, bid_count), repeat(Side.SELL, count - bid_count)),
+        prices,
+        quantity.tolist(),
+        remaining.tolist(),
+        repeat(OrderType.LIMIT),
+        data["orders.timestamp"].tolist(),
+        _STATUSES[(remaining < quantity).view(np.int8)].tolist(),
+        ticks_list,
+        tags,
+    ))
+
+    # Levels arrive best first per side, so each side is loaded in bulk
+    # rather than inserted one price at a time
+    levels = [_PriceLevel(ticks_list[start]) for start, _ in bounds]
+    heads = [orders[start] for start, _ in bounds]
+    tails = [orders[end - 1] for _, end in bounds]
+    deque(map(setattr, levels, repeat("head"), heads), maxlen=0)
+    deque(map(setattr, levels, repeat("tail"), tails), maxlen=0)
+    deque(map(setattr, levels, repeat("quantity"), level_qty), maxlen=0)
+    deque(map(setattr, levels, repeat("order_count"), counts), maxlen=0)
+    bid_levels = int(np.searchsorted(starts, bid_count))
+    book._bids.load_levels(levels[:bid_levels])
+    book._asks.load_levels(levels[bid_levels:])
+
+    # Chain each level's queue through the intrusive links
+    prevs: List[Any] = [None]
+    prevs.extend(orders[:-1])
+    nexts: List[Any] = orders[1:]
+    nexts.append(None)
+    for start, end in bounds:
+        prevs[start] = None
+        nexts[end - 1] = None
+    owners = chain.from_iterable(map(repeat, levels, counts))
+    deque(map(setattr, orders, repeat("_prev"), prevs), maxlen=0)
+    deque(map(setattr, orders, repeat("_next"), nexts), maxlen=0)
+    deque(map(setattr, orders, repeat("_level"), owners), maxlen=0)
+
+    book._orders.update(zip(order_ids, orders))
+    book._open_order_count = count
+    for row in data["tags.row"].tolist():
+        order = orders[row]
+        book._orders_by_tag.setdefault(order.tag, {})[order.order_id] = order
+    book._refresh_best(Side.BUY)
+    book._refresh_best(Side.SELL)
+
+
+def _restore_trades(book: OrderBook, data: Dict[str, np.ndarray]) -> None:
+    """Recreate the retained trade history.
+
+    Args:
+        book: Book to populate.
+        data: Snapshot arrays.
+    """
+    columns = [data[f"trades.{name}"] for name in TRADE_COLUMNS]
+    book._trades.extend(map(Trade, *(column.tolist() for column in columns)))
+    if book.trade_log is not None:
+        for row in zip(*(column.tolist() for column in columns)):
+            book.trade_log.append(*row)
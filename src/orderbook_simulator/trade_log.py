@@ -0,0 +1,131 @@
+"""Columnar trade log backed by growable NumPy arrays.
+
+Stores executed trades as parallel typed columns instead of per-trade
+objects, so a session's trade history can be handed to NumPy or pandas
+without materializing ``Trade`` instances.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# Initial number of rows allocated per column
+DEFAULT_CAPACITY = 1024
+
+# Column name -> dtype, in export order
+TRADE_COLUMNS: Dict[str, type] = {
+    "trade_id": np.int64,
+    "buy_order_id": np.int64,
+    "sell_order_id": np.int64,
+    "price": np.float64,
+    "quantity": np.int64,
+    "timestamp": np.float64,
+}
+
+
+class TradeLog:
+    """Append-only columnar store of executed trades.
+
+    Columns grow by doubling, so appends are amortized O(1). Exported
+    arrays are views over the filled prefix and are not copied.
+
+    Attributes:
+        capacity: Number of rows currently allocated.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize an empty trade log.
+
+        Args:
+            capacity: Initial number of rows to allocate.
+
+        Raises:
+            ValueError: If capacity <= 0.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, dtype in TRADE_COLUMNS.items()
+        }
+        self._bind_columns()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(
+        self,
+        trade_id: int,
+        buy_order_id: int,
+        sell_order_id: int,
+        price: float,
+        quantity: int,
+        timestamp: float,
+    ) -> None:
+        """Append one trade row.
+
+        Args:
+            trade_id: Trade identifier.
+            buy_order_id: ID of the buying order.
+            sell_order_id: ID of the selling order.
+            price: Execution price.
+            quantity: Traded quantity.
+            timestamp: Trade execution time.
+        """
+        row = self._size
+        if row == self.capacity:
+            self._grow()
+        self._trade_id[row] = trade_id
+        self._buy_id[row] = buy_order_id
+        self._sell_id[row] = sell_order_id
+        self._price[row] = price
+        self._quantity[row] = quantity
+        self._timestamp[row] = timestamp
+        self._size = row + 1
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Return read-only views of every column.
+
+        Returns:
+            Column name -> array of length ``len(self)``. Each view is a
+            snapshot of the rows logged so far: it never shows later
+            appends, and once the log grows it keeps pointing at the old
+            buffer, whose rows are unchanged.
+        """
+        arrays = {}
+        for name, column in self._columns.items():
+            view = column[:self._size]
+            view.flags.writeable = False
+            arrays[name] = view
+        return arrays
+
+    def to_frame(self):  # type: ignore[no-untyped-def]
+        """Return the log as a pandas DataFrame.
+
+        Returns:
+            DataFrame with one row per trade, indexed by position.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.to_arrays(), copy=False)
+
+    def _grow(self) -> None:
+        """Double the allocated capacity of every column."""
+        self.capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(self.capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._bind_columns()
+
+    def _bind_columns(self) -> None:
+        """Cache column references used by the append hot path."""
+        self._trade_id = self._columns["trade_id"]
+        self._buy_id = self._columns["buy_order_id"]
+        self._sell_id = self._columns["sell_order_id"]
+        self._price = self._columns["price"]
+        self._quantity = self._columns["quantity"]
+        self._timestamp = self._columns["timestamp"]
@@ -0,0 +1,106 @@
+"""Tests for lock-free depth snapshots."""
+
+import random
+import threading
+
+import pytest
+
+from orderbook_simulator.concurrency import DepthPublisher
+from orderbook_simulator.orderbook import OrderBook, Side
+
+
+@pytest.fixture
+def book() -> OrderBook:
+    """Create a book with two levels per side."""
+    book = OrderBook(symbol="CONC", tick_size=0.01)
+    book.submit_order(Side.BUY, 99.0, 10, timestamp=1.0)
+    book.submit_order(Side.BUY, 98.0, 20, timestamp=2.0)
+    book.submit_order(Side.SELL, 101.0, 5, timestamp=3.0)
+    book.submit_order(Side.SELL, 102.0, 15, timestamp=4.0)
+    return book
+
+
+class TestDepthPublisher:
+    """Tests for DepthPublisher and DepthSnapshot."""
+
+    def test_snapshot_mirrors_book_queries(self, book: OrderBook) -> None:
+        """Snapshot queries match the book at publication time."""
+        snapshot = DepthPublisher(book, levels=5).snapshot
+
+        assert snapshot.get_book_depth() == book.get_book_depth()
+        assert snapshot.best_bid() == book.best_bid()
+        assert snapshot.best_ask() == book.best_ask()
+        assert snapshot.get_spread() == book.get_spread()
+        assert snapshot.get_midprice() == book.get_midprice()
+        for side in (Side.BUY, Side.SELL):
+            for quantity in (1, 12, 20, 21):
+                assert snapshot.get_vwap(side, quantity) == book.get_vwap(
+                    side, quantity
+                )
+
+    def test_snapshots_are_immutable_and_versioned(self, book: OrderBook) -> None:
+        """Writes publish a new snapshot and leave old ones untouched."""
+        publisher = DepthPublisher(book)
+        before = publisher.snapshot
+        book.submit_order(Side.BUY, 101.0, 3, timestamp=5.0)
+        after = publisher.snapshot
+
+        assert before.asks[0].quantity == 5
+        assert after.asks[0].quantity == 2
+        assert (before.version, after.version) == (0, 1)
+        assert after.timestamp == 5.0
+        with pytest.raises(AttributeError):
+            after.version = 7  # type: ignore[misc]
+
+    def test_changes_below_depth_do_not_republish(self, book: OrderBook) -> None:
+        """Activity deeper than the published levels keeps the snapshot."""
+        publisher = DepthPublisher(book, levels=1)
+        book.submit_order(Side.BUY, 97.0, 1)
+        book.submit_order(Side.SELL, 103.0, 1)
+        assert publisher.snapshot.version == 0
+
+        book.submit_order(Side.BUY, 99.0, 1)
+        assert publisher.snapshot.version == 1
+        assert publisher.snapshot.bids[0].quantity == 11
+
+        publisher.close()
+        book.submit_order(Side.BUY, 99.5, 1)
+        assert publisher.snapshot.version == 1
+
+    def test_readers_never_see_a_crossed_book(self) -> None:
+        """Reader threads see consistent, monotonically versioned depth."""
+        book = OrderBook(tick_size=0.01)
+        publisher = DepthPublisher(book, levels=5)
+        done = threading.Event()
+        problems: list = []
+
+        def reader() -> None:
+            last = -1
+            while not done.is_set():
+                snapshot = publisher.snapshot
+                if snapshot.version < last:
+                    problems.append("version went backwards")
+                last = snapshot.version
+                bid, ask = snapshot.best_bid(), snapshot.best_ask()
+                if bid is not None and ask is not None and bid >= ask:
+                    problems.append(f"crossed {bid} >= {ask}")
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+        rng = random.Random(5)
+        for _ in range(2_000):
+            side = Side.BUY if rng.random() < 0.5 else Side.SELL
+            book.submit_order(side, round(100 + rng.randint(-20, 20) * 0.01, 2),
+                              rng.randint(1, 10))
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        assert problems == []
+        assert publisher.snapshot.get_book_depth(5) == book.get_book_depth(5)
+
+    def test_invalid_levels(self, book: OrderBook) -> None:
+        """Snapshot depth must be positive."""
+        with pytest.raises(ValueError, match="levels"):
+            DepthPublisher(book, levels=0)
@@ -1,21 +1,33 @@
 """Tests for the limit order book simulator and matching engine."""
 
+import copy
+import dataclasses
+import math
+import pickle
+import sys
+
 import pytest
 
+import numpy as np
+
 from orderbook_simulator.orderbook import (
+    LevelUpdate,
+    OrderAction,
     OrderBook,
+    OrderSpec,
     Side,
     OrderType,
     OrderStatus,
     OrderValidationError,
     OrderNotFoundError,
+    RetentionPolicy,
 )
 
 
-@pytest.fixture
-def book() -> OrderBook:
-    """Create a fresh order book."""
-    return OrderBook(symbol="TEST", tick_size=0.01)
+@pytest.fixture(params=["sorted", "dense"])
+def book(request: pytest.FixtureRequest) -> OrderBook:
+    """Create a fresh order book for each book side backend."""
+    return OrderBook(symbol="TEST", tick_size=0.01, backend=request.param)
 
 
 class TestOrderBookInit:
@@ -301,6 +313,19 @@ class TestOrderValidation:
         with pytest.raises(OrderValidationError, match="Price"):
             book.submit_order(Side.BUY, price=price, quantity=10)
 
+    @pytest.mark.parametrize("price", [math.nan, math.inf, -math.inf])
+    def test_non_finite_price_raises(
+        self, book: OrderBook, price: float
+    ) -> None:
+        """NaN and infinite limit prices raise validation error."""
+        with pytest.raises(OrderValidationError, match="finite"):
+            book.submit_order(Side.BUY, price=price, quantity=10)
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=10)
+        with pytest.raises(OrderValidationError, match="finite"):
+            book.modify_order(order.order_id, new_price=price)
+
+        assert book.best_bid() == 100.0
+
     def test_get_order_by_id(self, book: OrderBook) -> None:
         """Orders can be retrieved by ID."""
         order, _ = book.submit_order(Side.BUY, price=100.0, quantity=10)
@@ -308,3 +333,941 @@ class TestOrderValidation:
 
         assert retrieved.order_id == order.order_id
         assert retrieved.price == 100.0
+
+
+class TestPriceLadder:
+    """Tests for the sorted price ladder behind each book side."""
+
+    def test_levels_inserted_out_of_order(self, book: OrderBook) -> None:
+        """Depth is price-sorted regardless of insertion order."""
+        for price in (99.0, 101.0, 100.0, 98.0):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+        for price in (105.0, 103.0, 104.0):
+            book.submit_order(Side.SELL, price=price, quantity=1)
+
+        bids, asks = book.get_book_depth(levels=10)
+
+        assert [lvl.price for lvl in bids] == [101.0, 100.0, 99.0, 98.0]
+        assert [lvl.price for lvl in asks] == [103.0, 104.0, 105.0]
+
+    def test_cancel_inner_level_keeps_ladder_sorted(
+        self, book: OrderBook
+    ) -> None:
+        """Removing a non-top level leaves best prices intact."""
+        book.submit_order(Side.SELL, price=101.0, quantity=1)
+        middle, _ = book.submit_order(Side.SELL, price=102.0, quantity=1)
+        book.submit_order(Side.SELL, price=103.0, quantity=1)
+
+        book.cancel_order(middle.order_id)
+        _, asks = book.get_book_depth(levels=10)
+
+        assert book.best_ask() == 101.0
+        assert [lvl.price for lvl in asks] == [101.0, 103.0]
+
+    def test_sweep_stops_at_limit_price(self, book: OrderBook) -> None:
+        """Matching walks from the top and stops at the first non-crossing level."""
+        book.submit_order(Side.BUY, price=100.0, quantity=5)
+        book.submit_order(Side.BUY, price=99.0, quantity=5)
+        book.submit_order(Side.BUY, price=98.0, quantity=5)
+
+        order, trades = book.submit_order(Side.SELL, price=99.0, quantity=20)
+
+        assert [t.price for t in trades] == [100.0, 99.0]
+        assert order.remaining == 10
+        assert book.best_bid() == 98.0
+        assert book.best_ask() == 99.0
+
+    def test_depth_limit(self, book: OrderBook) -> None:
+        """Only the requested number of levels is returned."""
+        for i in range(10):
+            book.submit_order(Side.BUY, price=90.0 + i, quantity=1)
+
+        bids, _ = book.get_book_depth(levels=3)
+
+        assert [lvl.price for lvl in bids] == [99.0, 98.0, 97.0]
+
+
+class TestTopOfBookCache:
+    """Tests for the incrementally maintained best bid/ask."""
+
+    def test_best_updates_on_improving_order(self, book: OrderBook) -> None:
+        """A better-priced order replaces the cached best."""
+        book.submit_order(Side.BUY, price=99.0, quantity=1)
+        book.submit_order(Side.BUY, price=100.0, quantity=1)
+        book.submit_order(Side.BUY, price=98.0, quantity=1)
+
+        assert book.best_bid() == 100.0
+
+    def test_best_falls_back_after_cancel(self, book: OrderBook) -> None:
+        """Cancelling the top level exposes the next level."""
+        top, _ = book.submit_order(Side.SELL, price=101.0, quantity=1)
+        book.submit_order(Side.SELL, price=102.0, quantity=1)
+
+        book.cancel_order(top.order_id)
+
+        assert book.best_ask() == 102.0
+        assert book.get_spread() is None
+
+    def test_best_follows_sweep(self, book: OrderBook) -> None:
+        """A sweep that empties levels moves the cached best."""
+        book.submit_order(Side.SELL, price=101.0, quantity=5)
+        book.submit_order(Side.SELL, price=102.0, quantity=5)
+        book.submit_order(Side.BUY, price=99.0, quantity=5)
+
+        book.submit_order(
+            Side.BUY, price=0.0, quantity=7, order_type=OrderType.MARKET
+        )
+
+        assert book.best_ask() == 102.0
+        assert book.get_spread() == 3.0
+        assert book.get_midprice() == 100.5
+
+    def test_partial_level_fill_keeps_best(self, book: OrderBook) -> None:
+        """A partial fill leaves the top level and cached best unchanged."""
+        book.submit_order(Side.BUY, price=100.0, quantity=10)
+        book.submit_order(Side.SELL, price=100.0, quantity=4)
+
+        assert book.best_bid() == 100.0
+
+
+class TestLevelQueue:
+    """Tests for the linked FIFO queue at each price level."""
+
+    def test_cancel_middle_preserves_fifo(self, book: OrderBook) -> None:
+        """Cancelling mid-queue keeps the remaining orders in arrival order."""
+        first, _ = book.submit_order(Side.SELL, price=100.0, quantity=1)
+        middle, _ = book.submit_order(Side.SELL, price=100.0, quantity=1)
+        last, _ = book.submit_order(Side.SELL, price=100.0, quantity=1)
+
+        book.cancel_order(middle.order_id)
+        _, trades = book.submit_order(Side.BUY, price=100.0, quantity=2)
+
+        assert [t.sell_order_id for t in trades] == [
+            first.order_id, last.order_id,
+        ]
+
+    def test_cancel_tail_then_append(self, book: OrderBook) -> None:
+        """A new order after a tail cancel joins behind the survivors."""
+        first, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+        tail, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+        book.cancel_order(tail.order_id)
+        newest, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        _, trades = book.submit_order(Side.SELL, price=100.0, quantity=2)
+
+        assert [t.buy_order_id for t in trades] == [
+            first.order_id, newest.order_id,
+        ]
+
+    def test_partially_filled_head_keeps_priority(
+        self, book: OrderBook
+    ) -> None:
+        """A partially filled resting order stays at the head of its level."""
+        head, _ = book.submit_order(Side.SELL, price=100.0, quantity=5)
+        book.submit_order(Side.SELL, price=100.0, quantity=5)
+
+        book.submit_order(Side.BUY, price=100.0, quantity=3)
+        _, trades = book.submit_order(Side.BUY, price=100.0, quantity=3)
+
+        assert trades[0].sell_order_id == head.order_id
+        assert trades[0].quantity == 2
+
+    def test_cancel_last_order_removes_level(self, book: OrderBook) -> None:
+        """Cancelling every order at a level removes the level."""
+        orders = [
+            book.submit_order(Side.BUY, price=100.0, quantity=1)[0]
+            for _ in range(3)
+        ]
+        for order in orders:
+            book.cancel_order(order.order_id)
+
+        bids, _ = book.get_book_depth()
+
+        assert bids == []
+        assert book.best_bid() is None
+
+
+class TestRunningAggregates:
+    """Tests for running open-order and per-level counters."""
+
+    def test_order_count_tracks_lifecycle(self, book: OrderBook) -> None:
+        """Open order count follows rests, fills and cancels."""
+        resting, _ = book.submit_order(Side.SELL, price=100.0, quantity=5)
+        book.submit_order(Side.SELL, price=101.0, quantity=5)
+        assert book.order_count == 2
+
+        book.submit_order(Side.BUY, price=100.0, quantity=5)
+        assert book.order_count == 1
+
+        book.submit_order(Side.BUY, price=99.0, quantity=5)
+        book.submit_order(
+            Side.BUY, price=98.0, quantity=5, order_type=OrderType.IOC
+        )
+        assert book.order_count == 2
+
+        book.cancel_order(resting.order_id + 1)
+        assert book.order_count == 1
+        assert resting.status == OrderStatus.FILLED
+
+    def test_depth_reflects_partial_fills(self, book: OrderBook) -> None:
+        """Level quantity drops by the filled amount without losing the order."""
+        book.submit_order(Side.SELL, price=100.0, quantity=10)
+        book.submit_order(Side.SELL, price=100.0, quantity=10)
+
+        book.submit_order(Side.BUY, price=100.0, quantity=13)
+        _, asks = book.get_book_depth()
+
+        assert asks[0].quantity == 7
+        assert asks[0].order_count == 1
+
+    def test_depth_reflects_cancels(self, book: OrderBook) -> None:
+        """Cancelling a partially filled order removes only its remainder."""
+        first, _ = book.submit_order(Side.BUY, price=100.0, quantity=10)
+        book.submit_order(Side.BUY, price=100.0, quantity=4)
+        book.submit_order(Side.SELL, price=100.0, quantity=6)
+
+        book.cancel_order(first.order_id)
+        bids, _ = book.get_book_depth()
+
+        assert bids[0].quantity == 4
+        assert bids[0].order_count == 1
+
+    def test_vwap_uses_remaining_quantity(self, book: OrderBook) -> None:
+        """VWAP sees the post-fill level quantity."""
+        book.submit_order(Side.BUY, price=100.0, quantity=10)
+        book.submit_order(Side.BUY, price=99.0, quantity=10)
+        book.submit_order(Side.SELL, price=100.0, quantity=8)
+
+        vwap = book.get_vwap(Side.SELL, quantity=4)
+
+        assert vwap is not None
+        assert abs(vwap - (2 * 100.0 + 2 * 99.0) / 4) < 1e-9
+
+
+class TestTickPricing:
+    """Tests for integer tick price conversion at the API boundary."""
+
+    def test_price_stored_in_ticks(self, book: OrderBook) -> None:
+        """Submitted prices are converted to integer ticks once."""
+        order, _ = book.submit_order(Side.BUY, price=450.01, quantity=1)
+
+        assert order.price_ticks == 45001
+        assert order.price == 450.01
+
+    def test_float_noise_maps_to_same_level(self, book: OrderBook) -> None:
+        """Prices differing only by float noise share one level."""
+        book.submit_order(Side.BUY, price=450.01, quantity=1)
+        book.submit_order(Side.BUY, price=450.0100000001, quantity=2)
+
+        bids, _ = book.get_book_depth()
+
+        assert len(bids) == 1
+        assert bids[0].price == 450.01
+        assert bids[0].quantity == 3
+
+    def test_off_tick_price_rejected(self) -> None:
+        """Prices between ticks fail validation."""
+        book = OrderBook(tick_size=0.05)
+
+        with pytest.raises(OrderValidationError, match="tick_size"):
+            book.submit_order(Side.BUY, price=100.02, quantity=1)
+
+    def test_query_prices_are_exact(self, book: OrderBook) -> None:
+        """Spread and trade prices come back without float drift."""
+        book.submit_order(Side.BUY, price=0.1, quantity=1)
+        book.submit_order(Side.SELL, price=0.3, quantity=1)
+
+        assert book.get_spread() == 0.2
+        assert book.get_midprice() == 0.2
+
+        _, trades = book.submit_order(Side.BUY, price=0.3, quantity=1)
+        assert trades[0].price == 0.3
+
+    def test_coarse_tick_size(self) -> None:
+        """Tick sizes above one unit round-trip correctly."""
+        book = OrderBook(tick_size=25)
+        book.submit_order(Side.SELL, price=1025, quantity=1)
+
+        assert book.best_ask() == 1025
+
+
+class TestDenseBackend:
+    """Tests specific to the dense array-backed ladder."""
+
+    def test_unknown_backend_raises(self) -> None:
+        """An unknown backend name raises ValueError."""
+        with pytest.raises(ValueError, match="backend"):
+            OrderBook(backend="btree")
+
+    def test_recenters_on_drift(self) -> None:
+        """Prices outside the window trigger a recenter, keeping levels."""
+        book = OrderBook(backend="dense", dense_window=16)
+        book.submit_order(Side.BUY, price=100.00, quantity=1)
+        book.submit_order(Side.BUY, price=100.50, quantity=2)
+        book.submit_order(Side.BUY, price=99.00, quantity=3)
+
+        bids, _ = book.get_book_depth(levels=10)
+
+        assert [(lvl.price, lvl.quantity) for lvl in bids] == [
+            (100.5, 2), (100.0, 1), (99.0, 3),
+        ]
+        assert book.best_bid() == 100.5
+
+    def test_best_pointer_skips_gaps(self) -> None:
+        """Removing the top level moves best across empty ticks."""
+        book = OrderBook(backend="dense", dense_window=64)
+        top, _ = book.submit_order(Side.SELL, price=100.00, quantity=1)
+        book.submit_order(Side.SELL, price=100.20, quantity=1)
+
+        book.cancel_order(top.order_id)
+
+        assert book.best_ask() == 100.2
+
+    def test_depth_at_price(self, book: OrderBook) -> None:
+        """Depth at a single price reflects fills and empty levels."""
+        book.submit_order(Side.SELL, price=101.0, quantity=10)
+        book.submit_order(Side.SELL, price=101.0, quantity=5)
+        book.submit_order(Side.BUY, price=101.0, quantity=3)
+
+        level = book.get_depth_at_price(Side.SELL, 101.0)
+        empty = book.get_depth_at_price(Side.SELL, 102.0)
+
+        assert (level.quantity, level.order_count) == (12, 2)
+        assert (empty.quantity, empty.order_count) == (0, 0)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+"
+)
+class TestSlottedRecords:
+    """Tests for the slotted Order/Trade/BookLevel records."""
+
+    def test_records_have_no_instance_dict(self, book: OrderBook) -> None:
+        """Hot records carry no per-instance __dict__."""
+        book.submit_order(Side.SELL, price=100.0, quantity=5)
+        order, trades = book.submit_order(Side.BUY, price=100.0, quantity=5)
+        bids, asks = book.get_book_depth()
+
+        assert not hasattr(order, "__dict__")
+        assert not hasattr(trades[0], "__dict__")
+        assert bids == [] and asks == []
+
+    def test_trade_is_immutable(self, book: OrderBook) -> None:
+        """Trades stay frozen with slots enabled."""
+        book.submit_order(Side.SELL, price=100.0, quantity=5)
+        _, trades = book.submit_order(Side.BUY, price=100.0, quantity=5)
+
+        with pytest.raises(AttributeError):
+            trades[0].quantity = 1  # type: ignore[misc]
+
+    def test_resting_order_copies_without_queue(self, book: OrderBook) -> None:
+        """Pickle, deepcopy and asdict see the order, not its level queue."""
+        for _ in range(5_000):
+            book.submit_order(Side.BUY, price=100.0, quantity=1)
+        order = book.get_order(2_500)
+
+        restored = pickle.loads(pickle.dumps(order))
+        copied = copy.deepcopy(order)
+
+        assert restored == order and copied == order
+        assert restored._level is None and copied._next is None
+        assert dataclasses.asdict(order)["order_id"] == 2_500
+        assert book.cancel_order(2_500) is order
+
+
+class TestRetention:
+    """Tests for bounded retention of terminal orders and trades."""
+
+    def test_default_keeps_everything(self, book: OrderBook) -> None:
+        """Without a policy, filled orders stay retrievable."""
+        resting, _ = book.submit_order(Side.SELL, price=100.0, quantity=5)
+        book.submit_order(Side.BUY, price=100.0, quantity=5)
+
+        assert book.get_order(resting.order_id).status == OrderStatus.FILLED
+
+    def test_immediate_eviction(self) -> None:
+        """A zero TTL evicts terminal orders at the end of the event."""
+        evicted = []
+        book = OrderBook(retention=RetentionPolicy(
+            terminal_order_ttl=0, on_order_evicted=evicted.append,
+        ))
+        resting, _ = book.submit_order(Side.SELL, price=100.0, quantity=5)
+        aggressor, _ = book.submit_order(Side.BUY, price=100.0, quantity=8)
+        cancelled = book.cancel_order(aggressor.order_id)
+
+        assert [o.order_id for o in evicted] == [
+            resting.order_id, aggressor.order_id,
+        ]
+        assert cancelled.status == OrderStatus.CANCELLED
+        with pytest.raises(OrderNotFoundError):
+            book.get_order(resting.order_id)
+
+    def test_ttl_uses_event_time(self) -> None:
+        """Terminal orders survive until the TTL elapses in event time."""
+        book = OrderBook(retention=RetentionPolicy(terminal_order_ttl=10.0))
+        order, _ = book.submit_order(
+            Side.BUY, price=100.0, quantity=1, timestamp=0.0
+        )
+        book.cancel_order(order.order_id)
+
+        book.submit_order(Side.BUY, price=99.0, quantity=1, timestamp=5.0)
+        assert book.get_order(order.order_id).status == OrderStatus.CANCELLED
+
+        book.submit_order(Side.BUY, price=99.0, quantity=1, timestamp=10.0)
+        with pytest.raises(OrderNotFoundError):
+            book.get_order(order.order_id)
+
+    def test_max_terminal_orders(self) -> None:
+        """Only the newest N terminal orders are kept."""
+        book = OrderBook(retention=RetentionPolicy(max_terminal_orders=2))
+        ids = []
+        for _ in range(4):
+            order, _ = book.submit_order(
+                Side.BUY, price=100.0, quantity=1, order_type=OrderType.IOC
+            )
+            ids.append(order.order_id)
+
+        with pytest.raises(OrderNotFoundError):
+            book.get_order(ids[1])
+        assert book.get_order(ids[2]).status == OrderStatus.CANCELLED
+
+    def test_resting_orders_never_evicted(self) -> None:
+        """Open orders are unaffected by retention."""
+        book = OrderBook(retention=RetentionPolicy(terminal_order_ttl=0))
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+        book.submit_order(
+            Side.SELL, price=101.0, quantity=1, order_type=OrderType.IOC
+        )
+
+        assert book.get_order(order.order_id) is order
+
+    def test_trade_ring_buffer(self) -> None:
+        """Trade history is capped and evicted trades are archived."""
+        archived = []
+        book = OrderBook(retention=RetentionPolicy(
+            max_trades=2, on_trade_evicted=archived.append,
+        ))
+        book.submit_order(Side.SELL, price=100.0, quantity=3)
+        for _ in range(3):
+            book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        assert [t.trade_id for t in book.trades] == [2, 3]
+        assert [t.trade_id for t in archived] == [1]
+        assert book.trade_count == 3
+
+    def test_invalid_policy_raises(self) -> None:
+        """Negative bounds are rejected."""
+        with pytest.raises(ValueError, match="max_trades"):
+            RetentionPolicy(max_trades=0)
+
+
+class TestTradeAccess:
+    """Tests for non-copying trade history access."""
+
+    def test_view_tracks_new_trades(self, book: OrderBook) -> None:
+        """The trades view reflects trades executed after it was taken."""
+        view = book.trades
+        book.submit_order(Side.SELL, price=100.0, quantity=2)
+        book.submit_order(Side.BUY, price=100.0, quantity=1)
+        book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        assert len(view) == 2
+        assert view[-1].trade_id == 2
+        assert [t.trade_id for t in view[:1]] == [1]
+        assert book.trades is view
+
+    def test_view_slicing_matches_list(self, book: OrderBook) -> None:
+        """Slices of the view match slices of the equivalent list."""
+        book.submit_order(Side.SELL, price=100.0, quantity=6)
+        for _ in range(6):
+            book.submit_order(Side.BUY, price=100.0, quantity=1)
+        ids = [t.trade_id for t in book.trades]
+
+        for index in (
+            slice(-2, None), slice(1, 4), slice(None, None, 2),
+            slice(None, None, -1), slice(5, 0, -2), slice(4, 2), slice(-9, 9),
+        ):
+            assert [t.trade_id for t in book.trades[index]] == ids[index]
+
+    def test_trades_since(self, book: OrderBook) -> None:
+        """Polling by last seen ID returns only newer trades."""
+        book.submit_order(Side.SELL, price=100.0, quantity=5)
+        for _ in range(5):
+            book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        assert [t.trade_id for t in book.trades_since(3)] == [4, 5]
+        assert book.trades_since(5) == []
+        assert len(book.trades_since(0)) == 5
+
+    def test_trades_since_with_ring_buffer(self) -> None:
+        """A cursor older than the retained window returns what is left."""
+        book = OrderBook(retention=RetentionPolicy(max_trades=2))
+        book.submit_order(Side.SELL, price=100.0, quantity=5)
+        for _ in range(5):
+            book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        assert [t.trade_id for t in book.trades_since(1)] == [4, 5]
+
+    def test_columnar_log_matches_trades(self) -> None:
+        """The columnar log mirrors every executed trade."""
+        book = OrderBook(columnar_trades=True)
+        book.submit_order(Side.SELL, price=100.0, quantity=5, timestamp=1.0)
+        book.submit_order(Side.SELL, price=100.5, quantity=5, timestamp=2.0)
+        book.submit_order(Side.BUY, price=101.0, quantity=8, timestamp=3.0)
+
+        assert book.trade_log is not None
+        arrays = book.trade_log.to_arrays()
+
+        assert arrays["trade_id"].tolist() == [1, 2]
+        assert arrays["sell_order_id"].tolist() == [1, 2]
+        assert arrays["buy_order_id"].tolist() == [3, 3]
+        assert arrays["price"].tolist() == [100.0, 100.5]
+        assert arrays["quantity"].tolist() == [5, 3]
+        assert arrays["timestamp"].tolist() == [3.0, 3.0]
+
+
+class TestBatchSubmission:
+    """Tests for submitting many orders in one call."""
+
+    def test_specs_match_sequential_submission(self, book: OrderBook) -> None:
+        """A batch produces the same fills as one-by-one submission."""
+        specs = [
+            OrderSpec(Side.SELL, 100.0, 5, timestamp=1.0),
+            OrderSpec(Side.SELL, 101.0, 5, timestamp=2.0),
+            (Side.BUY, 0.0, 7, OrderType.MARKET, 3.0),
+            OrderSpec(Side.BUY, 99.0, 4, timestamp=4.0),
+        ]
+        reference = OrderBook(backend=book.backend)
+        expected = []
+        for spec in specs:
+            expected.extend(reference.submit_order(*spec)[1])
+
+        orders, trades = book.submit_orders(specs)
+
+        assert [o.order_id for o in orders] == [1, 2, 3, 4]
+        assert trades == expected
+        assert book.get_book_depth() == reference.get_book_depth()
+
+    def test_array_form_with_codes(self, book: OrderBook) -> None:
+        """Parallel arrays with integer codes are accepted."""
+        orders, trades = book.submit_orders(
+            sides=np.array([1, 1, 0]),
+            prices=np.array([100.0, 100.5, 100.5]),
+            quantities=np.array([3, 3, 4]),
+            order_types=np.array([0, 0, 2]),
+            timestamps=np.array([1.0, 2.0, 3.0]),
+        )
+
+        assert [t.price for t in trades] == [100.0, 100.5]
+        assert orders[2].status == OrderStatus.FILLED
+        assert book.best_ask() == 100.5
+        assert book.get_depth_at_price(Side.SELL, 100.5).quantity == 2
+
+    def test_invalid_order_rejects_whole_batch(self, book: OrderBook) -> None:
+        """Validation happens before any order in the batch is applied."""
+        with pytest.raises(OrderValidationError, match="Batch order 1"):
+            book.submit_orders([
+                OrderSpec(Side.BUY, 100.0, 5),
+                OrderSpec(Side.BUY, 100.0, 0),
+            ])
+
+        assert book.order_count == 0
+        assert book.best_bid() is None
+
+    def test_off_tick_price_in_batch(self, book: OrderBook) -> None:
+        """Off-grid limit prices are rejected in batches too."""
+        with pytest.raises(OrderValidationError, match="tick_size"):
+            book.submit_orders(
+                sides=[Side.BUY], prices=[100.001], quantities=[1],
+            )
+
+    @pytest.mark.parametrize("price", [math.nan, math.inf])
+    def test_non_finite_price_in_batch(
+        self, book: OrderBook, price: float
+    ) -> None:
+        """Non-finite limit prices reject the batch; market rows ignore price."""
+        with pytest.raises(OrderValidationError, match="Batch order 1.*finite"):
+            book.submit_orders(
+                sides=[Side.BUY, Side.BUY], prices=[100.0, price],
+                quantities=[1, 1],
+            )
+        assert book.order_count == 0
+
+        orders, _ = book.submit_orders(
+            sides=[Side.BUY], prices=[price], quantities=[1],
+            order_types=[OrderType.MARKET],
+        )
+        assert orders[0].status == OrderStatus.CANCELLED
+
+    @pytest.mark.parametrize("quantity", [1.5, math.nan, 2**63, 2**64, 1e30])
+    def test_unrepresentable_quantity_in_batch(
+        self, book: OrderBook, quantity: float
+    ) -> None:
+        """Quantities are never truncated or allowed to overflow."""
+        with pytest.raises(OrderValidationError, match="Batch order 1"):
+            book.submit_orders(
+                sides=[Side.BUY, Side.BUY], prices=[100.0, 100.0],
+                quantities=[1, quantity],
+            )
+        assert book.order_count == 0
+
+        orders, _ = book.submit_orders(
+            sides=[0], prices=[100.0], quantities=np.array([2.0]),
+        )
+        assert orders[0].quantity == 2
+
+    @pytest.mark.parametrize("field", ["sides", "order_types"])
+    @pytest.mark.parametrize("codes", [[0.7], [True]])
+    def test_non_integer_codes_rejected(
+        self, book: OrderBook, field: str, codes: list
+    ) -> None:
+        """Float and bool codes are not cast to a side or order type."""
+        arrays = {"sides": [0], "prices": [100.0], "quantities": [1]}
+        arrays[field] = codes
+        with pytest.raises(OrderValidationError, match="integers"):
+            book.submit_orders(**arrays)
+        assert book.order_count == 0
+
+    def test_flagged_row_never_applied(
+        self, book: OrderBook, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A row the vectorized check rejects fails even if rechecks pass."""
+        monkeypatch.setattr(
+            OrderBook, "_validate_order_params", lambda *args: None
+        )
+        with pytest.raises(OrderValidationError, match="Batch order 0"):
+            book.submit_orders(sides=[0], prices=[-1.0], quantities=[1])
+        assert book.order_count == 0
+
+    def test_mixed_inputs_raise(self, book: OrderBook) -> None:
+        """Specs and arrays cannot be combined."""
+        with pytest.raises(ValueError, match="either"):
+            book.submit_orders([OrderSpec(Side.BUY, 100.0, 1)], sides=[0])
+        for name in ("order_types", "timestamps", "tags"):
+            with pytest.raises(ValueError, match="either"):
+                book.submit_orders(
+                    [OrderSpec(Side.BUY, 100.0, 1)], **{name: [None]}
+                )
+
+
+class TestMassCancel:
+    """Tests for batch and mass cancellation."""
+
+    def test_cancel_orders(self, book: OrderBook) -> None:
+        """Several orders are cancelled and levels emptied together."""
+        a, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+        b, _ = book.submit_order(Side.BUY, price=100.0, quantity=2)
+        c, _ = book.submit_order(Side.BUY, price=99.0, quantity=3)
+        book.submit_order(Side.SELL, price=101.0, quantity=1)
+
+        cancelled = book.cancel_orders([a.order_id, b.order_id])
+        bids, _ = book.get_book_depth()
+
+        assert [o.status for o in cancelled] == [OrderStatus.CANCELLED] * 2
+        assert book.best_bid() == 99.0
+        assert [lvl.price for lvl in bids] == [99.0]
+        assert book.order_count == 2
+        assert c.status == OrderStatus.OPEN
+
+    def test_cancel_orders_is_all_or_nothing(self, book: OrderBook) -> None:
+        """An unknown ID leaves every other order untouched."""
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        with pytest.raises(OrderNotFoundError):
+            book.cancel_orders([order.order_id, 999])
+
+        assert order.status == OrderStatus.OPEN
+        assert book.best_bid() == 100.0
+
+    def test_cancel_side(self, book: OrderBook) -> None:
+        """Clearing one side leaves the other intact."""
+        for price in (98.0, 99.0, 100.0):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+        book.submit_order(Side.SELL, price=101.0, quantity=1)
+
+        cancelled = book.cancel_side(Side.BUY)
+
+        assert [o.price for o in cancelled] == [100.0, 99.0, 98.0]
+        assert book.best_bid() is None
+        assert book.best_ask() == 101.0
+        assert book.order_count == 1
+
+    def test_cancel_price_range(self, book: OrderBook) -> None:
+        """Only levels inside the inclusive range are removed."""
+        for price in (101.0, 102.0, 103.0, 104.0):
+            book.submit_order(Side.SELL, price=price, quantity=1)
+
+        cancelled = book.cancel_price_range(Side.SELL, low=101.5, high=103.0)
+        _, asks = book.get_book_depth()
+
+        assert [o.price for o in cancelled] == [102.0, 103.0]
+        assert [lvl.price for lvl in asks] == [101.0, 104.0]
+        assert book.best_ask() == 101.0
+
+    def test_cancel_range_including_best(self, book: OrderBook) -> None:
+        """Removing the top levels moves the best price once."""
+        for price in (97.0, 98.0, 99.0, 100.0):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+
+        book.cancel_price_range(Side.BUY, low=98.0)
+
+        assert book.best_bid() == 97.0
+
+    def test_cancel_by_tag(self, book: OrderBook) -> None:
+        """Tagged resting orders are cancelled; others and fills are not."""
+        quoted, _ = book.submit_order(
+            Side.BUY, price=100.0, quantity=1, tag="mm"
+        )
+        filled, _ = book.submit_order(
+            Side.SELL, price=102.0, quantity=1, tag="mm"
+        )
+        other, _ = book.submit_order(Side.BUY, price=99.0, quantity=1)
+        book.submit_order(Side.BUY, price=102.0, quantity=1)
+        book.submit_order(Side.SELL, price=103.0, quantity=1, tag="mm")
+
+        cancelled = book.cancel_by_tag("mm")
+
+        assert quoted in cancelled and len(cancelled) == 2
+        assert filled.status == OrderStatus.FILLED
+        assert other.status == OrderStatus.OPEN
+        assert book.best_ask() is None
+        assert book.cancel_by_tag("mm") == []
+
+
+class TestModifyOrder:
+    """Tests for cancel/replace (amend) of open orders."""
+
+    def test_quantity_reduction_keeps_priority(self, book: OrderBook) -> None:
+        """Reducing quantity in place keeps the order at the queue head."""
+        first, _ = book.submit_order(Side.SELL, price=100.0, quantity=10)
+        book.submit_order(Side.SELL, price=100.0, quantity=10)
+
+        order, trades = book.modify_order(first.order_id, new_qty=4)
+        _, fills = book.submit_order(Side.BUY, price=100.0, quantity=4)
+
+        assert order is first and trades == []
+        assert (first.quantity, first.remaining) == (4, 0)
+        assert fills[0].sell_order_id == first.order_id
+
+    def test_reduction_updates_level_aggregates(self, book: OrderBook) -> None:
+        """Depth reflects an in-place reduction."""
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=10)
+        book.submit_order(Side.SELL, price=100.0, quantity=3)
+
+        book.modify_order(order.order_id, new_qty=8)
+        bids, _ = book.get_book_depth()
+
+        assert order.remaining == 5
+        assert bids[0].quantity == 5
+
+    def test_quantity_increase_loses_priority(self, book: OrderBook) -> None:
+        """Increasing quantity sends the order to the back of the level."""
+        first, _ = book.submit_order(Side.SELL, price=100.0, quantity=1)
+        second, _ = book.submit_order(Side.SELL, price=100.0, quantity=1)
+
+        book.modify_order(first.order_id, new_qty=5)
+        _, fills = book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        assert fills[0].sell_order_id == second.order_id
+
+    def test_price_change_moves_level(self, book: OrderBook) -> None:
+        """A price change moves the order to the new level atomically."""
+        order, _ = book.submit_order(Side.BUY, price=99.0, quantity=5)
+        book.submit_order(Side.BUY, price=98.0, quantity=5)
+
+        book.modify_order(order.order_id, new_price=100.0)
+        bids, _ = book.get_book_depth()
+
+        assert book.best_bid() == 100.0
+        assert [lvl.price for lvl in bids] == [100.0, 98.0]
+        assert book.order_count == 2
+
+    def test_crossing_price_change_matches(self, book: OrderBook) -> None:
+        """An amended price that crosses the spread trades immediately."""
+        book.submit_order(Side.SELL, price=101.0, quantity=3)
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=5)
+
+        _, trades = book.modify_order(order.order_id, new_price=101.0)
+
+        assert [(t.price, t.quantity) for t in trades] == [(101.0, 3)]
+        assert order.remaining == 2
+        assert book.best_bid() == 101.0
+        assert book.best_ask() is None
+
+    def test_quantity_not_above_filled_raises(self, book: OrderBook) -> None:
+        """New quantity must exceed what has already filled."""
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=10)
+        book.submit_order(Side.SELL, price=100.0, quantity=6)
+
+        with pytest.raises(OrderValidationError, match="New quantity"):
+            book.modify_order(order.order_id, new_qty=6)
+
+    def test_modify_filled_order_raises(self, book: OrderBook) -> None:
+        """Filled orders cannot be amended."""
+        book.submit_order(Side.SELL, price=100.0, quantity=1)
+        order, _ = book.submit_order(Side.BUY, price=100.0, quantity=1)
+
+        with pytest.raises(OrderValidationError, match="Cannot modify"):
+            book.modify_order(order.order_id, new_qty=2)
+
+
+class TestExecuteOrder:
+    """Tests for fills of resting orders against outside counterparties."""
+
+    def test_partial_execution_keeps_priority(self, book: OrderBook) -> None:
+        """A partial fill leaves the order at the head of its level."""
+        first, _ = book.submit_order(Side.BUY, price=99.0, quantity=10)
+        book.submit_order(Side.BUY, price=99.0, quantity=5)
+
+        trade = book.execute_order(first.order_id, 4, timestamp=1.0)
+
+        assert (trade.buy_order_id, trade.sell_order_id) == (first.order_id, 0)
+        assert (trade.price, trade.quantity) == (99.0, 4)
+        assert first.status == OrderStatus.PARTIALLY_FILLED
+        level = book.get_depth_at_price(Side.BUY, 99.0)
+        assert (level.quantity, level.order_count) == (11, 2)
+        _, trades = book.submit_order(Side.SELL, price=99.0, quantity=6)
+        assert trades[0].buy_order_id == first.order_id
+
+    def test_full_execution_removes_order(self, book: OrderBook) -> None:
+        """Filling the whole order takes it off the book."""
+        order, _ = book.submit_order(Side.SELL, price=101.0, quantity=3)
+
+        trade = book.execute_order(order.order_id, 3, price=100.99)
+
+        assert trade.price == 100.99
+        assert order.status == OrderStatus.FILLED
+        assert book.best_ask() is None
+        assert book.order_count == 0
+        assert book.trade_count == 1
+
+    def test_execution_above_remaining_raises(self, book: OrderBook) -> None:
+        """Executions cannot exceed the remaining quantity."""
+        order, _ = book.submit_order(Side.SELL, price=101.0, quantity=3)
+
+        with pytest.raises(OrderValidationError, match="Execution quantity"):
+            book.execute_order(order.order_id, 4)
+
+
+class TestLevelUpdates:
+    """Tests for incremental L2 level updates."""
+
+    def _subscribe(self, book: OrderBook) -> list:
+        updates: list = []
+        book.subscribe_levels(updates.append)
+        return updates
+
+    def test_add_and_cancel_publish_levels(self, book: OrderBook) -> None:
+        """Resting and cancelling report the new level aggregates."""
+        updates = self._subscribe(book)
+        first, _ = book.submit_order(Side.BUY, price=99.0, quantity=10)
+        second, _ = book.submit_order(Side.BUY, price=99.0, quantity=5)
+        book.cancel_order(first.order_id)
+        book.cancel_orders([second.order_id])
+
+        assert updates == [
+            LevelUpdate(Side.BUY, 99.0, 10, 1),
+            LevelUpdate(Side.BUY, 99.0, 15, 2),
+            LevelUpdate(Side.BUY, 99.0, 5, 1),
+            LevelUpdate(Side.BUY, 99.0, 0, 0),
+        ]
+
+    def test_sweep_publishes_once_per_level(self, book: OrderBook) -> None:
+        """An aggressor reports each level it trades through once."""
+        book.submit_order(Side.SELL, price=101.0, quantity=3)
+        book.submit_order(Side.SELL, price=101.0, quantity=3)
+        book.submit_order(Side.SELL, price=102.0, quantity=5)
+        updates = self._subscribe(book)
+
+        book.submit_order(Side.BUY, price=102.0, quantity=8)
+
+        assert updates == [
+            LevelUpdate(Side.SELL, 101.0, 0, 0),
+            LevelUpdate(Side.SELL, 102.0, 3, 1),
+        ]
+
+    def test_reduce_and_execute_publish(self, book: OrderBook) -> None:
+        """In-place reductions and executions report the level."""
+        order, _ = book.submit_order(Side.SELL, price=101.0, quantity=10)
+        updates = self._subscribe(book)
+
+        book.modify_order(order.order_id, new_qty=6)
+        book.execute_order(order.order_id, 2)
+        book.cancel_price_range(Side.SELL, 100.0, 102.0)
+
+        assert updates == [
+            LevelUpdate(Side.SELL, 101.0, 6, 1),
+            LevelUpdate(Side.SELL, 101.0, 4, 1),
+            LevelUpdate(Side.SELL, 101.0, 0, 0),
+        ]
+
+    def test_unsubscribe(self, book: OrderBook) -> None:
+        """Unsubscribed callbacks stop receiving updates."""
+        updates = self._subscribe(book)
+        book.unsubscribe_levels(updates.append)
+        book.submit_order(Side.BUY, price=99.0, quantity=1)
+
+        assert updates == []
+        with pytest.raises(ValueError):
+            book.unsubscribe_levels(updates.append)
+
+
+class TestOrderUpdates:
+    """Tests for order-level (L3) events."""
+
+    def test_order_lifecycle_events(self, book: OrderBook) -> None:
+        """Rest, partial fill, reduce, reprice and cancel are all reported."""
+        updates: list = []
+        book.subscribe_orders(updates.append)
+        order, _ = book.submit_order(
+            Side.SELL, price=101.0, quantity=10, timestamp=1.0
+        )
+        book.submit_order(Side.BUY, price=101.0, quantity=3, timestamp=2.0)
+        book.modify_order(order.order_id, new_qty=8)
+        book.modify_order(order.order_id, new_price=102.0, timestamp=3.0)
+        book.cancel_order(order.order_id)
+
+        assert [(u.action, u.price, u.quantity) for u in updates] == [
+            (OrderAction.ADD, 101.0, 10),
+            (OrderAction.EXECUTE, 101.0, 3),
+            (OrderAction.REDUCE, 101.0, 2),
+            (OrderAction.DELETE, 101.0, 5),
+            (OrderAction.ADD, 102.0, 5),
+            (OrderAction.DELETE, 102.0, 5),
+        ]
+        assert {u.order_id for u in updates} == {order.order_id}
+        assert updates[1].timestamp == 2.0
+
+    def test_full_fill_has_no_delete(self, book: OrderBook) -> None:
+        """Orders filled to zero leave the book on their last EXECUTE."""
+        book.submit_order(Side.BUY, price=99.0, quantity=2)
+        updates: list = []
+        book.subscribe_orders(updates.append)
+        book.submit_order(Side.SELL, price=99.0, quantity=2)
+        book.unsubscribe_orders(updates.append)
+        book.submit_order(Side.SELL, price=99.0, quantity=1)
+
+        assert [u.action for u in updates] == [OrderAction.EXECUTE]
+
+
+class TestCommitCallbacks:
+    """Tests for end-of-operation callbacks."""
+
+    def test_called_once_per_successful_write(self, book: OrderBook) -> None:
+        """Each completed write runs the callbacks once; rejects do not."""
+        commits: list = []
+
+        def on_commit() -> None:
+            commits.append(book.get_spread())
+
+        book.subscribe_commits(on_commit)
+        order, _ = book.submit_order(Side.BUY, price=99.0, quantity=5)
+        book.submit_order(Side.SELL, price=100.0, quantity=5)
+        book.modify_order(order.order_id, new_qty=4)
+        with pytest.raises(OrderNotFoundError):
+            book.cancel_order(999)
+        book.cancel_side(Side.BUY)
+        book.unsubscribe_commits(on_commit)
+        book.submit_order(Side.BUY, price=98.0, quantity=1)
+
+        assert commits == [None, 1.0, 1.0, None]
@@ -0,0 +1,87 @@
+"""Tests for the multi-symbol exchange router."""
+
+import math
+
+import pytest
+
+from orderbook_simulator.exchange import Exchange, UnknownSymbolError
+from orderbook_simulator.orderbook import OrderStatus, OrderType, Side
+
+
+@pytest.fixture
+def exchange() -> Exchange:
+    """Create an exchange with two listed symbols."""
+    return Exchange(symbols=["AAA", "BBB"])
+
+
+class TestExchange:
+    """Tests for symbol routing and shared sequences."""
+
+    def test_routes_by_symbol(self, exchange: Exchange) -> None:
+        """Orders only interact with their own symbol's book."""
+        exchange.submit_order("AAA", Side.SELL, 100.0, 5)
+        _, trades = exchange.submit_order("BBB", Side.BUY, 100.0, 5)
+
+        assert trades == []
+        assert exchange.book("AAA").best_ask() == 100.0
+        assert exchange.book("BBB").best_bid() == 100.0
+
+    def test_ids_are_unique_across_books(self, exchange: Exchange) -> None:
+        """Order and trade IDs come from exchange-wide sequences."""
+        a, _ = exchange.submit_order("AAA", Side.SELL, 100.0, 1)
+        b, _ = exchange.submit_order("BBB", Side.SELL, 50.0, 1)
+        _, trades_a = exchange.submit_order("AAA", Side.BUY, 100.0, 1)
+        _, trades_b = exchange.submit_order("BBB", Side.BUY, 50.0, 1)
+
+        assert (a.order_id, b.order_id) == (1, 2)
+        assert [t.trade_id for t in trades_a + trades_b] == [1, 2]
+        assert exchange.book("AAA").trade_count == 1
+        assert exchange.book("BBB").trades_since(0) == trades_b
+
+    def test_cancel_and_modify_route(self, exchange: Exchange) -> None:
+        """Cancels and amends reach the right book."""
+        order, _ = exchange.submit_order("AAA", Side.BUY, 99.0, 5)
+        exchange.modify_order("AAA", order.order_id, new_qty=3)
+        cancelled = exchange.cancel_order("AAA", order.order_id)
+
+        assert cancelled.status == OrderStatus.CANCELLED
+        assert cancelled.quantity == 3
+
+    def test_unknown_symbol_raises(self, exchange: Exchange) -> None:
+        """Routing to an unlisted symbol raises UnknownSymbolError."""
+        with pytest.raises(UnknownSymbolError):
+            exchange.submit_order("ZZZ", Side.BUY, 1.0, 1)
+
+    def test_duplicate_symbol_raises(self, exchange: Exchange) -> None:
+        """A symbol cannot be listed twice."""
+        with pytest.raises(ValueError, match="already listed"):
+            exchange.add_symbol("AAA")
+
+    def test_top_of_book_array(self, exchange: Exchange) -> None:
+        """All symbols' BBOs come back as one structured array."""
+        exchange.add_symbol("CCC", tick_size=0.05)
+        exchange.submit_order("AAA", Side.BUY, 450.01, 10)
+        exchange.submit_order("AAA", Side.SELL, 450.03, 7)
+        exchange.submit_order("CCC", Side.SELL, 12.35, 4)
+        exchange.submit_order(
+            "CCC", Side.BUY, 0.0, 1, order_type=OrderType.MARKET
+        )
+
+        tob = exchange.top_of_book()
+
+        assert exchange.symbols == ["AAA", "BBB", "CCC"]
+        assert (tob["bid"][0], tob["bid_qty"][0]) == (450.01, 10)
+        assert (tob["ask"][0], tob["ask_qty"][0]) == (450.03, 7)
+        assert math.isnan(tob["bid"][1]) and tob["ask_qty"][1] == 0
+        assert (tob["ask"][2], tob["ask_qty"][2]) == (12.35, 3)
+
+    def test_many_symbols_grow_arrays(self) -> None:
+        """Listing more symbols than the initial capacity works."""
+        exchange = Exchange(symbols=[f"S{i}" for i in range(100)])
+        exchange.submit_order("S99", Side.BUY, 10.0, 1)
+
+        tob = exchange.top_of_book()
+
+        assert len(tob) == 100
+        assert tob["bid"][99] == 10.0
+        assert tob["bid_qty"][:99].sum() == 0
@@ -0,0 +1,125 @@
+"""Tests for the asyncio order gateway."""
+
+import asyncio
+
+import pytest
+
+from orderbook_simulator.gateway import GatewayClosedError, OrderGateway
+from orderbook_simulator.orderbook import (
+    OrderBook,
+    OrderNotFoundError,
+    OrderStatus,
+    Side,
+)
+
+
+def _run(coro):
+    """Run a coroutine on a fresh event loop."""
+    return asyncio.run(coro)
+
+
+class TestOrderGateway:
+    """Tests for OrderGateway."""
+
+    def test_requests_resolve_with_book_results(self) -> None:
+        """Each client gets its own order and trades."""
+        async def session():
+            async with OrderGateway(OrderBook(tick_size=0.01)) as gateway:
+                resting, _ = await gateway.submit_order(Side.SELL, 101.0, 5)
+                order, trades = await gateway.submit_order(Side.BUY, 101.0, 2)
+                amended, _ = await gateway.modify_order(
+                    resting.order_id, new_qty=4
+                )
+                cancelled = await gateway.cancel_order(resting.order_id)
+            return resting, order, trades, amended, cancelled
+
+        resting, order, trades, amended, cancelled = _run(session())
+        assert order.status == OrderStatus.FILLED
+        assert [(t.price, t.quantity) for t in trades] == [(101.0, 2)]
+        assert amended is resting and cancelled is resting
+        assert resting.status == OrderStatus.CANCELLED
+
+    def test_concurrent_clients_are_batched(self) -> None:
+        """Requests queued while the owner is busy share a micro-batch."""
+        async def session():
+            gateway = OrderGateway(max_batch=64)
+            await gateway.start()
+            results = await asyncio.gather(*(
+                gateway.submit_order(Side.BUY, 100.0 - i % 10, 1)
+                for i in range(200)
+            ))
+            await gateway.close()
+            return gateway, results
+
+        gateway, results = _run(session())
+        assert gateway.requests_applied == 200
+        assert gateway.batches <= 200 // 64 + 2
+        assert len({order.order_id for order, _ in results}) == 200
+        assert gateway.book.order_count == 200
+
+    def test_errors_reach_only_their_caller(self) -> None:
+        """A rejected request fails its own future and nothing else."""
+        async def session():
+            async with OrderGateway() as gateway:
+                return await asyncio.gather(
+                    gateway.cancel_order(12345),
+                    gateway.submit_order(Side.BUY, 99.0, 1),
+                    return_exceptions=True,
+                )
+
+        missing, (order, _) = _run(session())
+        assert isinstance(missing, OrderNotFoundError)
+        assert order.status == OrderStatus.OPEN
+
+    def test_backpressure_bounds_the_queue(self) -> None:
+        """Clients wait once max_pending requests are queued."""
+        async def session():
+            gateway = OrderGateway(max_pending=4)
+            await gateway.start()
+            peak = 0
+
+            async def client(i: int) -> None:
+                nonlocal peak
+                await gateway.submit_order(Side.SELL, 101.0 + i % 3, 1)
+                peak = max(peak, gateway.pending)
+
+            await asyncio.gather(*(client(i) for i in range(50)))
+            await gateway.close()
+            return gateway, peak
+
+        gateway, peak = _run(session())
+        assert peak <= 4
+        assert gateway.requests_applied == 50
+
+    def test_closed_gateway_rejects_requests(self) -> None:
+        """Requests before start or after close raise."""
+        async def session():
+            gateway = OrderGateway()
+            with pytest.raises(GatewayClosedError):
+                await gateway.submit_order(Side.BUY, 99.0, 1)
+            await gateway.start()
+            await gateway.close()
+            with pytest.raises(GatewayClosedError):
+                await gateway.cancel_order(1)
+
+        _run(session())
+
+    def test_created_outside_event_loop(self) -> None:
+        """A gateway built before the loop runs binds to it on start."""
+        gateway = OrderGateway()
+        assert gateway.pending == 0
+
+        async def session():
+            async with gateway:
+                order, _ = await gateway.submit_order(Side.BUY, 99.0, 1)
+            return order
+
+        assert _run(session()).price == 99.0
+        assert gateway.requests_applied == 1
+
+    def test_invalid_bounds(self) -> None:
+        """Queue and batch bounds must be positive."""
+        with pytest.raises(ValueError, match="max_pending"):
+            OrderGateway(max_pending=0)
+        with pytest.raises(ValueError, match="max_batch"):
+            OrderGateway(max_batch=0)
@@ -0,0 +1,184 @@
+"""Tests for the ITCH 5.0 parser and replayer."""
+
+import struct
+
+import pytest
+
+from orderbook_simulator.itch import ItchReplayer
+from orderbook_simulator.orderbook import (
+    OrderNotFoundError,
+    OrderValidationError,
+    RetentionPolicy,
+    Side,
+)
+
+
+def _message(kind: bytes, locate: int, ts: int, body: bytes) -> bytes:
+    """Frame one ITCH message with its length prefix and common header."""
+    payload = kind + struct.pack(">HHHI", locate, 0, ts >> 32, ts & 0xFFFFFFFF)
+    payload += body
+    return struct.pack(">H", len(payload)) + payload
+
+
+def directory(locate: int, stock: str) -> bytes:
+    """Build a stock directory message."""
+    return _message(b"R", locate, 0, stock.ljust(8).encode() + bytes(20))
+
+
+def add(locate: int, ref: int, side: bytes, shares: int, stock: str,
+        price: int, ts: int = 1) -> bytes:
+    """Build an add order message."""
+    body = struct.pack(">QcI8sI", ref, side, shares, stock.ljust(8).encode(),
+                       price)
+    return _message(b"A", locate, ts, body)
+
+
+def executed(locate: int, ref: int, shares: int, ts: int = 2) -> bytes:
+    """Build an order executed message."""
+    return _message(b"E", locate, ts, struct.pack(">QIQ", ref, shares, 1))
+
+
+def executed_with_price(locate: int, ref: int, shares: int, price: int,
+                        ts: int = 2) -> bytes:
+    """Build an order executed with price message."""
+    body = struct.pack(">QIQcI", ref, shares, 1, b"Y", price)
+    return _message(b"C", locate, ts, body)
+
+
+def cancel(locate: int, ref: int, shares: int) -> bytes:
+    """Build an order cancel message."""
+    return _message(b"X", locate, 3, struct.pack(">QI", ref, shares))
+
+
+def delete(locate: int, ref: int) -> bytes:
+    """Build an order delete message."""
+    return _message(b"D", locate, 3, struct.pack(">Q", ref))
+
+
+def replace(locate: int, ref: int, new_ref: int, shares: int,
+            price: int) -> bytes:
+    """Build an order replace message."""
+    body = struct.pack(">QQII", ref, new_ref, shares, price)
+    return _message(b"U", locate, 4, body)
+
+
+class TestItchReplayer:
+    """Tests for decoding ITCH messages into per-stock books."""
+
+    def test_add_and_execute(self) -> None:
+        """Adds rest on the book and executions produce trades."""
+        replayer = ItchReplayer()
+        feed = (
+            directory(1, "AAPL")
+            + add(1, 10, b"S", 100, "AAPL", 1_501_200, ts=34_200_000_000_000)
+            + add(1, 11, b"B", 50, "AAPL", 1_500_000)
+            + executed(1, 10, 40)
+            + executed_with_price(1, 10, 60, 1_501_100)
+        )
+
+        assert replayer.replay(feed) == 5
+
+        book = replayer.exchange.book("AAPL")
+        assert book.best_bid() == 150.0
+        assert book.best_ask() is None
+        assert [(t.price, t.quantity) for t in book.trades] == [
+            (150.12, 40), (150.11, 60),
+        ]
+        assert book.get_order(1).timestamp == 34_200.0
+        assert 10 not in replayer._orders
+
+    @pytest.mark.parametrize("strict", [True, False])
+    def test_fills_with_eviction(self, strict: bool) -> None:
+        """Filled orders are forgotten even when the book evicts them."""
+        replayer = ItchReplayer(
+            strict=strict, retention=RetentionPolicy(terminal_order_ttl=0),
+        )
+        replayer.replay(
+            add(1, 7, b"S", 100, "AAPL", 1_501_200)
+            + add(1, 8, b"S", 100, "AAPL", 1_501_300)
+            + executed(1, 7, 40)
+            + executed(1, 7, 60)
+            + executed_with_price(1, 8, 100, 1_501_300)
+        )
+
+        book = replayer.exchange.book("AAPL")
+        assert replayer._orders == {}
+        assert replayer.skipped == 0
+        assert book.trade_count == 3
+        assert book.order_count == 0
+
+    def test_cancel_delete_replace(self) -> None:
+        """Partial cancels keep priority; replaces get a new reference."""
+        replayer = ItchReplayer()
+        replayer.replay(
+            add(2, 1, b"B", 100, "MSFT", 3_000_000)
+            + add(2, 2, b"B", 100, "MSFT", 3_000_000)
+            + cancel(2, 1, 30)
+            + delete(2, 2)
+            + replace(2, 1, 3, 20, 3_001_000)
+        )
+
+        book = replayer.exchange.book("MSFT")
+        assert book.best_bid() == 300.1
+        assert book.get_depth_at_price(Side.BUY, 300.1).quantity == 20
+        assert book.get_depth_at_price(Side.BUY, 300.0).quantity == 0
+        assert set(replayer._orders) == {3}
+
+    @pytest.mark.parametrize("strict", [True, False])
+    def test_rejected_replace_keeps_original(self, strict: bool) -> None:
+        """A replacement the book rejects leaves the original resting."""
+        replayer = ItchReplayer(strict=strict)
+        feed = add(2, 1, b"B", 100, "MSFT", 3_000_000) + replace(2, 1, 2, 10, 0)
+
+        if strict:
+            with pytest.raises(OrderValidationError, match="Price"):
+                replayer.replay(feed)
+        else:
+            replayer.replay(feed)
+            assert replayer.skipped == 1
+
+        book = replayer.exchange.book("MSFT")
+        assert book.get_depth_at_price(Side.BUY, 300.0).quantity == 100
+        assert replayer._orders == {1: 1}
+
+    def test_symbol_filter_skips_other_stocks(self) -> None:
+        """Messages for untracked stocks are ignored."""
+        replayer = ItchReplayer(symbols=["AAPL"])
+        replayer.replay(
+            add(1, 1, b"B", 10, "AAPL", 1_000_000)
+            + add(2, 2, b"B", 10, "MSFT", 1_000_000)
+            + delete(2, 2)
+        )
+
+        assert replayer.exchange.symbols == ["AAPL"]
+        assert replayer.messages == 3
+
+    def test_strict_mode_raises_on_unknown_order(self) -> None:
+        """Unknown references raise unless non-strict."""
+        feed = add(1, 1, b"B", 10, "AAPL", 1_000_000) + delete(1, 99)
+
+        with pytest.raises(OrderNotFoundError):
+            ItchReplayer().replay(feed)
+
+        lenient = ItchReplayer(strict=False)
+        lenient.replay(feed)
+        assert lenient.skipped == 1
+
+    def test_truncated_message_raises(self) -> None:
+        """A buffer ending mid-message is rejected."""
+        with pytest.raises(ValueError, match="Truncated"):
+            ItchReplayer().replay(add(1, 1, b"B", 10, "AAPL", 1_000_000)[:-1])
+
+    def test_replay_file_uses_mmap(self, tmp_path) -> None:
+        """Files are replayed from a memory map."""
+        path = tmp_path / "day.itch"
+        path.write_bytes(add(1, 1, b"S", 5, "AAPL", 1_000_000) + executed(1, 1, 5))
+
+        replayer = ItchReplayer()
+
+        assert replayer.replay_file(path) == 2
+        assert replayer.exchange.book("AAPL").trade_count == 1
+
+        empty = tmp_path / "empty.itch"
+        empty.touch()
+        assert replayer.replay_file(empty) == 0
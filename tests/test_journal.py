@@ -0,0 +1,131 @@
+"""Tests for the binary event journal."""
+
+import gc
+import warnings
+
+import numpy as np
+import pytest
+
+from orderbook_simulator.journal import (
+    HEADER_SIZE,
+    JOURNAL_DTYPE,
+    KIND_CANCEL,
+    KIND_SUBMIT,
+    JournalError,
+    JournalReader,
+    JournalWriter,
+)
+from orderbook_simulator.orderbook import OrderBook, OrderSpec, OrderType, Side
+
+
+def _book_state(book: OrderBook):
+    """Return comparable book state: depth, open orders and trades."""
+    open_orders = sorted(
+        (o.order_id, o.side, o.price, o.remaining, o.status)
+        for o in book._orders.values()
+    )
+    trades = [
+        (t.buy_order_id, t.sell_order_id, t.price, t.quantity, t.timestamp)
+        for t in book.trades
+    ]
+    return book.get_book_depth(10), open_orders, trades
+
+
+class TestJournal:
+    """Tests for journaling a book and replaying it from the map."""
+
+    def test_replay_reproduces_book(self, tmp_path) -> None:
+        """Replaying the journal rebuilds identical state."""
+        path = tmp_path / "flow.journal"
+        with JournalWriter(path, buffer_size=64) as journal:
+            book = OrderBook(journal=journal)
+            a, _ = book.submit_order(Side.SELL, 100.0, 10, timestamp=1.0)
+            b, _ = book.submit_order(Side.SELL, 100.5, 5, timestamp=2.0)
+            c, _ = book.submit_order(Side.BUY, 99.0, 8, timestamp=3.0,
+                                     tag="x")
+            book.submit_orders([
+                OrderSpec(Side.BUY, 100.0, 4, timestamp=4.0),
+                OrderSpec(Side.BUY, 0.0, 3, OrderType.MARKET, 5.0),
+            ])
+            book.modify_order(a.order_id, new_qty=9)
+            book.modify_order(b.order_id, new_price=101.0, timestamp=6.0)
+            book.execute_order(b.order_id, 1, timestamp=7.0)
+            book.cancel_by_tag("x")
+            book.submit_order(Side.BUY, 98.0, 1, timestamp=8.0)
+            book.cancel_side(Side.SELL)
+
+        with JournalReader(path) as reader:
+            assert len(reader) == journal.records_written == 12
+            replayed = reader.replay()
+
+            assert _book_state(replayed) == _book_state(book)
+            assert replayed.get_order(c.order_id).price == 99.0
+
+    def test_records_view(self, tmp_path) -> None:
+        """Records are exposed as a read-only structured array."""
+        path = tmp_path / "flow.journal"
+        with JournalWriter(path) as journal:
+            book = OrderBook(journal=journal)
+            order, _ = book.submit_order(Side.BUY, 99.5, 7, timestamp=1.5)
+            book.cancel_order(order.order_id)
+
+        with JournalReader(path) as reader:
+            records = reader.records
+            assert records.dtype == JOURNAL_DTYPE
+            assert records["kind"].tolist() == [KIND_SUBMIT, KIND_CANCEL]
+            assert records["order_id"].tolist() == [order.order_id] * 2
+            assert records[0]["price"] == 99.5
+            assert not records.flags.writeable
+        assert path.stat().st_size == HEADER_SIZE + 2 * JOURNAL_DTYPE.itemsize
+
+    def test_append_to_existing_journal(self, tmp_path) -> None:
+        """Reopening a journal appends after the existing records."""
+        path = tmp_path / "flow.journal"
+        for price in (99.0, 98.0):
+            with JournalWriter(path) as journal:
+                OrderBook(journal=journal).submit_order(Side.BUY, price, 1)
+
+        with JournalReader(path) as reader:
+            np.testing.assert_array_equal(reader.records["price"], [99.0, 98.0])
+
+    def test_rejected_operations_not_recorded(self, tmp_path) -> None:
+        """Only accepted operations are journaled."""
+        path = tmp_path / "flow.journal"
+        with JournalWriter(path) as journal:
+            book = OrderBook(journal=journal)
+            with pytest.raises(ValueError):
+                book.submit_order(Side.BUY, 99.0, 0)
+
+        assert journal.records_written == 0
+
+    def test_rejected_file_is_closed(self, tmp_path) -> None:
+        """A writer that rejects the header does not leak its handle."""
+        foreign = tmp_path / "foreign"
+        foreign.write_bytes(b"x" * 64)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            try:
+                JournalWriter(foreign)
+            except JournalError:
+                pass
+            gc.collect()
+
+        assert not [w for w in caught if w.category is ResourceWarning]
+        assert foreign.read_bytes() == b"x" * 64
+
+    def test_bad_files_raise(self, tmp_path) -> None:
+        """Foreign and truncated files are rejected."""
+        foreign = tmp_path / "foreign"
+        foreign.write_bytes(b"x" * 64)
+        with pytest.raises(JournalError, match="Not an order book journal"):
+            JournalReader(foreign)
+        with pytest.raises(JournalError):
+            JournalWriter(foreign)
+
+        path = tmp_path / "flow.journal"
+        with JournalWriter(path) as journal:
+            OrderBook(journal=journal).submit_order(Side.BUY, 99.0, 1)
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(JournalError, match="ends inside a record"):
+            JournalReader(path)
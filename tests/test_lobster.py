@@ -0,0 +1,109 @@
+"""Tests for the LOBSTER loader."""
+
+import numpy as np
+import pytest
+
+from orderbook_simulator.lobster import (
+    EMPTY_BID_PRICE,
+    LobsterReplayer,
+    read_messages,
+)
+from orderbook_simulator.orderbook import OrderNotFoundError, Side
+
+# time, type, order_id, size, price, direction
+MESSAGES = [
+    (34200.01, 1, 11, 100, 1000100, -1),
+    (34200.02, 1, 12, 50, 999900, 1),
+    (34200.03, 1, 13, 30, 1000100, -1),
+    (34200.04, 2, 11, 40, 1000100, -1),
+    (34200.05, 4, 11, 60, 1000100, -1),
+    (34200.06, 5, 0, 10, 1000000, 1),
+    (34200.07, 3, 12, 50, 999900, 1),
+]
+
+# ask_price_1, ask_size_1, bid_price_1, bid_size_1
+ORDERBOOK = [
+    (1000100, 100, EMPTY_BID_PRICE, 0),
+    (1000100, 100, 999900, 50),
+    (1000100, 130, 999900, 50),
+    (1000100, 90, 999900, 50),
+    (1000100, 30, 999900, 50),
+    (1000100, 30, 999900, 50),
+    (1000100, 30, EMPTY_BID_PRICE, 0),
+]
+
+
+def _write(path, rows) -> str:
+    """Write rows as a headerless CSV file."""
+    path.write_text("\n".join(",".join(str(v) for v in row) for row in rows))
+    return str(path)
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Write a matching message/orderbook file pair."""
+    return (
+        _write(tmp_path / "msg.csv", MESSAGES),
+        _write(tmp_path / "book.csv", ORDERBOOK),
+    )
+
+
+class TestLobsterReplayer:
+    """Tests for chunked replay and validation of LOBSTER files."""
+
+    def test_replay_builds_book(self, files) -> None:
+        """Submits, partial cancels, executions and deletes are applied."""
+        replayer = LobsterReplayer(chunksize=3)
+
+        report = replayer.replay(files[0])
+
+        assert (report.messages, report.applied, report.ignored) == (7, 6, 1)
+        assert replayer.book.best_bid() is None
+        assert replayer.book.get_depth_at_price(Side.SELL, 100.01).quantity == 30
+        assert [t.quantity for t in replayer.book.trades] == [60]
+
+    def test_validation_matches(self, files) -> None:
+        """A faithful reconstruction reports no divergences."""
+        report = LobsterReplayer(chunksize=2).replay(*files)
+
+        assert report.rows_checked == 7
+        assert report.matches
+
+    def test_validation_reports_divergences(self, files, tmp_path) -> None:
+        """Rows that differ are counted and reported with both states."""
+        bad = list(ORDERBOOK)
+        bad[2] = (1000100, 131, 999900, 50)
+        path = _write(tmp_path / "bad.csv", bad)
+
+        report = LobsterReplayer(chunksize=4).replay(files[0], path)
+
+        assert report.divergent_rows == 1
+        divergence = report.divergences[0]
+        assert (divergence.row, divergence.time) == (2, 34200.03)
+        assert divergence.expected[1] == 131
+        assert divergence.actual[1] == 130
+
+    def test_max_divergences(self, files, tmp_path) -> None:
+        """Only the first divergences are kept in detail."""
+        shifted = [(p + 100, s, b, q) for p, s, b, q in ORDERBOOK]
+        path = _write(tmp_path / "shifted.csv", shifted)
+
+        report = LobsterReplayer().replay(files[0], path, max_divergences=2)
+
+        assert report.divergent_rows == 7
+        assert [d.row for d in report.divergences] == [0, 1]
+
+    def test_unknown_order_strictness(self, tmp_path) -> None:
+        """Files starting mid-session need non-strict mode."""
+        path = _write(tmp_path / "msg.csv", [(1.0, 3, 99, 10, 1000000, 1)])
+
+        with pytest.raises(OrderNotFoundError):
+            LobsterReplayer().replay(path)
+        assert LobsterReplayer(strict=False).replay(path).skipped == 1
+
+    def test_read_messages_chunks(self, files) -> None:
+        """Message files are read as fixed-size float chunks."""
+        chunks = list(read_messages(files[0], chunksize=3))
+
+        assert [len(c) for c in chunks] == [3, 3, 1]
+        np.testing.assert_array_equal(chunks[0][:, 2], [11, 12, 13])
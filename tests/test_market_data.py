@@ -0,0 +1,264 @@
+"""Tests for market data feeds."""
+
+import random
+
+import pytest
+
+from orderbook_simulator.market_data import (
+    Bbo,
+    BboPublisher,
+    L2UpdateQueue,
+    L3Book,
+    L3Feed,
+    SequenceGapError,
+)
+from orderbook_simulator.orderbook import (
+    LevelUpdate,
+    OrderAction,
+    OrderBook,
+    OrderStatus,
+    Side,
+)
+
+
+@pytest.fixture
+def book() -> OrderBook:
+    """Create a fresh order book."""
+    return OrderBook(symbol="MD", tick_size=0.01)
+
+
+class TestL2UpdateQueue:
+    """Tests for the pull-style L2 update queue."""
+
+    def test_poll_and_drain(self, book: OrderBook) -> None:
+        """Updates are buffered until pulled, oldest first."""
+        queue = L2UpdateQueue(book)
+        book.submit_order(Side.BUY, price=99.0, quantity=10)
+        book.submit_order(Side.SELL, price=101.0, quantity=4)
+        book.submit_order(Side.SELL, price=102.0, quantity=1)
+
+        assert len(queue) == 3
+        assert queue.poll() == LevelUpdate(Side.BUY, 99.0, 10, 1)
+        assert queue.drain(max_items=1) == [LevelUpdate(Side.SELL, 101.0, 4, 1)]
+        assert queue.drain() == [LevelUpdate(Side.SELL, 102.0, 1, 1)]
+        assert queue.poll() is None
+        assert queue.drain() == []
+
+    def test_bounded_queue_counts_drops(self, book: OrderBook) -> None:
+        """A full bounded queue discards the oldest updates."""
+        queue = L2UpdateQueue(book, maxlen=2)
+        for price in (99.0, 98.0, 97.0):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+
+        assert queue.dropped == 1
+        assert [u.price for u in queue.drain()] == [98.0, 97.0]
+
+    def test_close_unsubscribes(self, book: OrderBook) -> None:
+        """Closed queues keep their buffer but stop receiving updates."""
+        queue = L2UpdateQueue(book)
+        book.submit_order(Side.BUY, price=99.0, quantity=1)
+        queue.close()
+        queue.close()
+        book.submit_order(Side.BUY, price=98.0, quantity=1)
+
+        assert len(queue) == 1
+
+    def test_invalid_maxlen(self, book: OrderBook) -> None:
+        """Non-positive buffer sizes are rejected."""
+        with pytest.raises(ValueError, match="maxlen"):
+            L2UpdateQueue(book, maxlen=0)
+
+
+def _random_flow(book: OrderBook, count: int, seed: int) -> None:
+    """Drive a book with a random mix of submits, amends and cancels."""
+    rng = random.Random(seed)
+    live: list = []
+    for step in range(count):
+        roll = rng.random()
+        if live and roll < 0.25:
+            order = book.get_order(live.pop(rng.randrange(len(live))))
+            if order.status in (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED):
+                book.cancel_order(order.order_id)
+        elif live and roll < 0.35:
+            order = book.get_order(rng.choice(live))
+            if order.status in (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED):
+                book.modify_order(order.order_id, new_price=order.price + 0.01)
+        else:
+            side = Side.BUY if rng.random() < 0.5 else Side.SELL
+            price = round(100.0 + rng.randint(-10, 10) * 0.01, 2)
+            order, _ = book.submit_order(
+                side, price, rng.randint(1, 20), timestamp=float(step)
+            )
+            live.append(order.order_id)
+
+
+class TestL3Feed:
+    """Tests for the sequenced market-by-order feed."""
+
+    def test_sequence_and_replay(self, book: OrderBook) -> None:
+        """Messages are numbered from 1 and replayable from the buffer."""
+        feed = L3Feed(book)
+        received: list = []
+        feed.subscribe(received.append)
+        order, _ = book.submit_order(Side.BUY, price=99.0, quantity=5)
+        book.cancel_order(order.order_id)
+
+        assert [m.sequence for m in received] == [1, 2]
+        assert [m.action for m in received] == [
+            OrderAction.ADD, OrderAction.DELETE
+        ]
+        assert feed.replay(2) == received[1:]
+        assert feed.replay(3) == []
+
+    def test_evicted_range_raises(self, book: OrderBook) -> None:
+        """Messages older than the replay buffer cannot be replayed."""
+        feed = L3Feed(book, buffer_size=2)
+        for price in (99.0, 98.0, 97.0):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+
+        assert [m.sequence for m in feed.replay(2)] == [2, 3]
+        with pytest.raises(SequenceGapError):
+            feed.replay(1)
+
+    @pytest.mark.parametrize("backend", ["sorted", "dense"])
+    def test_late_join_tracks_book(self, backend: str) -> None:
+        """A replica joined mid-session matches the book at every level."""
+        book = OrderBook(symbol="MD", tick_size=0.01, backend=backend)
+        feed = L3Feed(book)
+        _random_flow(book, 300, seed=1)
+        replica = feed.join()
+        _random_flow(book, 300, seed=2)
+
+        bids, asks = book.get_book_depth(100)
+        assert replica.depth(Side.BUY) == bids
+        assert replica.depth(Side.SELL) == asks
+        assert replica.sequence == feed.sequence
+        for level in book._bids.iter_levels():
+            assert replica.queue(Side.BUY, book._ticks_to_price(level.ticks)) == [
+                order.order_id for order in level
+            ]
+
+    def test_snapshot_plus_tail(self, book: OrderBook) -> None:
+        """An old snapshot catches up from the replay buffer."""
+        feed = L3Feed(book)
+        _random_flow(book, 100, seed=3)
+        replica = L3Book()
+        replica.load_snapshot(feed.snapshot())
+        _random_flow(book, 100, seed=4)
+
+        assert replica.recover(feed) > 0
+        assert replica.sequence == feed.sequence
+        assert replica.depth(Side.SELL) == book.get_book_depth(100)[1]
+
+    def test_gap_detection_and_snapshot_reload(self, book: OrderBook) -> None:
+        """Gaps raise on apply; unrecoverable gaps reload a snapshot."""
+        feed = L3Feed(book, buffer_size=1)
+        replica = L3Book()
+        for price in (99.0, 98.0):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+
+        with pytest.raises(SequenceGapError, match="Expected sequence 1"):
+            replica.apply(feed.replay(2)[0])
+        assert replica.recover(feed) == 0
+        assert replica.sequence == 2
+        assert replica.depth(Side.BUY) == book.get_book_depth()[0]
+
+
+class TestBboPublisher:
+    """Tests for the conflated top-of-book publisher."""
+
+    def test_every_n_changes_conflates(self, book: OrderBook) -> None:
+        """Count-throttled subscribers get the latest BBO every N changes."""
+        publisher = BboPublisher(book)
+        received: list = []
+        publisher.subscribe(received.append, every=3)
+        for price in (99.0, 99.1, 99.2, 99.3, 99.4, 99.5, 99.6):
+            book.submit_order(Side.BUY, price=price, quantity=1)
+
+        assert [bbo.bid for bbo in received] == [99.0, 99.3, 99.6]
+        assert publisher.changes == 7
+
+    def test_changes_behind_touch_are_ignored(self, book: OrderBook) -> None:
+        """Orders away from the best do not count as changes."""
+        book.submit_order(Side.SELL, price=101.0, quantity=5)
+        publisher = BboPublisher(book)
+        received: list = []
+        publisher.subscribe(received.append, every=1)
+        book.submit_order(Side.SELL, price=102.0, quantity=5)
+        book.submit_order(Side.SELL, price=101.0, quantity=2)
+
+        assert publisher.changes == 1
+        assert received == [Bbo(None, 0, 101.0, 7)]
+
+    def test_interval_uses_event_clock(self, book: OrderBook) -> None:
+        """Interval subscribers are throttled on the book's event time."""
+        publisher = BboPublisher(book)
+        received: list = []
+        publisher.subscribe(received.append, interval=1.0)
+        for step in range(5):
+            book.submit_order(
+                Side.BUY, price=99.0 + step, quantity=1,
+                timestamp=0.4 * step,
+            )
+
+        assert [bbo.bid for bbo in received] == [99.0, 102.0]
+        assert publisher.flush() == 1
+        assert received[-1].bid == 103.0
+        assert publisher.flush() == 0
+
+    def test_poll_delivers_after_quiet_period(self, book: OrderBook) -> None:
+        """poll releases a pending update once the interval has elapsed."""
+        now = [0.0]
+        publisher = BboPublisher(book, clock=lambda: now[0])
+        received: list = []
+        publisher.subscribe(received.append, interval=5.0)
+        book.submit_order(Side.BUY, price=99.0, quantity=1)
+        book.submit_order(Side.BUY, price=99.5, quantity=1)
+
+        assert publisher.poll() == 0
+        now[0] = 5.0
+        assert publisher.poll() == 1
+        assert received == [Bbo(99.0, 1, None, 0), Bbo(99.5, 1, None, 0)]
+
+    def test_sweep_and_unsubscribe(self, book: OrderBook) -> None:
+        """Sweeps update the BBO; unsubscribed callbacks get nothing."""
+        book.submit_order(Side.SELL, price=101.0, quantity=1)
+        book.submit_order(Side.SELL, price=102.0, quantity=1)
+        publisher = BboPublisher(book)
+        fast: list = []
+        gone: list = []
+        publisher.subscribe(fast.append, every=1)
+        publisher.subscribe(gone.append, every=1)
+        publisher.unsubscribe(gone.append)
+        book.submit_order(Side.BUY, price=102.0, quantity=2)
+
+        assert fast[-1] == Bbo(None, 0, None, 0)
+        assert gone == []
+
+    def test_one_delivery_per_book_operation(self, book: OrderBook) -> None:
+        """Sweeps and batches deliver only the state after the operation."""
+        for price in (101.0, 102.0, 103.0, 104.0):
+            book.submit_order(Side.SELL, price=price, quantity=1)
+        publisher = BboPublisher(book)
+        received: list = []
+        publisher.subscribe(received.append, every=1)
+
+        book.submit_order(Side.BUY, price=103.0, quantity=3)
+        assert received == [Bbo(None, 0, 104.0, 1)]
+
+        book.submit_orders(
+            sides=[Side.BUY] * 5, prices=[99.0, 99.1, 99.2, 99.3, 99.4],
+            quantities=[1] * 5,
+        )
+        assert received[1:] == [Bbo(99.4, 1, 104.0, 1)]
+        assert publisher.changes == 2
+
+    def test_invalid_throttles(self, book: OrderBook) -> None:
+        """Exactly one positive throttle is required."""
+        publisher = BboPublisher(book)
+        with pytest.raises(ValueError, match="Exactly one"):
+            publisher.subscribe(print)
+        with pytest.raises(ValueError, match="Exactly one"):
+            publisher.subscribe(print, interval=1.0, every=1)
+        with pytest.raises(ValueError, match="positive"):
+            publisher.subscribe(print, every=0)
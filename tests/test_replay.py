@@ -0,0 +1,145 @@
+"""Tests for the event-sourced replay engine."""
+
+import pytest
+
+from orderbook_simulator.orderbook import (
+    OrderBook,
+    OrderNotFoundError,
+    OrderStatus,
+    OrderType,
+    RetentionPolicy,
+    Side,
+)
+from orderbook_simulator.replay import (
+    AddOrder,
+    CancelOrder,
+    MarketOrder,
+    ModifyOrder,
+    ReplayEngine,
+)
+
+
+class TestReplayEngine:
+    """Tests for applying historical event streams to a book."""
+
+    def test_replays_add_modify_cancel_market(self) -> None:
+        """Each event type is applied and yields one update."""
+        engine = ReplayEngine()
+        events = [
+            AddOrder(1.0, 501, Side.SELL, 100.0, 10),
+            AddOrder(2.0, 502, Side.BUY, 99.0, 5),
+            ModifyOrder(3.0, 501, new_qty=6),
+            MarketOrder(4.0, Side.BUY, 2),
+            CancelOrder(5.0, 502),
+        ]
+
+        updates = list(engine.replay(events))
+
+        assert [u.event for u in updates] == events
+        assert updates[1].best_bid == 99.0
+        assert [t.quantity for t in updates[3].trades] == [2]
+        assert updates[4].order.status == OrderStatus.CANCELLED
+        assert engine.book.best_bid() is None
+        assert engine.book.get_depth_at_price(Side.SELL, 100.0).quantity == 4
+
+    def test_replay_is_lazy(self) -> None:
+        """Events are pulled from the source only as updates are consumed."""
+        pulled = []
+
+        def feed():
+            for i in range(1000):
+                pulled.append(i)
+                yield AddOrder(float(i), i, Side.BUY, 90.0, 1)
+
+        updates = ReplayEngine().replay(feed())
+        next(updates)
+        next(updates)
+
+        assert pulled == [0, 1]
+
+    def test_feed_ids_forgotten_when_filled(self) -> None:
+        """Filled orders release their feed ID mapping."""
+        engine = ReplayEngine()
+        engine.run([
+            AddOrder(1.0, 7, Side.SELL, 100.0, 3),
+            AddOrder(2.0, 8, Side.BUY, 100.0, 3),
+        ])
+
+        assert engine._live == {}
+        assert engine._feed_ids == {}
+        with pytest.raises(OrderNotFoundError):
+            engine.apply(CancelOrder(3.0, 7))
+
+    def test_feed_ids_can_be_reused_after_close(self) -> None:
+        """A feed ID may be re-added once its order has been cancelled."""
+        engine = ReplayEngine()
+        engine.run([
+            AddOrder(1.0, 7, Side.BUY, 99.0, 1),
+            CancelOrder(2.0, 7),
+            AddOrder(3.0, 7, Side.BUY, 98.0, 1),
+        ])
+
+        assert engine.book.best_bid() == 98.0
+
+    def test_reorder_window_restores_timestamp_order(self) -> None:
+        """Jittered events are applied oldest first."""
+        engine = ReplayEngine(reorder_window=2)
+        events = [
+            AddOrder(2.0, 2, Side.BUY, 99.0, 1),
+            AddOrder(1.0, 1, Side.BUY, 98.0, 1),
+            AddOrder(3.0, 3, Side.BUY, 97.0, 1),
+        ]
+
+        stamps = [u.event.timestamp for u in engine.replay(events)]
+
+        assert stamps == [1.0, 2.0, 3.0]
+
+    def test_out_of_order_event_raises(self) -> None:
+        """Without a window, a late event is rejected."""
+        engine = ReplayEngine()
+        engine.apply(AddOrder(2.0, 1, Side.BUY, 99.0, 1))
+
+        with pytest.raises(ValueError, match="older"):
+            engine.apply(AddOrder(1.0, 2, Side.BUY, 99.0, 1))
+
+    def test_non_strict_skips_invalid_events(self) -> None:
+        """Unknown IDs and rejected orders are counted and dropped."""
+        engine = ReplayEngine(strict=False)
+
+        updates = list(engine.replay([
+            CancelOrder(1.0, 404),
+            AddOrder(2.0, 1, Side.BUY, 99.0, 0),
+            AddOrder(3.0, 2, Side.BUY, 99.0, 1, OrderType.IOC),
+        ]))
+
+        assert engine.skipped == 2
+        assert len(updates) == 1
+        assert engine._live == {}
+
+    def test_try_apply_follows_strictness(self) -> None:
+        """try_apply skips bad events only when the engine is not strict."""
+        with pytest.raises(OrderNotFoundError):
+            ReplayEngine().try_apply(CancelOrder(1.0, 404))
+
+        engine = ReplayEngine(strict=False)
+        assert engine.try_apply(CancelOrder(1.0, 404)) is None
+        update = engine.try_apply(AddOrder(2.0, 1, Side.BUY, 99.0, 1))
+
+        assert engine.skipped == 1
+        assert update is not None and update.best_bid == 99.0
+
+    def test_bounded_book_history(self) -> None:
+        """With a retention policy the book's history stays bounded."""
+        book = OrderBook(
+            retention=RetentionPolicy(terminal_order_ttl=0, max_trades=10)
+        )
+        engine = ReplayEngine(book)
+
+        def feed():
+            for i in range(500):
+                yield AddOrder(float(i), 2 * i, Side.SELL, 100.0, 1)
+                yield MarketOrder(float(i), Side.BUY, 1)
+
+        assert engine.run(feed()) == 1000
+        assert len(book.trades) == 10
+        assert len(book._orders) == 0
@@ -0,0 +1,169 @@
+"""Tests for the process-sharded exchange."""
+
+import math
+
+import pytest
+
+from orderbook_simulator.exchange import Exchange, UnknownSymbolError
+from orderbook_simulator.orderbook import (
+    OrderNotFoundError,
+    OrderType,
+    Side,
+)
+from orderbook_simulator.sharding import ShardedExchange
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+
+
+@pytest.fixture
+def sharded():
+    """Start a two-worker sharded exchange."""
+    engine = ShardedExchange(SYMBOLS, workers=2)
+    yield engine
+    engine.close()
+
+
+class TestShardedExchange:
+    """Tests for routing, merging and error reporting across shards."""
+
+    def test_matches_single_process_exchange(
+        self, sharded: ShardedExchange
+    ) -> None:
+        """Trades per symbol match an in-process Exchange."""
+        events = []
+        for i, symbol in enumerate(SYMBOLS * 3):
+            events.append(("submit", symbol, Side.SELL, 100.0 + i % 3, 5,
+                           OrderType.LIMIT, float(i)))
+        for i, symbol in enumerate(SYMBOLS):
+            events.append(("submit", symbol, Side.BUY, 0.0, 12,
+                           OrderType.MARKET, 100.0 + i))
+
+        result = sharded.process(events)
+        reference = Exchange(SYMBOLS)
+        expected = []
+        for event in events:
+            _, trades = reference.submit_order(*event[1:])
+            expected.extend((event[1], t.price, t.quantity) for t in trades)
+
+        got = [(s, t.price, t.quantity) for s, t in result.trades]
+        assert sorted(got) == sorted(expected)
+        assert result.errors == {}
+
+    def test_trades_merged_in_timestamp_order(
+        self, sharded: ShardedExchange
+    ) -> None:
+        """Trades from different shards interleave by timestamp."""
+        sharded.process([
+            ("submit", "AAA", Side.SELL, 10.0, 1, OrderType.LIMIT, 0.0),
+            ("submit", "BBB", Side.SELL, 20.0, 1, OrderType.LIMIT, 0.0),
+        ])
+        result = sharded.process([
+            ("submit", "BBB", Side.BUY, 20.0, 1, OrderType.LIMIT, 1.0),
+            ("submit", "AAA", Side.BUY, 10.0, 1, OrderType.LIMIT, 2.0),
+        ])
+
+        assert [s for s, _ in result.trades] == ["BBB", "AAA"]
+        assert [t.timestamp for _, t in result.trades] == [1.0, 2.0]
+
+    def test_ids_unique_across_shards(self, sharded: ShardedExchange) -> None:
+        """Strided ID sequences never collide between workers."""
+        result = sharded.process([
+            ("submit", symbol, Side.BUY, 10.0, 1) for symbol in SYMBOLS * 4
+        ])
+
+        ids = result.order_ids
+        assert None not in ids
+        assert len(set(ids)) == len(ids)
+
+    def test_cancel_and_errors(self, sharded: ShardedExchange) -> None:
+        """Cancels route by symbol and failures are reported per event."""
+        placed = sharded.process([("submit", "CCC", Side.BUY, 10.0, 1)])
+        order_id = placed.order_ids[0]
+
+        result = sharded.process([
+            ("cancel", "CCC", order_id),
+            ("cancel", "CCC", order_id + 1000),
+            ("submit", "AAA", Side.BUY, 10.0, 0),
+        ])
+
+        assert result.order_ids[0] == order_id
+        assert isinstance(result.errors[1], OrderNotFoundError)
+        assert 2 in result.errors
+        assert math.isnan(sharded.top_of_book()["bid"][2])
+
+    def test_top_of_book(self, sharded: ShardedExchange) -> None:
+        """The merged BBO array follows listing order."""
+        sharded.process([
+            ("submit", "BBB", Side.BUY, 9.5, 3),
+            ("submit", "CCC", Side.SELL, 11.25, 4),
+        ])
+
+        top = sharded.top_of_book()
+
+        assert math.isnan(top["bid"][0])
+        assert (top["bid"][1], top["bid_qty"][1]) == (9.5, 3)
+        assert (top["ask"][2], top["ask_qty"][2]) == (11.25, 4)
+
+    def test_unknown_symbol_rejects_batch(
+        self, sharded: ShardedExchange
+    ) -> None:
+        """An unlisted symbol fails the batch before anything is sent."""
+        with pytest.raises(UnknownSymbolError):
+            sharded.process([
+                ("submit", "AAA", Side.BUY, 10.0, 1),
+                ("submit", "ZZZ", Side.BUY, 10.0, 1),
+            ])
+
+        assert math.isnan(sharded.top_of_book()["bid"][0])
+
+    def test_malformed_event_rejects_batch(
+        self, sharded: ShardedExchange
+    ) -> None:
+        """Short or unknown event tuples fail before anything is sent."""
+        for bad in (("submit", "AAA", Side.BUY), ("trade", "AAA"), "AAA"):
+            with pytest.raises(ValueError):
+                sharded.process([("submit", "AAA", Side.BUY, 10.0, 1), bad])
+
+        assert math.isnan(sharded.top_of_book()["bid"][0])
+
+    def test_unexpected_error_reported_per_event(
+        self, sharded: ShardedExchange
+    ) -> None:
+        """Errors outside the book's own keep the worker and batch alive."""
+        first = sharded.process([
+            ("submit", "AAA", Side.BUY, "ten", 1),
+            ("submit", "BBB", Side.BUY, 9.0, 2),
+        ])
+        second = sharded.process([
+            ("submit", "AAA", Side.BUY, 10.0, 1),
+            ("submit", "CCC", Side.SELL, 11.0, 1),
+        ])
+
+        assert isinstance(first.errors[0], TypeError)
+        assert first.order_ids[1] is not None
+        assert second.errors == {}
+        assert None not in second.order_ids
+        top = sharded.top_of_book()
+        assert (top["bid"][0], top["bid"][1], top["ask"][2]) == (10.0, 9.0, 11.0)
+
+    def test_dead_worker_closes_exchange(self) -> None:
+        """A worker that dies fails the batch and the exchange."""
+        engine = ShardedExchange(SYMBOLS, workers=2)
+        engine._processes[0].terminate()
+        engine._processes[0].join()
+
+        with pytest.raises(RuntimeError, match="failed"):
+            engine.process([
+                ("submit", "AAA", Side.BUY, 10.0, 1),
+                ("submit", "BBB", Side.BUY, 9.0, 1),
+            ])
+        with pytest.raises(RuntimeError, match="closed"):
+            engine.process([("submit", "BBB", Side.BUY, 9.0, 1)])
+
+    def test_closed_exchange_raises(self) -> None:
+        """Processing after close raises RuntimeError."""
+        engine = ShardedExchange(["AAA"], workers=1)
+        engine.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            engine.process([])
@@ -0,0 +1,123 @@
+"""Tests for shared memory depth publishing."""
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from orderbook_simulator.orderbook import OrderBook, Side
+from orderbook_simulator.shared_depth import (
+    SharedDepthError,
+    SharedDepthPublisher,
+    SharedDepthReader,
+)
+
+
+@pytest.fixture
+def publisher():
+    """Publish a book with two levels per side."""
+    book = OrderBook(symbol="SHM", tick_size=0.01)
+    book.submit_order(Side.BUY, 99.0, 10, timestamp=1.0)
+    book.submit_order(Side.BUY, 98.0, 20, timestamp=2.0)
+    book.submit_order(Side.SELL, 101.0, 5, timestamp=3.0)
+    book.submit_order(Side.SELL, 102.0, 15, timestamp=4.0)
+    publisher = SharedDepthPublisher(book, levels=3)
+    yield publisher
+    publisher.close()
+
+
+def _read_in_child(name: str, queue) -> None:
+    """Attach from another process and send back what it sees."""
+    with SharedDepthReader(name) as reader:
+        snapshot = reader.snapshot()
+        record = reader.read()
+        queue.put((
+            snapshot.best_bid(), snapshot.best_ask(), snapshot.get_spread(),
+            float(record["last_price"]), int(record["trade_count"]),
+        ))
+
+
+class TestSharedDepth:
+    """Tests for SharedDepthPublisher and SharedDepthReader."""
+
+    def test_reader_sees_book_depth(self, publisher) -> None:
+        """The shared record matches the book after each write."""
+        book = publisher.book
+        with SharedDepthReader(publisher.name) as reader:
+            assert reader.levels == 3
+            assert reader.snapshot().get_book_depth(3) == book.get_book_depth(3)
+
+            book.submit_order(Side.BUY, 101.0, 2, timestamp=5.0)
+            snapshot = reader.snapshot()
+            record = reader.read()
+
+        assert snapshot.get_book_depth(3) == book.get_book_depth(3)
+        assert snapshot.get_spread() == book.get_spread()
+        assert snapshot.version == publisher.snapshot.version
+        assert int(record["bid_levels"]) == 2
+        assert np.isnan(record["bid_price"][2])
+        assert (float(record["last_price"]), int(record["last_quantity"])) == (
+            101.0, 2
+        )
+        assert int(record["trade_count"]) == 1
+        assert int(record["sequence"]) % 2 == 0
+
+    def test_deep_execution_updates_last_trade(self, publisher) -> None:
+        """Executing an order below the published levels still republishes."""
+        book = publisher.book
+        deep, _ = book.submit_order(Side.BUY, 96.0, 8, timestamp=5.0)
+        book.submit_order(Side.BUY, 97.0, 8, timestamp=6.0)
+        with SharedDepthReader(publisher.name) as reader:
+            book.execute_order(deep.order_id, 3, timestamp=7.0)
+            record = reader.read()
+
+        assert int(record["trade_count"]) == 1
+        assert (float(record["last_price"]), int(record["last_quantity"])) == (
+            96.0, 3
+        )
+        assert float(record["last_timestamp"]) == 7.0
+
+    def test_read_copies_are_detached(self, publisher) -> None:
+        """Copies from read do not change with later writes."""
+        with SharedDepthReader(publisher.name) as reader:
+            before = reader.read()
+            publisher.book.submit_order(Side.SELL, 100.5, 1)
+            after = reader.read()
+
+        assert float(before["ask_price"][0]) == 101.0
+        assert float(after["ask_price"][0]) == 100.5
+        assert int(after["sequence"]) == int(before["sequence"]) + 2
+
+    def test_torn_write_is_not_returned(self, publisher) -> None:
+        """A record with an odd sequence is never handed out."""
+        with SharedDepthReader(publisher.name) as reader:
+            reader.record["sequence"] += 1
+            with pytest.raises(TimeoutError):
+                reader.read(max_attempts=10)
+            reader.record["sequence"] += 1
+
+    def test_other_process_reads_block(self, publisher) -> None:
+        """A reader in another process attaches by name."""
+        publisher.book.submit_order(Side.SELL, 99.0, 4, timestamp=6.0)
+        queue = multiprocessing.get_context("spawn").Queue()
+        child = multiprocessing.get_context("spawn").Process(
+            target=_read_in_child, args=(publisher.name, queue)
+        )
+        child.start()
+        result = queue.get(timeout=30)
+        child.join(timeout=30)
+
+        assert child.exitcode == 0
+        assert result == (99.0, 101.0, 2.0, 99.0, 1)
+
+    def test_foreign_block_rejected(self) -> None:
+        """Blocks without the depth header are refused."""
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(create=True, size=64)
+        try:
+            with pytest.raises(SharedDepthError):
+                SharedDepthReader(block.name)
+        finally:
+            block.close()
+            block.unlink()
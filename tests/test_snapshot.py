@@ -0,0 +1,145 @@
+"""Tests for book snapshot and restore."""
+
+import numpy as np
+import pytest
+
+from orderbook_simulator.orderbook import (
+    IdSequence,
+    OrderBook,
+    OrderStatus,
+    Side,
+)
+from orderbook_simulator.snapshot import (
+    SnapshotError,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+@pytest.fixture(params=["sorted", "dense"])
+def book(request: pytest.FixtureRequest) -> OrderBook:
+    """Create a book with resting orders, fills and tags on both sides."""
+    book = OrderBook(symbol="SNAP", tick_size=0.01, backend=request.param)
+    book.submit_order(Side.BUY, 99.0, 10, timestamp=1.0)
+    book.submit_order(Side.BUY, 99.0, 20, timestamp=2.0, tag="mm")
+    book.submit_order(Side.BUY, 98.5, 5, timestamp=3.0)
+    book.submit_order(Side.SELL, 101.0, 7, timestamp=4.0, tag="mm")
+    book.submit_order(Side.SELL, 101.0, 3, timestamp=5.0)
+    book.submit_order(Side.SELL, 150.0, 1, timestamp=6.0)
+    book.submit_order(Side.BUY, 101.0, 2, timestamp=7.0)
+    return book
+
+
+def _resting(book: OrderBook):
+    """Return resting orders in queue order with their state."""
+    return [
+        (o.order_id, o.side, o.price, o.quantity, o.remaining, o.status,
+         o.timestamp, o.tag)
+        for side in (book._bids, book._asks)
+        for level in side.iter_levels()
+        for o in level
+    ]
+
+
+class TestSnapshot:
+    """Tests for checkpointing and bulk-rebuilding books."""
+
+    def test_round_trip(self, book: OrderBook, tmp_path) -> None:
+        """Resting orders, FIFO order and aggregates survive a round trip."""
+        path = tmp_path / "book.npz"
+        save_snapshot(book, path)
+
+        restored = load_snapshot(path, backend=book.backend)
+
+        assert restored.symbol == "SNAP"
+        assert _resting(restored) == _resting(book)
+        assert restored.get_book_depth(10) == book.get_book_depth(10)
+        assert (restored.best_bid(), restored.best_ask()) == (99.0, 101.0)
+        assert restored.order_count == book.order_count
+        assert restored.get_order(4).status == OrderStatus.PARTIALLY_FILLED
+        assert len(restored.trades) == 0
+        assert restored.trade_count == book.trade_count
+
+    def test_restored_book_keeps_trading(self, book: OrderBook, tmp_path) -> None:
+        """Matching, cancels and ID counters continue where they left off."""
+        path = tmp_path / "book.npz"
+        save_snapshot(book, path)
+        restored = load_snapshot(path, backend=book.backend)
+
+        expected_order, expected_trades = book.submit_order(Side.SELL, 99.0, 15)
+        order, trades = restored.submit_order(Side.SELL, 99.0, 15)
+
+        assert order.order_id == expected_order.order_id
+        assert [(t.trade_id, t.buy_order_id, t.quantity) for t in trades] == [
+            (t.trade_id, t.buy_order_id, t.quantity) for t in expected_trades
+        ]
+        assert [o.order_id for o in restored.cancel_by_tag("mm")] == [2, 4]
+        restored.cancel_order(3)
+        assert restored.best_bid() is None
+
+    @pytest.mark.parametrize("backend", ["sorted", "dense"])
+    def test_many_levels_bulk_loaded(self, backend: str, tmp_path) -> None:
+        """Wide books restore with a working ladder on both sides."""
+        book = OrderBook(tick_size=0.01, backend=backend)
+        offsets = np.arange(2_000)
+        book.submit_orders(
+            sides=np.repeat([0, 1], 2_000),
+            prices=np.concatenate([(9_000 - offsets) * 0.01,
+                                   (11_000 + offsets) * 0.01]),
+            quantities=np.ones(4_000, dtype=np.int64),
+        )
+        path = tmp_path / "book.npz"
+        save_snapshot(book, path)
+
+        restored = load_snapshot(path, backend=backend)
+
+        assert _resting(restored) == _resting(book)
+        assert restored.get_book_depth(3000) == book.get_book_depth(3000)
+        restored.submit_order(Side.BUY, 50.0, 1)
+        restored.submit_order(Side.SELL, 200.0, 1)
+        restored.cancel_order(1)
+        assert restored.best_bid() == 89.99
+        assert restored.get_book_depth(1)[1][0].price == 110.0
+        assert restored.get_depth_at_price(Side.BUY, 50.0).quantity == 1
+        assert restored.get_depth_at_price(Side.SELL, 200.0).quantity == 1
+
+    def test_trade_history(self, book: OrderBook, tmp_path) -> None:
+        """Trades are restored only when requested."""
+        path = tmp_path / "book.npz"
+        save_snapshot(book, path, include_trades=True)
+
+        restored = load_snapshot(path, columnar_trades=True)
+
+        assert list(restored.trades) == list(book.trades)
+        np.testing.assert_array_equal(
+            restored.trade_log.to_arrays()["price"], [101.0]
+        )
+
+    def test_shared_id_sequences_advance(self, book: OrderBook, tmp_path) -> None:
+        """Shared sequences are moved past the snapshot's counters."""
+        path = tmp_path / "book.npz"
+        save_snapshot(book, path)
+        order_ids = IdSequence()
+
+        restored = load_snapshot(path, order_ids=order_ids)
+
+        assert order_ids.next_id == 8
+        assert restored.submit_order(Side.BUY, 1.0, 1)[0].order_id == 8
+
+    def test_empty_book(self, tmp_path) -> None:
+        """An empty book round-trips."""
+        path = tmp_path / "empty.npz"
+        save_snapshot(OrderBook(), path)
+
+        restored = load_snapshot(path)
+
+        assert restored.order_count == 0
+        assert restored.best_bid() is None
+
+    def test_foreign_archive_raises(self, tmp_path) -> None:
+        """Archives without snapshot metadata are rejected."""
+        path = tmp_path / "other.npz"
+        np.savez(path, x=np.arange(3))
+
+        with pytest.raises(SnapshotError):
+            load_snapshot(path)
@@ -0,0 +1,67 @@
+"""Tests for the columnar trade log."""
+
+import numpy as np
+import pytest
+
+from orderbook_simulator.trade_log import TRADE_COLUMNS, TradeLog
+
+
+class TestTradeLog:
+    """Tests for TradeLog storage and export."""
+
+    def test_empty_log(self) -> None:
+        """A new log exports empty columns."""
+        log = TradeLog()
+        arrays = log.to_arrays()
+
+        assert len(log) == 0
+        assert set(arrays) == set(TRADE_COLUMNS)
+        assert all(len(col) == 0 for col in arrays.values())
+
+    def test_grows_past_capacity(self) -> None:
+        """Appending beyond capacity keeps every row."""
+        log = TradeLog(capacity=2)
+        for i in range(5):
+            log.append(i + 1, 10 + i, 20 + i, 100.0 + i, i + 1, float(i))
+
+        arrays = log.to_arrays()
+
+        assert log.capacity >= 5
+        assert arrays["trade_id"].tolist() == [1, 2, 3, 4, 5]
+        assert arrays["price"].dtype == np.float64
+        assert arrays["quantity"].tolist() == [1, 2, 3, 4, 5]
+
+    def test_exported_views_are_snapshots(self) -> None:
+        """Earlier exports keep their rows across appends and growth."""
+        log = TradeLog(capacity=2)
+        log.append(1, 2, 3, 100.0, 5, 0.0)
+        before = log.to_arrays()
+        for i in range(2, 6):
+            log.append(i, 2, 3, 100.0, 5, float(i))
+
+        assert before["trade_id"].tolist() == [1]
+        assert log.to_arrays()["trade_id"].tolist() == [1, 2, 3, 4, 5]
+
+    def test_exported_arrays_are_read_only(self) -> None:
+        """Exported views cannot be written through."""
+        log = TradeLog()
+        log.append(1, 2, 3, 100.0, 5, 0.0)
+
+        with pytest.raises(ValueError):
+            log.to_arrays()["quantity"][0] = 1
+
+    def test_to_frame(self) -> None:
+        """The log converts to a DataFrame with one row per trade."""
+        log = TradeLog()
+        log.append(1, 2, 3, 100.0, 5, 0.0)
+        log.append(2, 4, 3, 100.5, 1, 1.0)
+
+        frame = log.to_frame()
+
+        assert list(frame.columns) == list(TRADE_COLUMNS)
+        assert frame["price"].tolist() == [100.0, 100.5]
+
+    def test_invalid_capacity_raises(self) -> None:
+        """Non-positive capacity raises ValueError."""
+        with pytest.raises(ValueError, match="capacity"):
+            TradeLog(capacity=0)